@@ -4,6 +4,7 @@ import logging
 import os
 import shutil
 
+from bhamon_development_toolkit.asyncio_extensions import asyncio_helpers
 from bhamon_development_toolkit.automation.automation_command import AutomationCommand
 from bhamon_development_toolkit.python.python_package import PythonPackage
 
@@ -39,7 +40,7 @@ class CleanCommand(AutomationCommand):
 
 
     async def run_async(self, arguments: argparse.Namespace, simulate: bool, **kwargs) -> None:
-        self.run(arguments, simulate = simulate, **kwargs)
+        await asyncio_helpers.run_blocking(self.run, arguments, simulate = simulate, operation_type = "disk", **kwargs)
 
 
     def clean_artifacts(self, artifact_directory: str, simulate: bool = False) -> None:
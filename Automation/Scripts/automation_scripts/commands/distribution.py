@@ -3,6 +3,7 @@ import logging
 import os
 import sys
 
+from bhamon_development_toolkit.asyncio_extensions import asyncio_helpers
 from bhamon_development_toolkit.automation.automation_command import AutomationCommand
 from bhamon_development_toolkit.automation.automation_command_group import AutomationCommandGroup
 from bhamon_development_toolkit.processes.process_runner import ProcessRunner
@@ -66,7 +67,7 @@ class _SetupCommand(AutomationCommand):
 
 
     async def run_async(self, arguments: argparse.Namespace, simulate: bool, **kwargs) -> None:
-        self.run(arguments, simulate = simulate, **kwargs)
+        await asyncio_helpers.run_blocking(self.run, arguments, simulate = simulate, **kwargs)
 
 
 class _PackageCommand(AutomationCommand):
@@ -135,7 +136,7 @@ class _UploadCommand(AutomationCommand):
 
 
     async def run_async(self, arguments: argparse.Namespace, simulate: bool, **kwargs) -> None:
-        self.run(arguments, simulate = simulate, **kwargs)
+        await asyncio_helpers.run_blocking(self.run, arguments, simulate = simulate, **kwargs)
 
 
 class _UploadForReleaseCommand(AutomationCommand):
@@ -176,7 +177,7 @@ class _UploadForReleaseCommand(AutomationCommand):
 
 
     async def run_async(self, arguments: argparse.Namespace, simulate: bool, **kwargs) -> None:
-        self.run(arguments, simulate = simulate, **kwargs)
+        await asyncio_helpers.run_blocking(self.run, arguments, simulate = simulate, **kwargs)
 
 
 def _create_distribution_manager(python_executable: str, repository_url: str) -> PythonTwineDistributionManager:
@@ -1,6 +1,7 @@
 import argparse
 import logging
 
+from bhamon_development_toolkit.asyncio_extensions import asyncio_helpers
 from bhamon_development_toolkit.automation.automation_command import AutomationCommand
 
 from automation_scripts.configuration.project_configuration import ProjectConfiguration
@@ -30,4 +31,4 @@ class InfoCommand(AutomationCommand):
 
 
     async def run_async(self, arguments: argparse.Namespace, simulate: bool, **kwargs) -> None:
-        self.run(arguments, simulate = simulate, **kwargs)
+        await asyncio_helpers.run_blocking(self.run, arguments, simulate = simulate, **kwargs)
@@ -0,0 +1,12 @@
+import dataclasses
+from typing import BinaryIO, Callable
+
+
+@dataclasses.dataclass(frozen = True)
+class ArchiveCodec:
+    """ Stream compression for tar archives, the writer and reader wrap a file object without closing it when they are closed """
+
+    identifier: str
+    file_extension: str
+    open_writer: Callable[[BinaryIO],BinaryIO]
+    open_reader: Callable[[BinaryIO],BinaryIO]
@@ -0,0 +1,57 @@
+import bz2
+import gzip
+import lzma
+
+from bhamon_development_toolkit.artifacts.archive_codec import ArchiveCodec
+
+
+def create_gzip_codec(compression_level: int = 6) -> ArchiveCodec:
+    # Use a fixed timestamp in the gzip header so that the same content produces the same archive
+    return ArchiveCodec("gzip", ".gz",
+        lambda raw_file: gzip.GzipFile(fileobj = raw_file, mode = "wb", compresslevel = compression_level, mtime = 0),
+        lambda raw_file: gzip.GzipFile(fileobj = raw_file, mode = "rb"))
+
+
+def create_xz_codec(preset: int = 6) -> ArchiveCodec:
+    return ArchiveCodec("xz", ".xz",
+        lambda raw_file: lzma.LZMAFile(raw_file, mode = "wb", preset = preset),
+        lambda raw_file: lzma.LZMAFile(raw_file, mode = "rb"))
+
+
+def create_bzip2_codec(compression_level: int = 9) -> ArchiveCodec:
+    return ArchiveCodec("bzip2", ".bz2",
+        lambda raw_file: bz2.BZ2File(raw_file, mode = "wb", compresslevel = compression_level),
+        lambda raw_file: bz2.BZ2File(raw_file, mode = "rb"))
+
+
+def create_zstandard_codec(compression_level: int = 3, threads: int = -1) -> ArchiveCodec:
+    """ Create a codec using zstandard, which compresses several times faster than gzip, with threads = -1 using all cores """
+
+    import zstandard # pylint: disable = import-error, import-outside-toplevel
+
+    return ArchiveCodec("zstandard", ".zst",
+        lambda raw_file: zstandard.ZstdCompressor(level = compression_level, threads = threads).stream_writer(raw_file, closefd = False),
+        lambda raw_file: zstandard.ZstdDecompressor().stream_reader(raw_file, closefd = False))
+
+
+def is_zstandard_available() -> bool:
+    try:
+        import zstandard # pylint: disable = import-error, import-outside-toplevel, unused-import
+    except ImportError:
+        return False
+    return True
+
+
+def get_archive_codec(identifier: str) -> ArchiveCodec:
+    if identifier == "gzip":
+        return create_gzip_codec()
+    if identifier == "xz":
+        return create_xz_codec()
+    if identifier == "bzip2":
+        return create_bzip2_codec()
+    if identifier == "zstandard":
+        if not is_zstandard_available():
+            raise ValueError("Archive codec 'zstandard' is not installed")
+        return create_zstandard_codec()
+
+    raise ValueError("Unsupported archive codec: '%s'" % identifier)
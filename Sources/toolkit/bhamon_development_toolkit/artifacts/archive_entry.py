@@ -0,0 +1,11 @@
+import dataclasses
+from typing import Optional
+
+
+@dataclasses.dataclass(frozen = True)
+class ArchiveEntry:
+    """ File entry in an artifact archive, with its CRC32 if the archive format records it """
+
+    path: str
+    size: int
+    crc: Optional[int]
@@ -0,0 +1,53 @@
+import abc
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bhamon_development_toolkit.artifacts.archive_entry import ArchiveEntry
+from bhamon_development_toolkit.artifacts.artifact_manifest import ArtifactManifest
+from bhamon_development_toolkit.artifacts.file_hash_cache import FileHashCache
+from bhamon_development_toolkit.artifacts.file_status import FileStatus
+
+
+class ArchiveFormat(abc.ABC):
+    """ Format for artifact archives, to write them with their manifest, verify them and extract them """
+
+
+    @property
+    @abc.abstractmethod
+    def file_extension(self) -> str:
+        pass
+
+
+    @property
+    def supports_incremental(self) -> bool:
+        """ Whether package can reuse the content of a previous archive for unchanged files """
+        return False
+
+
+    @abc.abstractmethod
+    def package(self, # pylint: disable = too-many-arguments
+            archive_path: str, artifact_files: Iterable[Tuple[str,str]], file_statuses: Optional[Dict[str,FileStatus]] = None,
+            previous_archive_path: Optional[str] = None, previous_manifest: Optional[ArtifactManifest] = None,
+            file_hash_cache: Optional[FileHashCache] = None) -> ArtifactManifest:
+        pass
+
+
+    @abc.abstractmethod
+    def verify(self, archive_path: str, manifest: Optional[ArtifactManifest] = None,
+            structural_only: bool = False, max_workers: Optional[int] = None) -> List[str]:
+        """ Return the errors found in the archive, checking the file sizes and hashes against the manifest if there is one """
+
+
+    @abc.abstractmethod
+    def list_files(self, archive_path: str) -> List[str]:
+        pass
+
+
+    @abc.abstractmethod
+    def list_entries(self, archive_path: str) -> List[ArchiveEntry]:
+        pass
+
+
+    @abc.abstractmethod
+    def extract(self, archive_path: str, destination_directory: str,
+            max_workers: Optional[int] = None, file_paths: Optional[Iterable[str]] = None) -> List[ArchiveEntry]:
+        """ Extract the archive files, or only the ones in file_paths, to a directory and return their entries """
@@ -0,0 +1,42 @@
+from typing import List
+
+from bhamon_development_toolkit.artifacts import archive_codecs
+from bhamon_development_toolkit.artifacts.archive_format import ArchiveFormat
+from bhamon_development_toolkit.artifacts.tar_archive_format import TarArchiveFormat
+from bhamon_development_toolkit.artifacts.zip_archive_format import ZipArchiveFormat
+
+
+def create_default_archive_formats() -> List[ArchiveFormat]:
+    """ Create the formats to recognize local artifacts, with tar.zst only if zstandard is installed """
+
+    all_archive_formats: List[ArchiveFormat] = [
+        ZipArchiveFormat(),
+        TarArchiveFormat(),
+        TarArchiveFormat(archive_codecs.create_gzip_codec()),
+        TarArchiveFormat(archive_codecs.create_xz_codec()),
+        TarArchiveFormat(archive_codecs.create_bzip2_codec()),
+    ]
+
+    if archive_codecs.is_zstandard_available():
+        all_archive_formats.append(TarArchiveFormat(archive_codecs.create_zstandard_codec()))
+
+    return all_archive_formats
+
+
+def get_archive_format(identifier: str) -> ArchiveFormat:
+    """ Get an archive format by its file extension without the leading dot, for example 'zip' or 'tar.gz' """
+
+    if identifier == "zip":
+        return ZipArchiveFormat()
+    if identifier == "tar":
+        return TarArchiveFormat()
+    if identifier == "tar.gz":
+        return TarArchiveFormat(archive_codecs.get_archive_codec("gzip"))
+    if identifier == "tar.xz":
+        return TarArchiveFormat(archive_codecs.get_archive_codec("xz"))
+    if identifier == "tar.bz2":
+        return TarArchiveFormat(archive_codecs.get_archive_codec("bzip2"))
+    if identifier == "tar.zst":
+        return TarArchiveFormat(archive_codecs.get_archive_codec("zstandard"))
+
+    raise ValueError("Unsupported archive format: '%s'" % identifier)
@@ -0,0 +1,10 @@
+import dataclasses
+
+
+@dataclasses.dataclass(frozen = True)
+class ArtifactInstallStatistics:
+    written_file_count: int
+    written_size: int
+    skipped_file_count: int
+    skipped_size: int
+    deleted_file_count: int
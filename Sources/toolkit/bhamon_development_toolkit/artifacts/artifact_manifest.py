@@ -0,0 +1,73 @@
+import json
+import os
+from typing import Dict, Iterable, Iterator, Optional
+
+from bhamon_development_toolkit.artifacts.artifact_manifest_comparison import ArtifactManifestComparison
+from bhamon_development_toolkit.artifacts.artifact_manifest_entry import ArtifactManifestEntry
+
+
+class ArtifactManifest:
+    """ List of the files in an artifact with their size, mode and content hash, written alongside the artifact archive """
+
+
+    def __init__(self, hash_algorithm: str = "sha256", all_entries: Optional[Iterable[ArtifactManifestEntry]] = None) -> None:
+        self.hash_algorithm = hash_algorithm
+        self._all_entries: Dict[str,ArtifactManifestEntry] = {}
+
+        for entry in all_entries or []:
+            self.add(entry)
+
+
+    def __len__(self) -> int:
+        return len(self._all_entries)
+
+
+    def __iter__(self) -> Iterator[ArtifactManifestEntry]:
+        return iter(self._all_entries.values())
+
+
+    def add(self, entry: ArtifactManifestEntry) -> None:
+        if entry.path in self._all_entries:
+            raise ValueError("Manifest already has an entry for '%s'" % entry.path)
+        self._all_entries[entry.path] = entry
+
+
+    def get(self, path: str) -> Optional[ArtifactManifestEntry]:
+        return self._all_entries.get(path)
+
+
+    def compare(self, other: "ArtifactManifest") -> ArtifactManifestComparison:
+        """ Compare with another manifest, taken as the newer one, and list the added, removed and modified files """
+
+        if other.hash_algorithm != self.hash_algorithm:
+            raise ValueError("Manifests use different hash algorithms ('%s' and '%s')" % (self.hash_algorithm, other.hash_algorithm))
+
+        added_files = [ entry.path for entry in other if entry.path not in self._all_entries ]
+        removed_files = [ path for path in self._all_entries if other.get(path) is None ]
+        modified_files = [ path for path, entry in self._all_entries.items() if other.get(path) not in [ None, entry ] ]
+
+        return ArtifactManifestComparison(sorted(added_files), sorted(removed_files), sorted(modified_files))
+
+
+    def save(self, file_path: str) -> None:
+        manifest_data = {
+            "version": 1,
+            "hash_algorithm": self.hash_algorithm,
+            "files": [ [ entry.path, entry.size, entry.mode, entry.hash ] for entry in self._all_entries.values() ],
+        }
+
+        with open(file_path + ".tmp", mode = "w", encoding = "utf-8") as manifest_file:
+            manifest_file.write(json.dumps(manifest_data, separators = (",", ":")))
+        os.replace(file_path + ".tmp", file_path)
+
+
+    @staticmethod
+    def load(file_path: str) -> "ArtifactManifest":
+        with open(file_path, mode = "r", encoding = "utf-8") as manifest_file:
+            manifest_data = json.load(manifest_file)
+
+        if manifest_data.get("version") != 1:
+            raise ValueError("Unsupported manifest version: %s" % manifest_data.get("version"))
+
+        all_entries = (ArtifactManifestEntry(*entry_data) for entry_data in manifest_data["files"])
+        return ArtifactManifest(manifest_data["hash_algorithm"], all_entries)
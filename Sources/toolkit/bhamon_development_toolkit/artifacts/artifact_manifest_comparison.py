@@ -0,0 +1,14 @@
+import dataclasses
+from typing import List
+
+
+@dataclasses.dataclass(frozen = True)
+class ArtifactManifestComparison:
+    added_files: List[str]
+    removed_files: List[str]
+    modified_files: List[str]
+
+
+    @property
+    def is_identical(self) -> bool:
+        return len(self.added_files) == 0 and len(self.removed_files) == 0 and len(self.modified_files) == 0
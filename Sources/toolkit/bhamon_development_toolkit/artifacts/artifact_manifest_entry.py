@@ -0,0 +1,9 @@
+import dataclasses
+
+
+@dataclasses.dataclass(frozen = True)
+class ArtifactManifestEntry:
+    path: str
+    size: int
+    mode: int
+    hash: str
@@ -0,0 +1,141 @@
+import array
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class ArtifactMapping:
+    """ Compact list of (source, destination) file mappings ordered by destination path, storing each directory once and indexes in arrays """
+
+
+    def __init__(self, all_mappings: Iterable[Tuple[str,str]] = ()) -> None:
+        self._directory_indexes: Dict[str,int] = {}
+        self._directory_list: List[str] = []
+
+        self._source_directories = array.array("I")
+        self._source_names: List[str] = []
+        self._destination_directories = array.array("I")
+        self._destination_names: List[str] = []
+        self._is_sorted = True
+
+        for source, destination in all_mappings:
+            self.add(source, destination)
+
+
+    def __len__(self) -> int:
+        return len(self._source_names)
+
+
+    def __iter__(self) -> Iterator[Tuple[str,str]]:
+        self.sort()
+
+        all_directories = self._all_directories
+        all_sources = zip(self._source_directories, self._source_names)
+        all_destinations = zip(self._destination_directories, self._destination_names)
+
+        for (source_directory, source_name), (destination_directory, destination_name) in zip(all_sources, all_destinations):
+            yield (all_directories[source_directory] + source_name, all_directories[destination_directory] + destination_name)
+
+
+    def __getitem__(self, index: int) -> Tuple[str,str]:
+        self.sort()
+        return (self._get_source(index), self._get_destination(index))
+
+
+    def add(self, source: str, destination: str) -> None:
+        directory_indexes = self._directory_indexes
+        source_directory, source_name = self._split(source)
+        destination_directory, destination_name = self._split(destination)
+
+        # Share the name between source and destination when they are the same, which is the common case
+        if destination_name == source_name:
+            destination_name = source_name
+
+        self._source_directories.append(directory_indexes.setdefault(source_directory, len(directory_indexes)))
+        self._source_names.append(source_name)
+        self._destination_directories.append(directory_indexes.setdefault(destination_directory, len(directory_indexes)))
+        self._destination_names.append(destination_name)
+        self._is_sorted = False
+
+
+    def sources(self) -> Iterator[str]:
+        self.sort()
+        for source_directory, source_name in zip(self._source_directories, self._source_names):
+            yield self._all_directories[source_directory] + source_name
+
+
+    def destinations(self) -> Iterator[str]:
+        self.sort()
+        for destination_directory, destination_name in zip(self._destination_directories, self._destination_names):
+            yield self._all_directories[destination_directory] + destination_name
+
+
+    def sort(self) -> None:
+        """ Sort the mappings by destination path, keeping the insertion order for mappings with the same destination """
+
+        if self._is_sorted:
+            return
+
+        # Compare full paths since sorting by directory and then by name would order "a/c" before "a/b/x"
+        order = sorted(range(len(self._destination_names)), key = self._get_destination)
+
+        self._reorder(order)
+        self._is_sorted = True
+
+
+    def merge(self) -> List[Tuple[str,List[str]]]:
+        """ Keep only the first mapping for each destination, and return the destinations which had several distinct sources """
+
+        self.sort()
+
+        kept_indexes: List[int] = []
+        all_groups: List[Tuple[str,List[str]]] = []
+        previous_destination = None
+
+        for index, destination_key in enumerate(zip(self._destination_directories, self._destination_names)):
+            if destination_key != previous_destination:
+                kept_indexes.append(index)
+                previous_destination = destination_key
+                continue
+
+            source = self._get_source(index)
+            destination = self._get_destination(index)
+            if len(all_groups) == 0 or all_groups[-1][0] != destination:
+                all_groups.append((destination, [ self._get_source(kept_indexes[-1]) ]))
+            if source not in all_groups[-1][1]:
+                all_groups[-1][1].append(source)
+
+        if len(kept_indexes) != len(self._source_names):
+            self._reorder(kept_indexes)
+
+        return [ (destination, source_collection) for destination, source_collection in all_groups if len(source_collection) > 1 ]
+
+
+    def _get_source(self, index: int) -> str:
+        return self._all_directories[self._source_directories[index]] + self._source_names[index]
+
+
+    def _get_destination(self, index: int) -> str:
+        return self._all_directories[self._destination_directories[index]] + self._destination_names[index]
+
+
+    @property
+    def _all_directories(self) -> List[str]:
+        # Directories are indexed in insertion order, so the dictionary keys already are the list of directories
+        if len(self._directory_list) != len(self._directory_indexes):
+            self._directory_list = list(self._directory_indexes)
+        return self._directory_list
+
+
+    def _split(self, path: str) -> Tuple[str,str]:
+        """ Split a path after its last separator, keeping the separator in the directory so that joining is a concatenation """
+
+        separator_index = path.rfind("/")
+        if "\\" in path:
+            separator_index = max(separator_index, path.rfind("\\"))
+        return (path[:separator_index + 1], path[separator_index + 1:])
+
+
+    def _reorder(self, all_indexes: List[int]) -> None:
+        self._source_directories = array.array("I", (self._source_directories[index] for index in all_indexes))
+        self._source_names = [ self._source_names[index] for index in all_indexes ]
+        self._destination_directories = array.array("I", (self._destination_directories[index] for index in all_indexes))
+        self._destination_names = [ self._destination_names[index] for index in all_indexes ]
@@ -0,0 +1,265 @@
+import collections
+import concurrent.futures
+import dataclasses
+import functools
+import hashlib
+import logging
+import os
+import tempfile
+import time
+import zipfile
+import zlib
+from typing import IO, Callable, Counter, Deque, Dict, Iterable, Optional, Tuple
+
+from bhamon_development_toolkit.artifacts import zip_helpers
+from bhamon_development_toolkit.artifacts.artifact_manifest import ArtifactManifest
+from bhamon_development_toolkit.artifacts.artifact_manifest_entry import ArtifactManifestEntry
+from bhamon_development_toolkit.artifacts.compression_policy import CompressionPolicy
+from bhamon_development_toolkit.artifacts.file_hash_cache import FileHashCache
+from bhamon_development_toolkit.artifacts.file_status import FileStatus
+
+
+logger = logging.getLogger("Artifact")
+
+
+@dataclasses.dataclass(frozen = True)
+class _CompressedFile:
+    file_size: int
+    compress_size: int
+    crc: int
+    hash: str
+    data_file: IO[bytes]
+
+
+class ArtifactPackager:
+    """ Write artifact archives with their manifest, optionally copying the compressed entries of unchanged files from a previous archive """
+
+
+    def __init__(self, compression: int = zipfile.ZIP_DEFLATED, hash_algorithm: str = "sha256", max_workers: int = 1,
+            compression_policy: Optional[CompressionPolicy] = None) -> None:
+        self.compression_policy = compression_policy if compression_policy is not None else CompressionPolicy(compression)
+        self.hash_algorithm = hash_algorithm
+        self.max_workers = max_workers
+
+        # Compressed files waiting to be written are kept in memory up to this size, and in temporary files above it
+        self.spool_size = 16 * 1024 * 1024
+
+        self.reused_entry_count = 0
+        self.written_entry_count = 0
+        self.compression_decisions: Counter[str] = collections.Counter()
+        self.total_file_size = 0
+        self.total_compress_size = 0
+
+
+    def package(self, # pylint: disable = too-many-arguments, too-many-locals
+            archive_path: str, artifact_files: Iterable[Tuple[str,str]], file_statuses: Optional[Dict[str,FileStatus]] = None,
+            previous_archive_path: Optional[str] = None, previous_manifest: Optional[ArtifactManifest] = None,
+            file_hash_cache: Optional[FileHashCache] = None) -> ArtifactManifest:
+
+        """ Write the archive and return its manifest, an unchanged file is one with the same size, mode and hash as its entry in the previous manifest """
+
+        manifest = ArtifactManifest(self.hash_algorithm)
+
+        if previous_manifest is not None and previous_manifest.hash_algorithm != self.hash_algorithm:
+            previous_manifest = None
+
+        previous_archive = zipfile.ZipFile(previous_archive_path, mode = "r") if previous_archive_path is not None else None # pylint: disable = consider-using-with
+        previous_file = open(previous_archive_path, mode = "rb") if previous_archive_path is not None else None # pylint: disable = consider-using-with
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers = self.max_workers) if self.max_workers > 1 else None
+
+        # Entries are written in order from the main thread, while up to two entries per worker are compressed ahead
+        pending_writes: Deque[Callable[[],ArtifactManifestEntry]] = collections.deque()
+        pending_limit = 2 * self.max_workers if executor is not None else 0
+
+        try:
+            previous_hashes = self._get_previous_hashes(artifact_files, previous_manifest, file_hash_cache)
+
+            with zipfile.ZipFile(archive_path, mode = "w", compression = self.compression_policy.default_compression) as archive_file:
+                for source, destination in artifact_files:
+                    logger.debug("+ '%s' => '%s'", source, destination)
+
+                    file_status = file_statuses.get(source) if file_statuses is not None else None
+                    zip_info = self._create_zip_info(source, destination, file_status)
+                    previous_info = previous_archive.NameToInfo.get(zip_info.filename) if previous_archive is not None else None
+                    previous_entry = previous_manifest.get(zip_info.filename) if previous_manifest is not None else None
+
+                    if previous_info is not None and self._is_unchanged(source, zip_info, previous_info, previous_entry, previous_hashes):
+                        pending_writes.append(functools.partial(self._copy_entry, archive_file, zip_info, previous_file, previous_info, previous_entry))
+                        self.reused_entry_count += 1
+                    elif executor is not None:
+                        future = executor.submit(self._compress_file, source, zip_info.compress_type)
+                        pending_writes.append(functools.partial(self._write_compressed_file, archive_file, zip_info, future))
+                        self.written_entry_count += 1
+                    else:
+                        pending_writes.append(functools.partial(self._write_file, archive_file, source, zip_info))
+                        self.written_entry_count += 1
+
+                    while len(pending_writes) > pending_limit:
+                        manifest.add(pending_writes.popleft()())
+
+                while len(pending_writes) > 0:
+                    manifest.add(pending_writes.popleft()())
+
+                self.total_file_size += sum(zip_info.file_size for zip_info in archive_file.infolist())
+                self.total_compress_size += sum(zip_info.compress_size for zip_info in archive_file.infolist())
+
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures = True)
+            if previous_file is not None:
+                previous_file.close()
+            if previous_archive is not None:
+                previous_archive.close()
+
+        if previous_archive_path is not None:
+            logger.info("Reused %s unchanged files from the previous archive, wrote %s files", self.reused_entry_count, self.written_entry_count)
+        logger.info("Packaged %s bytes to %s bytes (Compression decisions: %s)", self.total_file_size, self.total_compress_size,
+            ", ".join("%s=%s" % (reason, count) for reason, count in sorted(self.compression_decisions.items())))
+
+        return manifest
+
+
+    def _get_previous_hashes(self, artifact_files: Iterable[Tuple[str,str]],
+            previous_manifest: Optional[ArtifactManifest], file_hash_cache: Optional[FileHashCache]) -> Dict[str,str]:
+
+        """ Get the hashes for the sources with an entry in the previous manifest, in a single batch so that the cache computes them in parallel """
+
+        # The file hash cache always computes sha256 hashes
+        if previous_manifest is None or file_hash_cache is None or self.hash_algorithm != "sha256":
+            return {}
+
+        all_sources = [ source for source, destination in artifact_files if previous_manifest.get(self._get_archive_name(destination)) is not None ]
+        return file_hash_cache.get_hashes(all_sources)
+
+
+    def _is_unchanged(self, # pylint: disable = too-many-arguments
+            source: str, zip_info: zipfile.ZipInfo, previous_info: zipfile.ZipInfo,
+            previous_entry: Optional[ArtifactManifestEntry], previous_hashes: Dict[str,str]) -> bool:
+
+        """ Compare the file with its previous entry, always by content since a modification time can match a file modified in the same second """
+
+        if previous_entry is None:
+            return False
+        if previous_info.compress_type != zip_info.compress_type or not zip_helpers.can_copy_raw_entry(previous_info):
+            return False
+        if previous_info.file_size != zip_info.file_size or previous_info.external_attr != zip_info.external_attr:
+            return False
+
+        # Without a file hash cache, hashing the file is still much faster than compressing it again
+        file_hash = previous_hashes.get(source)
+        if file_hash is None:
+            file_hash = self._compute_hash(source)
+
+        return previous_entry.hash == file_hash
+
+
+    def _create_zip_info(self, source: str, destination: str, file_status: Optional[FileStatus]) -> zipfile.ZipInfo:
+        """ Create the entry information like ZipFile.write, with the compression from the policy and reusing the status from check_files """
+
+        if file_status is None:
+            zip_info = zipfile.ZipInfo.from_file(source, destination)
+        else:
+            date_time = time.localtime(file_status.modification_time)[0:6]
+            if date_time[0] < 1980:
+                date_time = (1980, 1, 1, 0, 0, 0)
+
+            zip_info = zipfile.ZipInfo(self._get_archive_name(destination), date_time)
+            zip_info.external_attr = (file_status.mode & 0xFFFF) << 16
+            zip_info.file_size = file_status.size
+
+        compression, reason = self.compression_policy.select(zip_info.filename, source, zip_info.file_size)
+        self.compression_decisions[reason] += 1
+
+        zip_info.compress_type = compression
+        zip_helpers.set_compress_level(zip_info, self.compression_policy.compression_level)
+        return zip_info
+
+
+    def _get_archive_name(self, destination: str) -> str:
+        return os.path.normpath(os.path.splitdrive(destination)[1]).lstrip(os.sep).replace(os.sep, "/")
+
+
+    def _write_file(self, archive_file: zipfile.ZipFile, source: str, zip_info: zipfile.ZipInfo) -> ArtifactManifestEntry:
+        """ Write a file to the archive, hashing it in the same read pass """
+
+        hash_function = hashlib.new(self.hash_algorithm)
+
+        with open(source, mode = "rb") as source_file:
+            with archive_file.open(zip_info, mode = "w") as destination_file:
+                while True:
+                    data = source_file.read(1024 * 1024)
+                    if not data:
+                        break
+                    hash_function.update(data)
+                    destination_file.write(data)
+
+        return ArtifactManifestEntry(zip_info.filename, zip_info.file_size, zip_info.external_attr >> 16, hash_function.hexdigest())
+
+
+    def _copy_entry(self, archive_file: zipfile.ZipFile, zip_info: zipfile.ZipInfo,
+            previous_file: IO[bytes], previous_info: zipfile.ZipInfo, previous_entry: ArtifactManifestEntry) -> ArtifactManifestEntry:
+
+        zip_helpers.copy_raw_entry(previous_file, previous_info, archive_file, zip_info)
+        return ArtifactManifestEntry(zip_info.filename, zip_info.file_size, zip_info.external_attr >> 16, previous_entry.hash)
+
+
+    def _compress_file(self, source: str, compression: int) -> _CompressedFile:
+        """ Compress a file to a temporary file, in a worker thread since zlib, bz2 and lzma release the GIL while compressing """
+
+        compressor = zip_helpers.create_compressor(compression, self.compression_policy.compression_level)
+        hash_function = hashlib.new(self.hash_algorithm)
+        data_file = tempfile.SpooledTemporaryFile(max_size = self.spool_size) # pylint: disable = consider-using-with
+        file_size = 0
+        crc = 0
+
+        try:
+            with open(source, mode = "rb") as source_file:
+                while True:
+                    data = source_file.read(1024 * 1024)
+                    if not data:
+                        break
+                    file_size += len(data)
+                    crc = zlib.crc32(data, crc)
+                    hash_function.update(data)
+                    data_file.write(compressor.compress(data) if compressor is not None else data)
+
+            if compressor is not None:
+                data_file.write(compressor.flush())
+
+            compress_size = data_file.tell()
+            data_file.seek(0)
+
+        except:
+            data_file.close()
+            raise
+
+        return _CompressedFile(file_size, compress_size, crc, hash_function.hexdigest(), data_file)
+
+
+    def _write_compressed_file(self, archive_file: zipfile.ZipFile,
+            zip_info: zipfile.ZipInfo, future: "concurrent.futures.Future[_CompressedFile]") -> ArtifactManifestEntry:
+
+        compressed_file = future.result()
+
+        try:
+            zip_info.file_size = compressed_file.file_size
+            zip_info.compress_size = compressed_file.compress_size
+            zip_info.CRC = compressed_file.crc
+            zip_helpers.write_raw_entry(archive_file, zip_info, compressed_file.data_file)
+        finally:
+            compressed_file.data_file.close()
+
+        return ArtifactManifestEntry(zip_info.filename, zip_info.file_size, zip_info.external_attr >> 16, compressed_file.hash)
+
+
+    def _compute_hash(self, source: str) -> str:
+        hash_function = hashlib.new(self.hash_algorithm)
+
+        with open(source, mode = "rb") as source_file:
+            while True:
+                data = source_file.read(1024 * 1024)
+                if not data:
+                    break
+                hash_function.update(data)
+
+        return hash_function.hexdigest()
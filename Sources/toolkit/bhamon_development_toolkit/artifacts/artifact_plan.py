@@ -0,0 +1,40 @@
+import dataclasses
+from typing import Any, Dict, List, Optional, Tuple
+
+from bhamon_development_toolkit.artifacts.fileset_plan import FilesetPlan
+
+
+@dataclasses.dataclass(frozen = True)
+class ArtifactPlan:
+    """ Artifact compiled with its parameters, resolved once for both the file list and the file mapping, and serializable to pass it between steps """
+
+    all_filesets: Tuple[FilesetPlan, ...]
+    all_fileset_files: Optional[Tuple[Tuple[str, ...], ...]] = None
+
+
+    @property
+    def is_resolved(self) -> bool:
+        return self.all_fileset_files is not None
+
+
+    def to_dict(self) -> Dict[str,Any]:
+        return dataclasses.asdict(self)
+
+
+    @staticmethod
+    def from_dict(data: Dict[str,Any]) -> "ArtifactPlan":
+        all_filesets: List[FilesetPlan] = []
+        for fileset_data in data["all_filesets"]:
+            all_filesets.append(FilesetPlan(
+                identifier = fileset_data["identifier"],
+                path_in_workspace = fileset_data["path_in_workspace"],
+                path_in_archive = fileset_data["path_in_archive"],
+                file_paths = tuple(fileset_data["file_paths"]),
+                file_patterns = tuple(fileset_data["file_patterns"]),
+            ))
+
+        all_fileset_files = None
+        if data.get("all_fileset_files") is not None:
+            all_fileset_files = tuple(tuple(fileset_files) for fileset_files in data["all_fileset_files"])
+
+        return ArtifactPlan(tuple(all_filesets), all_fileset_files)
@@ -0,0 +1,55 @@
+import zipfile
+
+from bhamon_development_toolkit.asyncio_extensions import asyncio_helpers
+
+
+class AsyncArtifactRepository:
+    """ Async facade for ArtifactRepository, running its operations with the blocking executor """
+
+
+    def __init__(self, repository):
+        self.repository = repository
+
+
+    async def list_remote(self, path_in_repository, artifact_pattern):
+        return await asyncio_helpers.run_blocking(self.repository.list_remote, path_in_repository, artifact_pattern, operation_type = "disk")
+
+
+    async def package(self, # pylint: disable = too-many-arguments
+            path_in_repository, artifact_name, artifact_files, compression = zipfile.ZIP_DEFLATED, file_statuses = None,
+            compression_policy = None, incremental = False, file_hash_cache = None, max_workers = 1, simulate = False):
+        await asyncio_helpers.run_blocking(self.repository.package, path_in_repository, artifact_name, artifact_files,
+            compression = compression, file_statuses = file_statuses, compression_policy = compression_policy,
+            incremental = incremental, file_hash_cache = file_hash_cache, max_workers = max_workers, simulate = simulate, operation_type = "cpu")
+
+
+    async def load_manifest(self, path_in_repository, artifact_name):
+        return await asyncio_helpers.run_blocking(self.repository.load_manifest, path_in_repository, artifact_name, operation_type = "disk")
+
+
+    async def verify(self, # pylint: disable = too-many-arguments
+            path_in_repository, artifact_name, use_manifest = True, structural_only = False, max_workers = None, simulate = False):
+        await asyncio_helpers.run_blocking(self.repository.verify, path_in_repository, artifact_name, use_manifest = use_manifest,
+            structural_only = structural_only, max_workers = max_workers, simulate = simulate, operation_type = "cpu")
+
+
+    async def upload(self, path_in_repository, artifact_name, overwrite = False, simulate = False):
+        await asyncio_helpers.run_blocking(self.repository.upload,
+            path_in_repository, artifact_name, overwrite = overwrite, simulate = simulate, operation_type = "disk")
+
+
+    async def download(self, path_in_repository, artifact_name, simulate = False):
+        await asyncio_helpers.run_blocking(self.repository.download, path_in_repository, artifact_name, simulate = simulate, operation_type = "disk")
+
+
+    async def install(self, # pylint: disable = too-many-arguments
+            path_in_repository, artifact_name, installation_directory, extraction_directory = None, replace = False,
+            differential = False, delete_extra_files = False, file_hash_cache = None, max_workers = None, simulate = False):
+        return await asyncio_helpers.run_blocking(self.repository.install,
+            path_in_repository, artifact_name, installation_directory, extraction_directory = extraction_directory, replace = replace,
+            differential = differential, delete_extra_files = delete_extra_files, file_hash_cache = file_hash_cache,
+            max_workers = max_workers, simulate = simulate, operation_type = "disk")
+
+
+    async def delete_remote(self, path_in_repository, artifact_name, simulate = False):
+        await asyncio_helpers.run_blocking(self.repository.delete_remote, path_in_repository, artifact_name, simulate = simulate, operation_type = "disk")
@@ -0,0 +1,72 @@
+import fnmatch
+import re
+import zipfile
+import zlib
+from typing import List, Optional, Tuple
+
+
+# Patterns for file formats which are already compressed, so that storing them is as small as compressing them again
+all_compressed_file_patterns = [
+    "*.7z", "*.br", "*.bz2", "*.gz", "*.jar", "*.lz4", "*.nupkg", "*.tgz", "*.whl", "*.xz", "*.zip", "*.zst",
+    "*.gif", "*.jpeg", "*.jpg", "*.png", "*.webp",
+    "*.flac", "*.mp3", "*.mp4", "*.ogg", "*.webm",
+]
+
+
+class CompressionPolicy:
+    """ Select the compression for each archive entry, using rules matching the entry path, a minimum size and an optional trial compression of a sample """
+
+
+    def __init__(self, # pylint: disable = too-many-arguments
+            default_compression: int = zipfile.ZIP_DEFLATED, compression_level: Optional[int] = None,
+            rules: Optional[List[Tuple[str,int]]] = None, minimum_size: int = 0,
+            sample_size: Optional[int] = None, maximum_sample_ratio: float = 0.9) -> None:
+
+        self.default_compression = default_compression
+        self.compression_level = compression_level
+        self.minimum_size = minimum_size
+        self.sample_size = sample_size
+        self.maximum_sample_ratio = maximum_sample_ratio
+
+        self._all_rules = [ (re.compile(fnmatch.translate(pattern), re.IGNORECASE), compression) for pattern, compression in (rules or []) ]
+
+
+    @staticmethod
+    def create_default(compression_level: Optional[int] = None, sample_size: Optional[int] = None) -> "CompressionPolicy":
+        """ Create a policy storing small files and files in an already compressed format, and deflating the others """
+
+        rules = [ (pattern, zipfile.ZIP_STORED) for pattern in all_compressed_file_patterns ]
+        return CompressionPolicy(zipfile.ZIP_DEFLATED, compression_level, rules, minimum_size = 64, sample_size = sample_size)
+
+
+    def select(self, archive_name: str, source: str, file_size: int) -> Tuple[int,str]:
+        """ Return the compression for an entry, with the reason for the decision, one of 'rule', 'size', 'sample' or 'default' """
+
+        for pattern, compression in self._all_rules:
+            if pattern.match(archive_name):
+                return (compression, "rule")
+
+        if self.default_compression == zipfile.ZIP_STORED:
+            return (self.default_compression, "default")
+
+        if file_size < self.minimum_size:
+            return (zipfile.ZIP_STORED, "size")
+
+        if self.sample_size is not None and file_size > 0 and self._is_sample_incompressible(source):
+            return (zipfile.ZIP_STORED, "sample")
+
+        return (self.default_compression, "default")
+
+
+    def _is_sample_incompressible(self, source: str) -> bool:
+        """ Compress the start of the file with the fastest level, which is enough to detect compressed or random data """
+
+        with open(source, mode = "rb") as source_file:
+            sample = source_file.read(self.sample_size)
+
+        if len(sample) == 0:
+            return False
+
+        compressor = zlib.compressobj(1, zlib.DEFLATED, -15)
+        compressed_size = len(compressor.compress(sample)) + len(compressor.flush())
+        return compressed_size > len(sample) * self.maximum_sample_ratio
@@ -0,0 +1,135 @@
+import concurrent.futures
+import dataclasses
+import datetime
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+logger = logging.getLogger("Artifact")
+
+
+@dataclasses.dataclass(frozen = True)
+class _FileHash:
+    size: int
+    modification_time: int
+    inode: int
+    hash: str
+
+
+class FileHashCache:
+    """ Compute file content hashes with a thread pool, caching them by path, size, modification time and inode """
+
+
+    def __init__(self, cache_file_path: Optional[str] = None, max_workers: Optional[int] = None,
+            timestamp_resolution: datetime.timedelta = datetime.timedelta(seconds = 2)) -> None:
+        self.cache_file_path = cache_file_path
+        self.max_workers = max_workers if max_workers is not None else min(32, (os.cpu_count() or 1) + 4)
+        self.timestamp_resolution = timestamp_resolution
+
+        self.reused_hash_count = 0
+        self.computed_hash_count = 0
+
+        self._all_hashes: Dict[str,_FileHash] = {}
+        self._is_modified = False
+
+
+    def __enter__(self) -> "FileHashCache":
+        self.load()
+        return self
+
+
+    def __exit__(self, exception_type, exception_value, traceback) -> None:
+        self.save()
+
+
+    def load(self) -> None:
+        self._all_hashes.clear()
+        self._is_modified = False
+
+        if self.cache_file_path is None or not os.path.exists(self.cache_file_path):
+            return
+
+        try:
+            with open(self.cache_file_path, mode = "r", encoding = "utf-8") as cache_file:
+                cache_data = json.load(cache_file)
+
+            if cache_data.get("version") != 1:
+                raise ValueError("Unsupported version: %s" % cache_data.get("version"))
+
+            for file_path, hash_data in cache_data["files"].items():
+                self._all_hashes[file_path] = _FileHash(*hash_data)
+
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning("Ignoring invalid file hash cache '%s'", self.cache_file_path, exc_info = True)
+            self._all_hashes.clear()
+
+
+    def save(self) -> None:
+        if self.cache_file_path is None or not self._is_modified:
+            return
+
+        cache_data = {
+            "version": 1,
+            "files": { file_path: (entry.size, entry.modification_time, entry.inode, entry.hash) for file_path, entry in self._all_hashes.items() },
+        }
+
+        cache_directory = os.path.dirname(self.cache_file_path)
+        if cache_directory:
+            os.makedirs(cache_directory, exist_ok = True)
+
+        with open(self.cache_file_path + ".tmp", mode = "w", encoding = "utf-8") as cache_file:
+            cache_file.write(json.dumps(cache_data, separators = (",", ":")))
+        os.replace(self.cache_file_path + ".tmp", self.cache_file_path)
+
+        self._is_modified = False
+
+
+    def get_hashes(self, all_file_paths: Iterable[str]) -> Dict[str,str]:
+        """ Return the content hash for each file, computing the ones missing from the cache in parallel """
+
+        all_results: Dict[str,str] = {}
+        files_to_hash: List[Tuple[str,os.stat_result]] = []
+
+        for file_path in set(all_file_paths):
+            file_status = os.stat(file_path)
+            entry = self._all_hashes.get(file_path)
+
+            if entry is not None and (entry.size, entry.modification_time, entry.inode) == (file_status.st_size, file_status.st_mtime_ns, file_status.st_ino):
+                all_results[file_path] = entry.hash
+                self.reused_hash_count += 1
+            else:
+                files_to_hash.append((file_path, file_status))
+
+        if len(files_to_hash) == 0:
+            return all_results
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers = min(self.max_workers, len(files_to_hash))) as executor:
+            all_hashes = executor.map(self._compute_hash, [ file_path for file_path, _ in files_to_hash ])
+
+            for (file_path, file_status), file_hash in zip(files_to_hash, all_hashes):
+                all_results[file_path] = file_hash
+                self.computed_hash_count += 1
+
+                # A file modified in the same timestamp tick as the hash computation could change again without its modification time changing
+                if time.time_ns() - file_status.st_mtime_ns > self.timestamp_resolution.total_seconds() * 1e9:
+                    self._all_hashes[file_path] = _FileHash(file_status.st_size, file_status.st_mtime_ns, file_status.st_ino, file_hash)
+                    self._is_modified = True
+
+        return all_results
+
+
+    def _compute_hash(self, file_path: str) -> str:
+        hash_function = hashlib.sha256()
+
+        with open(file_path, mode = "rb") as source_file:
+            while True:
+                data = source_file.read(1024 * 1024)
+                if not data:
+                    break
+                hash_function.update(data)
+
+        return hash_function.hexdigest()
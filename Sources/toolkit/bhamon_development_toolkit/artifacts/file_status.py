@@ -0,0 +1,12 @@
+import dataclasses
+from typing import Optional
+
+
+@dataclasses.dataclass(frozen = True)
+class FileStatus:
+    path: str
+    exists: bool
+    is_file: bool
+    size: Optional[int] = None
+    modification_time: Optional[float] = None
+    mode: Optional[int] = None
@@ -0,0 +1,65 @@
+import concurrent.futures
+import os
+from typing import Dict, Iterable, List, Optional
+
+from bhamon_development_toolkit.artifacts.file_status import FileStatus
+
+
+class FileStatusChecker:
+    """ Check the status of many files with one scandir call per directory, running directories in parallel for network file systems """
+
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.max_workers = max_workers if max_workers is not None else min(32, (os.cpu_count() or 1) + 4)
+
+
+    def check(self, all_file_paths: Iterable[str]) -> Dict[str,FileStatus]:
+        """ Return the status of each file, indexed by path """
+
+        all_files_by_directory: Dict[str,List[str]] = {}
+        for file_path in all_file_paths:
+            all_files_by_directory.setdefault(os.path.dirname(file_path), []).append(file_path)
+
+        all_statuses: Dict[str,FileStatus] = {}
+        if len(all_files_by_directory) == 0:
+            return all_statuses
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers = min(self.max_workers, len(all_files_by_directory))) as executor:
+            for directory_statuses in executor.map(self._check_directory, all_files_by_directory.keys(), all_files_by_directory.values()):
+                all_statuses.update(directory_statuses)
+
+        return all_statuses
+
+
+    def _check_directory(self, directory: str, all_file_paths: List[str]) -> Dict[str,FileStatus]:
+        all_entries: Dict[str,os.DirEntry] = {}
+
+        try:
+            with os.scandir(directory if directory else os.curdir) as entry_iterator:
+                for entry in entry_iterator:
+                    all_entries[os.path.normcase(entry.name)] = entry
+        except OSError:
+            pass
+
+        all_statuses: Dict[str,FileStatus] = {}
+
+        for file_path in all_file_paths:
+            entry = all_entries.get(os.path.normcase(os.path.basename(file_path)))
+
+            try:
+                if entry is None or not entry.is_file():
+                    all_statuses[file_path] = FileStatus(file_path, exists = entry is not None and os.path.exists(entry.path), is_file = False)
+                    continue
+
+                entry_status = entry.stat()
+            except OSError:
+                all_statuses[file_path] = FileStatus(file_path, exists = False, is_file = False)
+                continue
+
+            all_statuses[file_path] = FileStatus(file_path, exists = True, is_file = True,
+                size = entry_status.st_size, modification_time = entry_status.st_mtime, mode = entry_status.st_mode)
+
+        return all_statuses
@@ -0,0 +1,183 @@
+import dataclasses
+import datetime
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+
+logger = logging.getLogger("Artifact")
+
+
+# Files matched in a directory, grouped by the indexes of the patterns they matched, and the subdirectories to visit
+DirectoryMatches = Tuple[List[Tuple[List[int],List[str]]],List[str]]
+
+
+@dataclasses.dataclass(frozen = True)
+class _DirectoryListing:
+    modification_time: Optional[int]
+    inode: Optional[int]
+    matched_files: List[Tuple[List[int],List[str]]]
+    directory_names: List[str]
+
+
+@dataclasses.dataclass
+class _WalkCache:
+    all_directories: Dict[str,_DirectoryListing]
+    all_files: Optional[List[List[str]]]
+
+
+class FilesetCache:
+    """ Persistent cache for fileset resolution, storing the files resolved by each walk and the state of the directories it visited """
+
+
+    def __init__(self, cache_file_path: Optional[str] = None, timestamp_resolution: datetime.timedelta = datetime.timedelta(seconds = 2)) -> None:
+        self.cache_file_path = cache_file_path
+        self.timestamp_resolution = timestamp_resolution
+
+        self.reused_walk_count = 0
+        self.reused_directory_count = 0
+        self.scanned_directory_count = 0
+
+        self._all_walks: Dict[str,_WalkCache] = {}
+        self._pending_states: Dict[Tuple[str,str],Tuple[Optional[int],Optional[int]]] = {}
+        self._is_modified = False
+
+
+    def __enter__(self) -> "FilesetCache":
+        self.load()
+        return self
+
+
+    def __exit__(self, exception_type, exception_value, traceback) -> None:
+        self.save()
+
+
+    def load(self) -> None:
+        self._all_walks.clear()
+        self._is_modified = False
+
+        if self.cache_file_path is None or not os.path.exists(self.cache_file_path):
+            return
+
+        try:
+            with open(self.cache_file_path, mode = "r", encoding = "utf-8") as cache_file:
+                cache_data = json.load(cache_file)
+
+            if cache_data.get("version") != 2:
+                raise ValueError("Unsupported version: %s" % cache_data.get("version"))
+
+            for walk_key, walk_data in cache_data["walks"].items():
+                all_directories = { path: _DirectoryListing(*listing_data) for path, listing_data in walk_data["directories"].items() }
+                self._all_walks[walk_key] = _WalkCache(all_directories, walk_data["files"])
+
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning("Ignoring invalid fileset cache '%s'", self.cache_file_path, exc_info = True)
+            self._all_walks.clear()
+
+
+    def save(self) -> None:
+        if self.cache_file_path is None or not self._is_modified:
+            return
+
+        cache_data = {
+            "version": 2,
+            "walks": {
+                walk_key: {
+                    "directories": {
+                        path: (listing.modification_time, listing.inode, listing.matched_files, listing.directory_names)
+                        for path, listing in walk.all_directories.items()
+                    },
+                    "files": walk.all_files,
+                }
+                for walk_key, walk in self._all_walks.items()
+            },
+        }
+
+        cache_directory = os.path.dirname(self.cache_file_path)
+        if cache_directory:
+            os.makedirs(cache_directory, exist_ok = True)
+
+        with open(self.cache_file_path + ".tmp", mode = "w", encoding = "utf-8") as cache_file:
+            cache_file.write(json.dumps(cache_data, separators = (",", ":")))
+        os.replace(self.cache_file_path + ".tmp", self.cache_file_path)
+
+        self._is_modified = False
+
+
+    def get_walk_results(self, walk_key: str) -> Optional[List[List[str]]]:
+        """ Return the files resolved by a previous walk, if none of the directories it visited changed since then """
+
+        walk = self._all_walks.get(walk_key)
+        if walk is None or walk.all_files is None:
+            return None
+
+        for directory, listing in walk.all_directories.items():
+            if self._get_directory_state(directory) != (listing.modification_time, listing.inode):
+                return None
+
+        self.reused_walk_count += 1
+        return walk.all_files
+
+
+    def get_directory_matches(self, walk_key: str, directory: str) -> Optional[DirectoryMatches]:
+        """ Return the entries which matched in a directory during the previous walk, if the directory modification time and inode did not change """
+
+        walk = self._all_walks.get(walk_key)
+        listing = walk.all_directories.get(directory) if walk is not None else None
+        if listing is None:
+            return None
+
+        state = self._get_directory_state(directory)
+        if state != (listing.modification_time, listing.inode):
+            return None
+
+        self.reused_directory_count += 1
+        self._pending_states[(walk_key, directory)] = state
+        return (listing.matched_files, listing.directory_names)
+
+
+    def scan_directory(self, walk_key: str, directory: str) -> List[os.DirEntry]:
+        """ List a directory with os.scandir, saving its state for the next walk unless it was modified too recently """
+
+        self.scanned_directory_count += 1
+
+        # A directory modified in the same timestamp tick as the scan could change again without its modification time changing
+        state = self._get_directory_state(directory)
+        if state[0] is None or time.time_ns() - state[0] > self.timestamp_resolution.total_seconds() * 1e9:
+            self._pending_states[(walk_key, directory)] = state
+
+        try:
+            with os.scandir(directory) as entry_iterator:
+                return list(entry_iterator)
+        except OSError:
+            if state[0] is not None:
+                self._pending_states.pop((walk_key, directory), None)
+            raise
+
+
+    def set_walk_results(self, walk_key: str, all_matches: Dict[str,DirectoryMatches], all_files: List[Set[str]]) -> None:
+        """ Save the files resolved by a walk, with the entries which matched in each directory it visited """
+
+        all_directories: Dict[str,_DirectoryListing] = {}
+        is_complete = True
+
+        for directory, (matched_files, directory_names) in all_matches.items():
+            state = self._pending_states.pop((walk_key, directory), None)
+            if state is None:
+                is_complete = False
+            else:
+                all_directories[directory] = _DirectoryListing(state[0], state[1], matched_files, directory_names)
+
+        # Directories modified too recently are scanned again on the next walk, so the walk results cannot be reused as a whole
+        self._all_walks[walk_key] = _WalkCache(all_directories, [ sorted(file_collection) for file_collection in all_files ] if is_complete else None)
+        self._is_modified = True
+
+
+    def _get_directory_state(self, directory: str) -> Tuple[Optional[int],Optional[int]]:
+        try:
+            status = os.stat(directory)
+        except OSError:
+            return (None, None)
+        return (status.st_mtime_ns, status.st_ino)
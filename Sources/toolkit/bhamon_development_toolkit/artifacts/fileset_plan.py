@@ -0,0 +1,13 @@
+import dataclasses
+from typing import Optional, Tuple
+
+
+@dataclasses.dataclass(frozen = True)
+class FilesetPlan:
+    """ Fileset compiled with its parameters, with the file paths from its file functions already listed """
+
+    identifier: Optional[str]
+    path_in_workspace: str
+    path_in_archive: Optional[str]
+    file_paths: Tuple[str, ...]
+    file_patterns: Tuple[str, ...]
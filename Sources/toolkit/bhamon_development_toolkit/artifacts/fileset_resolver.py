@@ -0,0 +1,289 @@
+import dataclasses
+import fnmatch
+import glob
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Pattern, Set, Tuple
+
+from bhamon_development_toolkit.artifacts.fileset_cache import DirectoryMatches, FilesetCache
+
+
+_Position = Tuple[int,int]
+_States = Tuple[_Position, ...]
+
+
+@dataclasses.dataclass(frozen = True)
+class _PatternComponent:
+    kind: str
+    name: str
+    regex: Optional[Pattern] = None
+
+
+@dataclasses.dataclass(frozen = True)
+class _CompiledPattern:
+    key: Any
+    full_pattern: str
+    base_path: str
+    output_prefix: str
+    skipped_count: int
+    components: Tuple[_PatternComponent, ...]
+
+
+class FilesetResolver:
+    """ Resolve glob patterns from several filesets with a single walk of each directory tree, following the recursive glob.glob semantics """
+
+
+    def __init__(self, cache: Optional[FilesetCache] = None) -> None:
+        self._cache = cache
+        self._all_patterns: List[_CompiledPattern] = []
+        self._fallback_patterns: List[Tuple[Any,str]] = []
+
+
+    def add_pattern(self, key: Any, path_in_workspace: str, file_pattern: str) -> None:
+        """ Add a pattern relative to path_in_workspace, its matches are returned under key """
+
+        full_pattern = os.path.join(path_in_workspace, file_pattern) if path_in_workspace else file_pattern
+        all_parts = re.split(r"[\\/]", full_pattern) if os.sep == "\\" else full_pattern.split("/")
+
+        magic_index = next((index for index, part in enumerate(all_parts) if glob.has_magic(part)), len(all_parts) - 1)
+        base_parts = all_parts[:magic_index]
+        pattern_parts = all_parts[magic_index:]
+
+        # Relative components after a wildcard are rare, leave them to glob rather than emulating its behavior
+        if any(part in [ ".", ".." ] for part in pattern_parts) or any(part == "" for part in pattern_parts):
+            self._fallback_patterns.append((key, full_pattern))
+            return
+
+        base_path = "/".join(base_parts)
+        if base_path == "" and len(base_parts) > 0:
+            base_path = "/"
+
+        self._all_patterns.append(_CompiledPattern(
+            key = key,
+            full_pattern = full_pattern,
+            base_path = base_path,
+            output_prefix = base_path + "/" if base_path not in [ "", "/" ] else base_path,
+            skipped_count = 0,
+            components = tuple(self._compile_component(part) for part in pattern_parts),
+        ))
+
+
+    def resolve(self) -> Dict[Any,List[str]]:
+        """ Walk the file system and return the sorted list of matching files for each key """
+
+        all_results: Dict[Any,Set[str]] = {}
+
+        for root_path, all_patterns in self._group_by_root().items():
+            for pattern, file_collection in zip(all_patterns, self._resolve_root(root_path, all_patterns)):
+                all_results.setdefault(pattern.key, set()).update(file_collection)
+
+        for key, full_pattern in self._fallback_patterns:
+            for file_path in glob.glob(full_pattern, recursive = True):
+                if os.path.isfile(file_path):
+                    all_results.setdefault(key, set()).add(file_path.replace("\\", "/"))
+
+        return { key: sorted(file_collection) for key, file_collection in all_results.items() }
+
+
+    def _resolve_root(self, root_path: str, all_patterns: List[_CompiledPattern]) -> List[Any]:
+        if self._cache is None:
+            return self._walk(root_path, all_patterns, None, None)
+
+        walk_key = json.dumps([ root_path ] + [ pattern.full_pattern for pattern in all_patterns ])
+        cached_results = self._cache.get_walk_results(walk_key)
+        if cached_results is not None:
+            return cached_results
+
+        all_matches: Dict[str,DirectoryMatches] = {}
+        all_results = self._walk(root_path, all_patterns, walk_key, all_matches)
+        self._cache.set_walk_results(walk_key, all_matches, all_results)
+        return all_results
+
+
+    def _compile_component(self, part: str) -> _PatternComponent:
+        if part == "**":
+            return _PatternComponent(kind = "recursive", name = part)
+        if glob.has_magic(part):
+            return _PatternComponent(kind = "wildcard", name = part, regex = re.compile(fnmatch.translate(os.path.normcase(part))))
+        return _PatternComponent(kind = "literal", name = os.path.normcase(part))
+
+
+    def _group_by_root(self) -> Dict[str,List[_CompiledPattern]]:
+        """ Group patterns by walk root, patterns with a base directory inside another base are walked from that other base """
+
+        def normalize(path: str) -> str:
+            return os.path.normcase(os.path.normpath(path if path else "."))
+
+        all_roots: List[str] = []
+        for normalized_base in sorted(set(normalize(pattern.base_path) for pattern in self._all_patterns), key = len):
+            if not any(self._is_subdirectory(normalized_base, root) for root in all_roots):
+                all_roots.append(normalized_base)
+
+        patterns_by_root: Dict[str,List[_CompiledPattern]] = {}
+        root_paths: Dict[str,str] = {}
+
+        for pattern in self._all_patterns:
+            normalized_base = normalize(pattern.base_path)
+            root = next(root for root in all_roots if normalized_base == root or self._is_subdirectory(normalized_base, root))
+
+            if normalized_base != root:
+                extra_components = tuple(_PatternComponent(kind = "literal", name = part) for part in os.path.relpath(normalized_base, root).split(os.sep))
+                pattern = dataclasses.replace(pattern, skipped_count = len(extra_components), components = extra_components + pattern.components)
+            else:
+                root_paths.setdefault(root, pattern.base_path if pattern.base_path else ".")
+
+            patterns_by_root.setdefault(root, []).append(pattern)
+
+        return { root_paths.get(root, root): all_patterns for root, all_patterns in patterns_by_root.items() }
+
+
+    def _is_subdirectory(self, path: str, root: str) -> bool:
+        if root == os.curdir:
+            return not os.path.isabs(path) and path != os.pardir and not path.startswith(os.pardir + os.sep)
+        return path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+    def _walk(self, # pylint: disable = too-many-branches, too-many-locals
+            root_path: str, all_patterns: List[_CompiledPattern], walk_key: Optional[str], all_matches: Optional[Dict[str,DirectoryMatches]]) -> List[Set[str]]:
+        """ Walk the tree from root_path, only visiting directories which can contain matches, and return the matching files for each pattern """
+
+        all_results: List[Set[str]] = [ set() for pattern in all_patterns ]
+
+        matcher_cache: Dict[_States,_StateMatcher] = {}
+        expansion_cache: Dict[Tuple[_States,_States],Tuple[_States,Tuple[int, ...]]] = {}
+        normcase = os.path.normcase if os.path.normcase("A") != "A" else None
+
+        def match(matcher: _StateMatcher, name: str) -> Optional[Tuple[_States,Tuple[int, ...]]]:
+            normalized_name = normcase(name) if normcase is not None else name
+            is_hidden = name[0] == "."
+
+            recursive_positions = () if is_hidden else matcher.recursive_positions
+            all_positions = []
+            for regex, allow_hidden, position in matcher.wildcards:
+                if (allow_hidden or not is_hidden) and regex.match(normalized_name) is not None:
+                    all_positions.append(position)
+            all_positions += matcher.literals.get(normalized_name, ())
+
+            if len(all_positions) == 0 and len(recursive_positions) == 0:
+                return None
+
+            position_key = (tuple(all_positions), recursive_positions)
+            expansion = expansion_cache.get(position_key)
+            if expansion is None:
+                expansion = self._expand_positions(all_patterns, *position_key)
+                expansion_cache[position_key] = expansion
+            return expansion
+
+        initial_states, _ = self._expand_positions(all_patterns, tuple((index, 0) for index in range(len(all_patterns))), ())
+        directories_to_visit: List[Tuple[str,Tuple[str, ...],_States]] = [ (root_path, (), initial_states) ]
+
+        while len(directories_to_visit) > 0:
+            directory, all_names, states = directories_to_visit.pop()
+
+            matcher = matcher_cache.get(states)
+            if matcher is None:
+                matcher = self._create_matcher(all_patterns, states)
+                matcher_cache[states] = matcher
+
+            cached_matches = self._cache.get_directory_matches(walk_key, directory) if self._cache is not None and walk_key is not None else None
+
+            if cached_matches is not None:
+                file_groups = { tuple(pattern_indices): file_names for pattern_indices, file_names in cached_matches[0] }
+                directory_names = cached_matches[1]
+
+            else:
+                file_groups = {}
+                directory_names = []
+
+                for entry in self._scan_directory(walk_key, directory):
+                    expansion = match(matcher, entry.name)
+                    if expansion is None:
+                        continue
+
+                    if len(expansion[1]) > 0 and entry.is_file():
+                        file_groups.setdefault(expansion[1], []).append(entry.name)
+                    if len(expansion[0]) > 0 and entry.is_dir():
+                        directory_names.append(entry.name)
+
+            for matched_patterns, file_names in file_groups.items():
+                for pattern_index in matched_patterns:
+                    pattern = all_patterns[pattern_index]
+                    directory_prefix = pattern.output_prefix + "".join(name + "/" for name in all_names[pattern.skipped_count:])
+                    all_results[pattern_index].update(directory_prefix + name for name in file_names)
+
+            for name in directory_names:
+                expansion = match(matcher, name)
+                if expansion is not None:
+                    directories_to_visit.append((os.path.join(directory, name), all_names + (name,), expansion[0]))
+
+            # Record the entries which matched, so that the cache can reuse them without scanning the directory if it is unchanged
+            if all_matches is not None:
+                all_matches[directory] = ([ (list(pattern_indices), file_names) for pattern_indices, file_names in file_groups.items() ], directory_names)
+
+        return all_results
+
+
+    def _scan_directory(self, walk_key: Optional[str], directory: str) -> List[os.DirEntry]:
+        try:
+            if self._cache is not None and walk_key is not None:
+                return self._cache.scan_directory(walk_key, directory)
+            with os.scandir(directory) as entry_iterator:
+                return list(entry_iterator)
+        except OSError:
+            return []
+
+
+    def _create_matcher(self, all_patterns: List[_CompiledPattern], states: _States) -> "_StateMatcher":
+        recursive_positions: List[_Position] = []
+        wildcards: List[Tuple[Pattern,bool,_Position]] = []
+        literals: Dict[str,List[_Position]] = {}
+
+        for pattern_index, position in states:
+            component = all_patterns[pattern_index].components[position]
+            if component.kind == "recursive":
+                recursive_positions.append((pattern_index, position))
+            elif component.kind == "wildcard" and component.regex is not None:
+                wildcards.append((component.regex, component.name.startswith("."), (pattern_index, position + 1)))
+            else:
+                literals.setdefault(component.name, []).append((pattern_index, position + 1))
+
+        return _StateMatcher(tuple(recursive_positions), tuple(wildcards), { name: tuple(positions) for name, positions in literals.items() })
+
+
+    def _expand_positions(self, all_patterns: List[_CompiledPattern],
+            all_positions: _States, recursive_positions: _States) -> Tuple[_States,Tuple[int, ...]]:
+
+        """ Add the positions reachable by matching recursive wildcards with zero directories, and list the completed patterns,
+        where recursive_positions are recursive wildcards which matched the name themselves and all_positions are the ones after a matched component """
+
+        expanded_states: List[_Position] = []
+        matched_patterns: List[int] = []
+
+        all_entries = [ (pattern_index, position, True) for pattern_index, position in recursive_positions ]
+        all_entries += [ (pattern_index, position, False) for pattern_index, position in all_positions ]
+
+        for pattern_index, position, is_recursive_match in all_entries:
+            components = all_patterns[pattern_index].components
+            start_position = position
+
+            while True:
+                if position == len(components):
+                    # Like glob, a trailing recursive wildcard matching zero directories after another component only matches directories
+                    if (is_recursive_match or position == start_position) and pattern_index not in matched_patterns:
+                        matched_patterns.append(pattern_index)
+                    break
+                if (pattern_index, position) not in expanded_states:
+                    expanded_states.append((pattern_index, position))
+                if components[position].kind != "recursive":
+                    break
+                position += 1
+
+        return (tuple(expanded_states), tuple(matched_patterns))
+
+
+@dataclasses.dataclass(frozen = True)
+class _StateMatcher:
+    recursive_positions: Tuple[_Position, ...]
+    wildcards: Tuple[Tuple[Pattern,bool,_Position], ...]
+    literals: Dict[str,Tuple[_Position, ...]]
@@ -1,103 +1,185 @@
 import copy
-import filecmp
-import glob
-import itertools
+import dataclasses
 import logging
 import os
 
+from bhamon_development_toolkit.artifacts.artifact_mapping import ArtifactMapping
+from bhamon_development_toolkit.artifacts.artifact_plan import ArtifactPlan
+from bhamon_development_toolkit.artifacts.file_hash_cache import FileHashCache
+from bhamon_development_toolkit.artifacts.file_status_checker import FileStatusChecker
+from bhamon_development_toolkit.artifacts.fileset_plan import FilesetPlan
+from bhamon_development_toolkit.artifacts.fileset_resolver import FilesetResolver
+
 
 logger = logging.getLogger("Artifact")
 
 
-def list_files(artifact, fileset_getter, parameters):
-    artifact_files = []
+def list_files(artifact, fileset_getter, parameters, fileset_cache = None):
+    artifact_plan = resolve_artifact(compile_artifact(artifact, fileset_getter, parameters), fileset_cache = fileset_cache)
+    return list_plan_files(artifact_plan)
 
-    for fileset_options in artifact["filesets"]:
-        fileset = fileset_getter(fileset_options["identifier"])
-        fileset_parameters = copy.deepcopy(fileset_options.get("parameters", {}))
-        fileset_parameters.update(parameters)
 
-        artifact_files += load_fileset(fileset, fileset_parameters)
+def map_files(artifact, fileset_getter, parameters, fileset_cache = None, file_hash_cache = None):
+    """ Map the artifact files to their path in the archive, returning an ArtifactMapping ordered by destination """
 
-    artifact_files.sort()
+    artifact_plan = resolve_artifact(compile_artifact(artifact, fileset_getter, parameters), fileset_cache = fileset_cache)
+    return map_plan_files(artifact_plan, file_hash_cache = file_hash_cache)
 
-    return artifact_files
 
+def compile_artifact(artifact, fileset_getter, parameters):
+    """ Compile an artifact definition with its parameters to an ArtifactPlan, which can then be resolved once for both listing and mapping files """
 
-def map_files(artifact, fileset_getter, parameters):
-    artifact_files = []
+    all_fileset_plans = []
 
     for fileset_options in artifact["filesets"]:
         fileset = fileset_getter(fileset_options["identifier"])
         fileset_parameters = copy.deepcopy(fileset_options.get("parameters", {}))
         fileset_parameters.update(parameters)
+        all_fileset_plans.append(_compile_fileset(fileset_options["identifier"], fileset, fileset_parameters, fileset_options.get("path_in_archive")))
 
-        path_in_workspace = fileset["path_in_workspace"].format(**fileset_parameters)
-        for source in load_fileset(fileset, fileset_parameters):
-            destination = source
-            if "path_in_archive" in fileset_options:
-                destination = os.path.join(fileset_options["path_in_archive"], os.path.relpath(source, path_in_workspace))
-            artifact_files.append((source, destination.replace("\\", "/")))
+    return ArtifactPlan(tuple(all_fileset_plans))
+
+
+def resolve_artifact(artifact_plan, fileset_cache = None):
+    """ Resolve the files of an ArtifactPlan, returning a new plan with the resolved files """
 
-    artifact_files = merge_mappings(artifact_files)
+    all_fileset_files = _resolve_filesets(artifact_plan.all_filesets, fileset_cache = fileset_cache)
+    return dataclasses.replace(artifact_plan, all_fileset_files = tuple(tuple(fileset_files) for fileset_files in all_fileset_files))
+
+
+def list_plan_files(artifact_plan):
+    if not artifact_plan.is_resolved:
+        raise ValueError("Artifact plan is not resolved")
+
+    artifact_files = []
+    for fileset_files in artifact_plan.all_fileset_files:
+        artifact_files += fileset_files
 
     artifact_files.sort()
 
     return artifact_files
 
 
-def merge_mappings(artifact_files):
-    merged_files = []
-    has_conflicts = False
+def map_plan_files(artifact_plan, file_hash_cache = None):
+    if not artifact_plan.is_resolved:
+        raise ValueError("Artifact plan is not resolved")
+
+    artifact_files = ArtifactMapping()
 
-    sorted_by_destination = sorted(artifact_files, key = lambda x: x[1])
-    grouped_by_destination = itertools.groupby(sorted_by_destination, lambda x: x[1])
+    for fileset_plan, fileset_files in zip(artifact_plan.all_filesets, artifact_plan.all_fileset_files):
+        for source in fileset_files:
+            destination = source
+            if fileset_plan.path_in_archive is not None:
+                destination = os.path.join(fileset_plan.path_in_archive, os.path.relpath(source, fileset_plan.path_in_workspace))
+            artifact_files.add(source, destination.replace("\\", "/"))
 
-    for destination, mapping_group in grouped_by_destination:
-        source_collection = [ x[0] for x in mapping_group ]
-        for source in source_collection[1:]:
-            if not filecmp.cmp(source_collection[0], source):
-                has_conflicts = True
-                logger.error("Mapping conflict: %s, %s => %s", source_collection[0], source, destination)
-        merged_files.append((source_collection[0], destination))
+    return merge_mappings(artifact_files, file_hash_cache = file_hash_cache)
 
-    if has_conflicts:
-        raise ValueError("Artifact mapper has conflicts")
 
-    merged_files.sort()
+def merge_mappings(artifact_files, file_hash_cache = None):
+    """ Merge mappings with the same destination, raising if their sources have different contents, an ArtifactMapping is merged in place """
+
+    merged_files = artifact_files if isinstance(artifact_files, ArtifactMapping) else ArtifactMapping(artifact_files)
+
+    groups_to_check = merged_files.merge()
+    if len(groups_to_check) > 0:
+        _check_mapping_conflicts(groups_to_check, file_hash_cache if file_hash_cache is not None else FileHashCache())
+
+    if merged_files is artifact_files:
+        return merged_files
 
-    return merged_files
+    return sorted(merged_files)
 
 
-def check_files(artifact_files):
+def check_files(artifact_files, file_status_checker = None):
+    """ Check that all files exist and return their status for packaging to reuse, artifact_files can be any iterable like ArtifactMapping.sources() """
+
     has_issues = False
 
-    for file_path in artifact_files:
-        if not os.path.exists(file_path):
+    if file_status_checker is None:
+        file_status_checker = FileStatusChecker()
+
+    all_statuses = file_status_checker.check(artifact_files)
+
+    for file_status in all_statuses.values():
+        if not file_status.exists:
             has_issues = True
-            logger.error("Missing file: %s", file_path)
+            logger.error("Missing file: %s", file_status.path)
+        elif not file_status.is_file:
+            has_issues = True
+            logger.error("Not a file: %s", file_status.path)
 
     if has_issues:
         raise ValueError("Artifact files have issues")
 
+    return all_statuses
+
+
+def load_fileset(fileset, parameters, fileset_cache = None):
+    return load_filesets([ (fileset, parameters) ], fileset_cache = fileset_cache)[0]
 
-def load_fileset(fileset, parameters):
-    matched_files = []
+
+def load_filesets(all_filesets, fileset_cache = None):
+    """ Load several filesets, given as (fileset, parameters) tuples, resolving all their file patterns with a single walk and an optional FilesetCache """
+
+    all_fileset_plans = [ _compile_fileset(None, fileset, parameters, None) for fileset, parameters in all_filesets ]
+    return _resolve_filesets(all_fileset_plans, fileset_cache = fileset_cache)
+
+
+def _compile_fileset(identifier, fileset, parameters, path_in_archive):
     path_in_workspace = fileset["path_in_workspace"].format(**parameters)
+    all_file_paths = []
 
     for file_function in fileset.get("file_functions", []):
-        matched_files += file_function(path_in_workspace, parameters)
+        all_file_paths += file_function(path_in_workspace, parameters)
     for file_path in fileset.get("file_paths", []):
-        matched_files += [ os.path.join(path_in_workspace, file_path.format(**parameters)) ]
-    for file_pattern in fileset.get("file_patterns", []):
-        matched_files += glob.glob(os.path.join(path_in_workspace, file_pattern.format(**parameters)), recursive = True)
+        all_file_paths += [ os.path.join(path_in_workspace, file_path.format(**parameters)) ]
+
+    return FilesetPlan(
+        identifier = identifier,
+        path_in_workspace = path_in_workspace,
+        path_in_archive = path_in_archive,
+        file_paths = tuple(file_path.replace("\\", "/") for file_path in all_file_paths),
+        file_patterns = tuple(file_pattern.format(**parameters) for file_pattern in fileset.get("file_patterns", [])),
+    )
+
 
-    selected_files = []
-    for file_path in matched_files:
-        file_path = file_path.replace("\\", "/")
-        if os.path.isfile(file_path):
-            selected_files.append(file_path)
+def _resolve_filesets(all_fileset_plans, fileset_cache = None):
+    resolver = FilesetResolver(fileset_cache)
 
-    selected_files.sort()
+    for index, fileset_plan in enumerate(all_fileset_plans):
+        for file_pattern in fileset_plan.file_patterns:
+            resolver.add_pattern(index, fileset_plan.path_in_workspace, file_pattern)
 
-    return selected_files
+    files_from_patterns = resolver.resolve()
+    all_selected_files = []
+
+    for index, fileset_plan in enumerate(all_fileset_plans):
+        # A file can be both listed in the file paths and matched by a pattern
+        selected_files = set(file_path for file_path in fileset_plan.file_paths if os.path.isfile(file_path))
+        selected_files.update(files_from_patterns.get(index, []))
+
+        all_selected_files.append(sorted(selected_files))
+
+    return all_selected_files
+
+
+def _check_mapping_conflicts(groups_to_check, file_hash_cache):
+    has_conflicts = False
+    all_file_sizes = { source: os.path.getsize(source) for _, source_collection in groups_to_check for source in source_collection }
+
+    # Sources with different sizes are conflicts already, only hash the sources from groups where all sizes are the same
+    files_to_hash = []
+    for _, source_collection in groups_to_check:
+        if len(set(all_file_sizes[source] for source in source_collection)) == 1:
+            files_to_hash += source_collection
+
+    all_file_hashes = file_hash_cache.get_hashes(files_to_hash)
+
+    for destination, source_collection in groups_to_check:
+        if len(set(all_file_sizes[source] for source in source_collection)) > 1 or len(set(all_file_hashes[source] for source in source_collection)) > 1:
+            has_conflicts = True
+            logger.error("Mapping conflict: %s => %s", ", ".join(source_collection), destination)
+
+    if has_conflicts:
+        raise ValueError("Artifact mapper has conflicts")
@@ -0,0 +1,76 @@
+import concurrent.futures
+import hashlib
+import os
+import zlib
+from typing import Dict, List, Optional
+
+from bhamon_development_toolkit.artifacts.archive_entry import ArchiveEntry
+from bhamon_development_toolkit.artifacts.artifact_manifest import ArtifactManifest
+from bhamon_development_toolkit.artifacts.file_hash_cache import FileHashCache
+
+
+class InstallationComparer:
+    """ Find the artifact files which differ from the installed files, comparing sizes first, then content hashes from the manifest or CRC32 """
+
+
+    def __init__(self, max_workers: Optional[int] = None, file_hash_cache: Optional[FileHashCache] = None) -> None:
+        self.max_workers = max_workers if max_workers is not None else min(32, (os.cpu_count() or 1) + 4)
+        self.file_hash_cache = file_hash_cache
+
+
+    def find_changed_files(self, installation_directory: str, all_entries: List[ArchiveEntry], manifest: Optional[ArtifactManifest] = None) -> List[str]:
+        """ Return the paths for the entries to extract again, the content of installed files is read only if their size matches """
+
+        all_changed_files: List[str] = []
+        files_to_compare: Dict[str,ArchiveEntry] = {}
+
+        for entry in all_entries:
+            installed_path = os.path.join(installation_directory, entry.path)
+            manifest_entry = manifest.get(entry.path) if manifest is not None else None
+
+            try:
+                installed_status = os.stat(installed_path)
+            except OSError:
+                installed_status = None
+
+            if installed_status is None or installed_status.st_size != entry.size or (entry.crc is None and manifest_entry is None):
+                all_changed_files.append(entry.path)
+            else:
+                files_to_compare[installed_path] = entry
+
+        if len(files_to_compare) > 0:
+            all_results = self._compare_files(files_to_compare, manifest)
+            all_changed_files += [ entry.path for installed_path, entry in files_to_compare.items() if not all_results[installed_path] ]
+
+        return all_changed_files
+
+
+    def _compare_files(self, files_to_compare: Dict[str,ArchiveEntry], manifest: Optional[ArtifactManifest]) -> Dict[str,bool]:
+        if manifest is not None and self.file_hash_cache is not None and manifest.hash_algorithm == "sha256":
+            all_hashes = self.file_hash_cache.get_hashes(files_to_compare)
+            return { installed_path: all_hashes[installed_path] == manifest.get(entry.path).hash for installed_path, entry in files_to_compare.items() }
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers = min(self.max_workers, len(files_to_compare))) as executor:
+            all_futures = { installed_path: executor.submit(self._compare_file, installed_path, entry, manifest)
+                for installed_path, entry in files_to_compare.items() }
+            return { installed_path: future.result() for installed_path, future in all_futures.items() }
+
+
+    def _compare_file(self, installed_path: str, entry: ArchiveEntry, manifest: Optional[ArtifactManifest]) -> bool:
+        manifest_entry = manifest.get(entry.path) if manifest is not None else None
+        hash_function = hashlib.new(manifest.hash_algorithm) if manifest_entry is not None else None
+        crc = 0
+
+        with open(installed_path, mode = "rb") as installed_file:
+            while True:
+                data = installed_file.read(1024 * 1024)
+                if not data:
+                    break
+                if hash_function is not None:
+                    hash_function.update(data)
+                else:
+                    crc = zlib.crc32(data, crc)
+
+        if hash_function is not None:
+            return hash_function.hexdigest() == manifest_entry.hash
+        return crc == entry.crc
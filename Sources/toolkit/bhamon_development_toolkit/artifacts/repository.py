@@ -1,8 +1,17 @@
+import errno
 import logging
 import os
 import shutil
+import time
 import zipfile
 
+from bhamon_development_toolkit.artifacts import archive_formats
+from bhamon_development_toolkit.artifacts.artifact_install_statistics import ArtifactInstallStatistics
+from bhamon_development_toolkit.artifacts.artifact_manifest import ArtifactManifest
+from bhamon_development_toolkit.artifacts.compression_policy import CompressionPolicy
+from bhamon_development_toolkit.artifacts.installation_comparer import InstallationComparer
+from bhamon_development_toolkit.artifacts.zip_archive_format import ZipArchiveFormat
+
 
 logger = logging.getLogger("Artifact")
 
@@ -10,37 +19,56 @@ logger = logging.getLogger("Artifact")
 class ArtifactRepository:
 
 
-    def __init__(self, local_path, project_identifier):
+    def __init__(self, local_path, project_identifier, archive_format = None):
         self.local_path = local_path
         self.project_identifier = project_identifier
         self.server_client = None
 
+        # Format for new artifacts, None to write zip archives with the compression options passed to package
+        self.archive_format = archive_format
+        self.all_archive_formats = archive_formats.create_default_archive_formats()
+
+
+    @property
+    def file_extension(self):
+        return self.archive_format.file_extension if self.archive_format is not None else ".zip"
+
 
     def show(self, artifact_name, artifact_files):
         logger.info("Artifact '%s'", artifact_name)
 
+        # Accept both file lists and file mappings, like ArtifactMapping
         for file_path in artifact_files:
-            logger.info("+ '%s'", file_path)
+            if isinstance(file_path, tuple):
+                logger.info("+ '%s' => '%s'", file_path[0], file_path[1])
+            else:
+                logger.info("+ '%s'", file_path)
 
 
     def list_remote(self, path_in_repository, artifact_pattern):
-        return self.server_client.list_files(self.project_identifier, path_in_repository, artifact_pattern, ".zip")
+        return self.server_client.list_files(self.project_identifier, path_in_repository, artifact_pattern, self.file_extension)
 
 
     def list_remote_with_metadata(self, path_in_repository, artifact_pattern):
-        return self.server_client.list_files_with_metadata(self.project_identifier, path_in_repository, artifact_pattern, ".zip")
+        return self.server_client.list_files_with_metadata(self.project_identifier, path_in_repository, artifact_pattern, self.file_extension)
 
 
-    def package(self, # pylint: disable = too-many-arguments
-            path_in_repository, artifact_name, artifact_files, compression = zipfile.ZIP_DEFLATED, simulate = False):
+    def package(self, # pylint: disable = too-many-arguments, too-many-locals
+            path_in_repository, artifact_name, artifact_files, compression = zipfile.ZIP_DEFLATED, file_statuses = None,
+            compression_policy = None, incremental = False, file_hash_cache = None, max_workers = 1, simulate = False):
         logger.info("Packaging artifact '%s'", artifact_name)
 
         if len(artifact_files) == 0:
             raise ValueError("The artifact is empty")
 
+        archive_format = self.archive_format
+        if archive_format is None:
+            archive_format = ZipArchiveFormat(compression_policy if compression_policy is not None else CompressionPolicy(compression), max_workers)
+
         artifact_path = os.path.join(self.local_path, path_in_repository, artifact_name)
+        archive_path = artifact_path + archive_format.file_extension
 
-        logger.info("Writing '%s'", artifact_path + ".zip")
+        logger.info("Writing '%s'", archive_path)
 
         if not simulate:
             os.makedirs(os.path.dirname(artifact_path), exist_ok = True)
@@ -49,71 +77,258 @@ class ArtifactRepository:
             for source, destination in artifact_files:
                 logger.debug("+ '%s' => '%s'", source, destination)
         else:
-            with zipfile.ZipFile(artifact_path + ".zip.tmp", mode = "w", compression = compression) as archive_file:
-                for source, destination in artifact_files:
-                    logger.debug("+ '%s' => '%s'", source, destination)
-                    archive_file.write(source, destination)
-            os.replace(artifact_path + ".zip.tmp", artifact_path + ".zip")
+            previous_archive_path = None
+            previous_manifest = None
 
+            if incremental and archive_format.supports_incremental and os.path.isfile(archive_path):
+                previous_archive_path = archive_path
+                if os.path.isfile(artifact_path + ".manifest.json"):
+                    previous_manifest = ArtifactManifest.load(artifact_path + ".manifest.json")
 
-    def verify(self, path_in_repository, artifact_name, simulate = False):
+            manifest = archive_format.package(archive_path + ".tmp", artifact_files,
+                file_statuses = file_statuses, previous_archive_path = previous_archive_path,
+                previous_manifest = previous_manifest, file_hash_cache = file_hash_cache)
+
+            # Remove the previous manifest before replacing the archive, so that a manifest never describes another archive if the process stops in between
+            manifest_path = artifact_path + ".manifest.json"
+            manifest.save(manifest_path + ".tmp")
+            if os.path.isfile(manifest_path):
+                os.remove(manifest_path)
+            os.replace(archive_path + ".tmp", archive_path)
+            os.replace(manifest_path + ".tmp", manifest_path)
+
+
+    def load_manifest(self, path_in_repository, artifact_name):
+        artifact_path = os.path.join(self.local_path, path_in_repository, artifact_name)
+        return ArtifactManifest.load(artifact_path + ".manifest.json")
+
+
+    def verify(self, # pylint: disable = too-many-arguments
+            path_in_repository, artifact_name, use_manifest = True, structural_only = False, max_workers = None, simulate = False):
         logger.info("Verifying artifact '%s'", artifact_name)
 
         artifact_path = os.path.join(self.local_path, path_in_repository, artifact_name)
-        logger.info("Reading '%s'", artifact_path + ".zip")
+        archive_format = self._get_local_archive_format(path_in_repository, artifact_name, simulate)
+        logger.info("Reading '%s'", artifact_path + archive_format.file_extension)
 
         if not simulate:
-            with zipfile.ZipFile(artifact_path + ".zip", 'r') as archive_file:
-                if archive_file.testzip():
-                    raise RuntimeError('Artifact package is corrupted')
+            manifest = None
+            if use_manifest and os.path.isfile(artifact_path + ".manifest.json"):
+                manifest = ArtifactManifest.load(artifact_path + ".manifest.json")
+
+            all_errors = archive_format.verify(artifact_path + archive_format.file_extension,
+                manifest = manifest, structural_only = structural_only, max_workers = max_workers)
+
+            for error in all_errors:
+                logger.error("Verification error: %s", error)
+            if len(all_errors) > 0:
+                raise RuntimeError("Artifact package is corrupted")
+
+
+    def find_archive_format(self, path_in_repository, artifact_name):
+        """ Find the format of a local artifact from its existing archive files, using the most recent one if there are several """
+
+        artifact_path = os.path.join(self.local_path, path_in_repository, artifact_name)
+        all_candidates = []
+
+        for archive_format in ([ self.archive_format ] if self.archive_format is not None else []) + self.all_archive_formats:
+            if os.path.isfile(artifact_path + archive_format.file_extension):
+                all_candidates.append((os.path.getmtime(artifact_path + archive_format.file_extension), archive_format))
+
+        if len(all_candidates) == 0:
+            return None
+
+        return max(all_candidates, key = lambda candidate: candidate[0])[1]
+
+
+    def _get_local_archive_format(self, path_in_repository, artifact_name, simulate):
+        archive_format = self.find_archive_format(path_in_repository, artifact_name)
+
+        if archive_format is None:
+            if not simulate:
+                raise ValueError("Artifact does not exist: '%s'" % os.path.join(self.local_path, path_in_repository, artifact_name))
+            archive_format = self.archive_format if self.archive_format is not None else ZipArchiveFormat()
+
+        return archive_format
 
 
     def upload(self, path_in_repository, artifact_name, overwrite = False, simulate = False):
         self.server_client.upload(
-            self.local_path, self.project_identifier, path_in_repository, artifact_name, ".zip", overwrite = overwrite, simulate = simulate)
+            self.local_path, self.project_identifier, path_in_repository, artifact_name, self.file_extension, overwrite = overwrite, simulate = simulate)
 
 
     def download(self, path_in_repository, artifact_name, simulate = False):
         self.server_client.download(
-            self.local_path, self.project_identifier, path_in_repository, artifact_name, ".zip", simulate = simulate)
+            self.local_path, self.project_identifier, path_in_repository, artifact_name, self.file_extension, simulate = simulate)
+
 
+    def install(self, # pylint: disable = too-many-arguments, too-many-locals
+            path_in_repository, artifact_name, installation_directory, extraction_directory = None, replace = False,
+            differential = False, delete_extra_files = False, file_hash_cache = None, max_workers = None, simulate = False):
+
+        """ Extract the artifact next to the installation directory, so that files are moved with renames, and extract only changed files if differential """
 
-    def install(self, # pylint: disable = too-many-arguments
-            path_in_repository, artifact_name, installation_directory, extraction_directory = None, simulate = False):
         logger.info("Installing artifact '%s' to '%s'", artifact_name, installation_directory)
 
+        if differential and replace:
+            raise ValueError("A differential install cannot replace the installation directory, use delete_extra_files instead")
+        if replace and os.path.join(os.getcwd(), "").startswith(os.path.join(os.path.abspath(installation_directory), "")):
+            raise ValueError("Installation directory '%s' contains the current directory and cannot be replaced" % installation_directory)
+
         artifact_path = os.path.join(self.local_path, path_in_repository, artifact_name)
+        archive_format = self._get_local_archive_format(path_in_repository, artifact_name, simulate)
+        archive_path = artifact_path + archive_format.file_extension
+
         if extraction_directory is None:
-            extraction_directory = artifact_path + ".zip.extracting"
+            extraction_directory = self._get_sibling_path(installation_directory, ".installing")
+
+        if simulate:
+            artifact_files = archive_format.list_files(archive_path)
+            logger.info("Extracting %s files to '%s'", len(artifact_files), extraction_directory)
+            logger.info("Moving files to '%s'", installation_directory)
+            return None
 
-        if not simulate and os.path.isdir(extraction_directory):
+        if os.path.isdir(extraction_directory):
             shutil.rmtree(extraction_directory)
 
-        print("")
+        all_entries = None
+        files_to_extract = None
 
-        logger.info("Extracting files to '%s'", extraction_directory)
-        with zipfile.ZipFile(artifact_path + ".zip", "r") as artifact_file:
-            artifact_files = artifact_file.namelist()
-            for source in artifact_files:
-                destination = os.path.join(extraction_directory, source).replace("\\", "/")
-                logger.debug("+ '%s' => '%s'", source, destination)
-                if not simulate:
-                    artifact_file.extract(source, extraction_directory)
+        if differential or delete_extra_files:
+            all_entries = archive_format.list_entries(archive_path)
 
-        print("")
+        if differential and os.path.isdir(installation_directory):
+            manifest = self._load_matching_manifest(artifact_path, all_entries)
+            comparer = InstallationComparer(max_workers, file_hash_cache)
+            files_to_extract = comparer.find_changed_files(installation_directory, all_entries, manifest)
+
+        start_time = time.perf_counter()
+        extracted_entries = archive_format.extract(archive_path, extraction_directory, max_workers = max_workers, file_paths = files_to_extract)
+        logger.info("Extracted %s files to '%s' in %.1fs", len(extracted_entries), extraction_directory, time.perf_counter() - start_time)
 
         logger.info("Moving files to '%s'", installation_directory)
-        for file_path in artifact_files:
-            source = os.path.join(extraction_directory, file_path).replace("\\", "/")
-            destination = os.path.join(installation_directory, file_path).replace("\\", "/")
-            logger.debug("+ '%s' => '%s'", source, destination)
-            if not simulate:
-                os.makedirs(os.path.dirname(destination), exist_ok = True)
-                shutil.move(source, destination)
 
-        if not simulate:
-            shutil.rmtree(extraction_directory)
+        if replace and os.path.isdir(installation_directory):
+            self._replace_directory(extraction_directory, installation_directory)
+        elif os.path.isdir(extraction_directory):
+            self._publish_directory(extraction_directory, installation_directory)
+            if os.path.isdir(extraction_directory):
+                shutil.rmtree(extraction_directory)
+
+        deleted_file_count = 0
+        if delete_extra_files:
+            deleted_file_count = self._delete_extra_files(installation_directory, [ entry.path for entry in all_entries ])
+
+        written_size = sum(entry.size for entry in extracted_entries)
+        total_size = sum(entry.size for entry in all_entries) if all_entries is not None else written_size
+        total_count = len(all_entries) if all_entries is not None else len(extracted_entries)
+
+        statistics = ArtifactInstallStatistics(
+            written_file_count = len(extracted_entries),
+            written_size = written_size,
+            skipped_file_count = total_count - len(extracted_entries),
+            skipped_size = total_size - written_size,
+            deleted_file_count = deleted_file_count,
+        )
+
+        logger.info("Wrote %s files (%s bytes), skipped %s unchanged files (%s bytes), deleted %s files",
+            statistics.written_file_count, statistics.written_size, statistics.skipped_file_count, statistics.skipped_size, statistics.deleted_file_count)
+
+        return statistics
+
+
+    def _load_matching_manifest(self, artifact_path, all_entries):
+        """ Load the local manifest, unless it does not match the archive, for example after downloading a new version of the artifact """
+
+        if not os.path.isfile(artifact_path + ".manifest.json"):
+            return None
+
+        manifest = ArtifactManifest.load(artifact_path + ".manifest.json")
+        if len(manifest) != len(all_entries):
+            return None
+        for entry in all_entries:
+            manifest_entry = manifest.get(entry.path)
+            if manifest_entry is None or manifest_entry.size != entry.size:
+                return None
+
+        return manifest
+
+
+    def _delete_extra_files(self, installation_directory, all_file_paths):
+        all_expected_paths = set(os.path.normpath(os.path.join(installation_directory, file_path)) for file_path in all_file_paths)
+        deleted_file_count = 0
+
+        for directory, _, all_file_names in os.walk(installation_directory, topdown = False):
+            for file_name in all_file_names:
+                file_path = os.path.normpath(os.path.join(directory, file_name))
+                if file_path not in all_expected_paths:
+                    os.remove(file_path)
+                    deleted_file_count += 1
+
+            if os.path.normpath(directory) != os.path.normpath(installation_directory) and len(os.listdir(directory)) == 0:
+                os.rmdir(directory)
+
+        return deleted_file_count
+
+
+    def _replace_directory(self, source_directory, destination_directory):
+        """ Swap the directories with two renames, so that the destination is never partially updated, and restore it if the second move fails """
+
+        backup_directory = self._get_sibling_path(destination_directory, ".replacing")
+        if os.path.isdir(backup_directory):
+            shutil.rmtree(backup_directory)
+        os.replace(destination_directory, backup_directory)
+
+        try:
+            self._move(source_directory, destination_directory)
+        except:
+            if os.path.isdir(destination_directory):
+                shutil.rmtree(destination_directory)
+            os.replace(backup_directory, destination_directory)
+            raise
+
+        shutil.rmtree(backup_directory)
+
+
+    def _get_sibling_path(self, directory, suffix):
+        """ Build a path next to a directory, from its absolute path so that relative paths like '.' get a proper sibling """
+
+        directory = os.path.abspath(directory)
+        if os.path.dirname(directory) == directory:
+            raise ValueError("Directory '%s' is a file system root and has no sibling path" % directory)
+        return directory + suffix
+
+
+    def _publish_directory(self, source_directory, destination_directory):
+        """ Move a directory content, merging it with the existing destination content, with a single rename for each new subdirectory """
+
+        if not os.path.exists(destination_directory):
+            os.makedirs(os.path.dirname(os.path.abspath(destination_directory)), exist_ok = True)
+            self._move(source_directory, destination_directory)
+            return
+
+        with os.scandir(source_directory) as entry_iterator:
+            all_entries = list(entry_iterator)
+
+        for entry in all_entries:
+            destination = os.path.join(destination_directory, entry.name)
+            if entry.is_dir(follow_symlinks = False) and os.path.isdir(destination):
+                self._publish_directory(entry.path, destination)
+            else:
+                if os.path.isdir(destination) and not os.path.islink(destination):
+                    shutil.rmtree(destination)
+                self._move(entry.path, destination)
+
+
+    def _move(self, source, destination):
+        try:
+            os.replace(source, destination)
+        except OSError as exception:
+            # The extraction directory is on another file system, which is only possible if it was set by the caller
+            if exception.errno != errno.EXDEV:
+                raise
+            shutil.move(source, destination)
 
 
     def delete_remote(self, path_in_repository, artifact_name, simulate = False):
-        self.server_client.delete(self.project_identifier, path_in_repository, artifact_name, ".zip", simulate = simulate)
+        self.server_client.delete(self.project_identifier, path_in_repository, artifact_name, self.file_extension, simulate = simulate)
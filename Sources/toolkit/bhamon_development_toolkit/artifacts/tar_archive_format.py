@@ -0,0 +1,236 @@
+import hashlib
+import logging
+import lzma
+import os
+import stat
+import tarfile
+import zlib
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+from bhamon_development_toolkit.artifacts.archive_codec import ArchiveCodec
+from bhamon_development_toolkit.artifacts.archive_entry import ArchiveEntry
+from bhamon_development_toolkit.artifacts.archive_format import ArchiveFormat
+from bhamon_development_toolkit.artifacts.artifact_manifest import ArtifactManifest
+from bhamon_development_toolkit.artifacts.artifact_manifest_entry import ArtifactManifestEntry
+from bhamon_development_toolkit.artifacts.file_hash_cache import FileHashCache
+from bhamon_development_toolkit.artifacts.file_status import FileStatus
+
+
+logger = logging.getLogger("Artifact")
+
+
+class _HashingReader:
+    """ File wrapper hashing the data read from it, for tarfile.addfile to hash files while copying them """
+
+
+    def __init__(self, source_file: BinaryIO, hash_function) -> None:
+        self._source_file = source_file
+        self._hash_function = hash_function
+
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._source_file.read(size)
+        self._hash_function.update(data)
+        return data
+
+
+class TarArchiveFormat(ArchiveFormat):
+    """ Tar archives compressed as a single stream, which are written, verified and extracted in one sequential pass without seeking """
+
+
+    def __init__(self, codec: Optional[ArchiveCodec] = None, hash_algorithm: str = "sha256") -> None:
+        self.codec = codec
+        self.hash_algorithm = hash_algorithm
+
+
+    @property
+    def file_extension(self) -> str:
+        return ".tar" + (self.codec.file_extension if self.codec is not None else "")
+
+
+    def package(self, # pylint: disable = too-many-arguments
+            archive_path: str, artifact_files: Iterable[Tuple[str,str]], file_statuses: Optional[Dict[str,FileStatus]] = None,
+            previous_archive_path: Optional[str] = None, previous_manifest: Optional[ArtifactManifest] = None,
+            file_hash_cache: Optional[FileHashCache] = None) -> ArtifactManifest:
+
+        """ Write the archive and return its manifest, the previous archive is not used since a compressed stream cannot be partially reused """
+
+        manifest = ArtifactManifest(self.hash_algorithm)
+
+        with open(archive_path, mode = "wb") as raw_file:
+            stream = self.codec.open_writer(raw_file) if self.codec is not None else raw_file
+
+            try:
+                with tarfile.open(fileobj = stream, mode = "w|", format = tarfile.PAX_FORMAT) as archive_file:
+                    for source, destination in artifact_files:
+                        logger.debug("+ '%s' => '%s'", source, destination)
+                        file_status = file_statuses.get(source) if file_statuses is not None else None
+                        manifest.add(self._write_file(archive_file, source, destination, file_status))
+            finally:
+                if stream is not raw_file:
+                    stream.close()
+
+        return manifest
+
+
+    def verify(self, archive_path: str, manifest: Optional[ArtifactManifest] = None,
+            structural_only: bool = False, max_workers: Optional[int] = None) -> List[str]:
+
+        """ Read the archive in one pass, a single compressed stream cannot be split between workers, and the codec checks the data at the end of the stream """
+
+        all_errors: List[str] = []
+        all_names = set()
+
+        try:
+            with open(archive_path, mode = "rb") as raw_file:
+                stream = self.codec.open_reader(raw_file) if self.codec is not None else raw_file
+
+                try:
+                    with tarfile.open(fileobj = stream, mode = "r|") as archive_file:
+                        for member in archive_file:
+                            if member.isfile():
+                                all_names.add(member.name)
+                                manifest_entry = manifest.get(member.name) if manifest is not None else None
+                                error = self._verify_member(archive_file, member, manifest, manifest_entry, structural_only)
+                                if error is not None:
+                                    all_errors.append("'%s': %s" % (member.name, error))
+                    self._read_to_end(stream)
+                finally:
+                    if stream is not raw_file:
+                        stream.close()
+
+        except (tarfile.TarError, EOFError, OSError, zlib.error, lzma.LZMAError) as exception:
+            all_errors.append("Invalid archive: %s" % exception)
+
+        if manifest is not None:
+            for manifest_entry in manifest:
+                if manifest_entry.path not in all_names:
+                    all_errors.append("'%s': Missing from the archive" % manifest_entry.path)
+
+        return all_errors
+
+
+    def list_files(self, archive_path: str) -> List[str]:
+        with open(archive_path, mode = "rb") as raw_file:
+            stream = self.codec.open_reader(raw_file) if self.codec is not None else raw_file
+
+            try:
+                with tarfile.open(fileobj = stream, mode = "r|") as archive_file:
+                    return [ member.name for member in archive_file if member.isfile() ]
+            finally:
+                if stream is not raw_file:
+                    stream.close()
+
+
+    def list_entries(self, archive_path: str) -> List[ArchiveEntry]:
+        """ List the archive entries, reading the whole stream since tar has no index, and with no CRC since tar does not record one """
+
+        with open(archive_path, mode = "rb") as raw_file:
+            stream = self.codec.open_reader(raw_file) if self.codec is not None else raw_file
+
+            try:
+                with tarfile.open(fileobj = stream, mode = "r|") as archive_file:
+                    return [ ArchiveEntry(member.name, member.size, None) for member in archive_file if member.isfile() ]
+            finally:
+                if stream is not raw_file:
+                    stream.close()
+
+
+    def extract(self, archive_path: str, destination_directory: str,
+            max_workers: Optional[int] = None, file_paths: Optional[Iterable[str]] = None) -> List[ArchiveEntry]:
+        """ Extract the archive in one pass, a single compressed stream cannot be split between workers, and raise if the codec finds corrupted data """
+
+        file_path_set = set(file_paths) if file_paths is not None else None
+        all_extracted_entries: List[ArchiveEntry] = []
+
+        with open(archive_path, mode = "rb") as raw_file:
+            stream = self.codec.open_reader(raw_file) if self.codec is not None else raw_file
+
+            try:
+                with tarfile.open(fileobj = stream, mode = "r|") as archive_file:
+                    for member in archive_file:
+                        if file_path_set is not None and member.name not in file_path_set:
+                            continue
+                        self._extract_member(archive_file, member, destination_directory)
+                        if member.isfile():
+                            all_extracted_entries.append(ArchiveEntry(member.name, member.size, None))
+                self._read_to_end(stream)
+            finally:
+                if stream is not raw_file:
+                    stream.close()
+
+        return all_extracted_entries
+
+
+    def _verify_member(self, # pylint: disable = too-many-arguments
+            archive_file: tarfile.TarFile, member: tarfile.TarInfo,
+            manifest: Optional[ArtifactManifest], manifest_entry: Optional[ArtifactManifestEntry], structural_only: bool) -> Optional[str]:
+
+        if manifest is not None and manifest_entry is None:
+            return "Missing from the manifest"
+        if manifest_entry is not None and manifest_entry.size != member.size:
+            return "Size does not match the manifest"
+
+        # Member data is still decompressed to reach the next header, but not read or hashed
+        if structural_only:
+            return None
+
+        hash_function = hashlib.new(manifest.hash_algorithm) if manifest is not None else None
+        member_file = archive_file.extractfile(member)
+        while True:
+            data = member_file.read(1024 * 1024)
+            if not data:
+                break
+            if hash_function is not None:
+                hash_function.update(data)
+
+        if manifest_entry is not None and hash_function.hexdigest() != manifest_entry.hash:
+            return "Hash does not match the manifest"
+        return None
+
+
+    def _read_to_end(self, stream: BinaryIO) -> None:
+        """ Read the stream after the end of archive blocks, where tarfile stops reading, so that the codec reaches and checks its trailer """
+
+        while stream.read(1024 * 1024):
+            pass
+
+
+    def _write_file(self, archive_file: tarfile.TarFile, source: str, destination: str, file_status: Optional[FileStatus]) -> ArtifactManifestEntry:
+        """ Write a file to the archive, hashing it in the same read pass, with no owner so that archives do not depend on the machine """
+
+        archive_name = os.path.normpath(os.path.splitdrive(destination)[1]).lstrip(os.sep).replace(os.sep, "/")
+
+        if file_status is None:
+            tar_info = archive_file.gettarinfo(source, archive_name)
+        else:
+            tar_info = tarfile.TarInfo(archive_name)
+            tar_info.size = file_status.size
+            tar_info.mtime = file_status.modification_time
+            tar_info.mode = stat.S_IMODE(file_status.mode)
+
+        tar_info.uid = 0
+        tar_info.gid = 0
+        tar_info.uname = ""
+        tar_info.gname = ""
+
+        hash_function = hashlib.new(self.hash_algorithm)
+        with open(source, mode = "rb") as source_file:
+            archive_file.addfile(tar_info, _HashingReader(source_file, hash_function))
+
+        return ArtifactManifestEntry(tar_info.name, tar_info.size, stat.S_IFREG | tar_info.mode, hash_function.hexdigest())
+
+
+    def _extract_member(self, archive_file: tarfile.TarFile, member: tarfile.TarInfo, destination_directory: str) -> None:
+        # The data filter rejects absolute paths, links outside the destination and special files, it is missing from older Python versions
+        if hasattr(tarfile, "data_filter"):
+            archive_file.extract(member, destination_directory, filter = "data")
+            return
+
+        member_path = os.path.realpath(os.path.join(destination_directory, member.name))
+        if os.path.commonpath([ member_path, os.path.realpath(destination_directory) ]) != os.path.realpath(destination_directory):
+            raise ValueError("Archive member is outside the destination: '%s'" % member.name)
+        if not member.isfile() and not member.isdir():
+            raise ValueError("Archive member is not a file: '%s'" % member.name)
+
+        archive_file.extract(member, destination_directory)
@@ -0,0 +1,93 @@
+import concurrent.futures
+import os
+import zipfile
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bhamon_development_toolkit.artifacts import zip_helpers
+from bhamon_development_toolkit.artifacts.archive_entry import ArchiveEntry
+from bhamon_development_toolkit.artifacts.archive_format import ArchiveFormat
+from bhamon_development_toolkit.artifacts.artifact_manifest import ArtifactManifest
+from bhamon_development_toolkit.artifacts.artifact_packager import ArtifactPackager
+from bhamon_development_toolkit.artifacts.compression_policy import CompressionPolicy
+from bhamon_development_toolkit.artifacts.file_hash_cache import FileHashCache
+from bhamon_development_toolkit.artifacts.file_status import FileStatus
+from bhamon_development_toolkit.artifacts.zip_archive_verifier import ZipArchiveVerifier
+
+
+class ZipArchiveFormat(ArchiveFormat):
+    """ Zip archives, with per entry compression, parallel compression and incremental packaging """
+
+
+    def __init__(self, compression_policy: Optional[CompressionPolicy] = None, max_workers: int = 1) -> None:
+        self.compression_policy = compression_policy if compression_policy is not None else CompressionPolicy()
+        self.max_workers = max_workers
+
+
+    @property
+    def file_extension(self) -> str:
+        return ".zip"
+
+
+    @property
+    def supports_incremental(self) -> bool:
+        return True
+
+
+    def package(self, # pylint: disable = too-many-arguments
+            archive_path: str, artifact_files: Iterable[Tuple[str,str]], file_statuses: Optional[Dict[str,FileStatus]] = None,
+            previous_archive_path: Optional[str] = None, previous_manifest: Optional[ArtifactManifest] = None,
+            file_hash_cache: Optional[FileHashCache] = None) -> ArtifactManifest:
+
+        packager = ArtifactPackager(max_workers = self.max_workers, compression_policy = self.compression_policy)
+        return packager.package(archive_path, artifact_files, file_statuses = file_statuses,
+            previous_archive_path = previous_archive_path, previous_manifest = previous_manifest, file_hash_cache = file_hash_cache)
+
+
+    def verify(self, archive_path: str, manifest: Optional[ArtifactManifest] = None,
+            structural_only: bool = False, max_workers: Optional[int] = None) -> List[str]:
+        return ZipArchiveVerifier(max_workers).verify(archive_path, manifest, structural_only)
+
+
+    def list_files(self, archive_path: str) -> List[str]:
+        with zipfile.ZipFile(archive_path, mode = "r") as archive_file:
+            return archive_file.namelist()
+
+
+    def list_entries(self, archive_path: str) -> List[ArchiveEntry]:
+        with zipfile.ZipFile(archive_path, mode = "r") as archive_file:
+            return [ ArchiveEntry(zip_info.filename, zip_info.file_size, zip_info.CRC) for zip_info in archive_file.infolist() if not zip_info.is_dir() ]
+
+
+    def extract(self, archive_path: str, destination_directory: str,
+            max_workers: Optional[int] = None, file_paths: Optional[Iterable[str]] = None) -> List[ArchiveEntry]:
+        """ Extract the archive with a thread pool, each worker extracting a batch of entries with its own ZipFile """
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+
+        with zipfile.ZipFile(archive_path, mode = "r") as archive_file:
+            all_entries = archive_file.infolist()
+
+        if file_paths is not None:
+            file_path_set = set(file_paths)
+            all_entries = [ zip_info for zip_info in all_entries if zip_info.filename in file_path_set ]
+
+        all_batches = zip_helpers.split_entries(all_entries, max_workers * 4)
+
+        if len(all_batches) <= 1 or max_workers <= 1:
+            for batch in all_batches:
+                self._extract_batch(archive_path, batch, destination_directory)
+
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers = min(max_workers, len(all_batches))) as executor:
+                all_futures = [ executor.submit(self._extract_batch, archive_path, batch, destination_directory) for batch in all_batches ]
+                for future in all_futures:
+                    future.result()
+
+        return [ ArchiveEntry(zip_info.filename, zip_info.file_size, zip_info.CRC) for zip_info in all_entries if not zip_info.is_dir() ]
+
+
+    def _extract_batch(self, archive_path: str, all_entries: List[zipfile.ZipInfo], destination_directory: str) -> None:
+        with zipfile.ZipFile(archive_path, mode = "r") as archive_file:
+            for zip_info in all_entries:
+                archive_file.extract(zip_info, destination_directory)
@@ -0,0 +1,163 @@
+import concurrent.futures
+import hashlib
+import lzma
+import os
+import struct
+import zipfile
+import zlib
+from typing import List, Optional, Tuple
+
+from bhamon_development_toolkit.artifacts import zip_helpers
+from bhamon_development_toolkit.artifacts.artifact_manifest import ArtifactManifest
+
+
+class ZipArchiveVerifier:
+    """ Verify zip archives in parallel, each worker reading a batch of entries with its own file handle, since zlib, bz2 and lzma release the GIL """
+
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+
+        # Entries are grouped in batches of consecutive entries, several per worker so that workers finish at about the same time
+        self.batches_per_worker = 4
+
+
+    def verify(self, archive_path: str, manifest: Optional[ArtifactManifest] = None, structural_only: bool = False) -> List[str]:
+        """ Return the errors found in the archive, checking the local headers, and the entry data unless only checking the structure """
+
+        try:
+            with zipfile.ZipFile(archive_path, mode = "r") as archive_file:
+                all_entries = sorted(archive_file.infolist(), key = lambda zip_info: zip_info.header_offset)
+                central_directory_offset = archive_file.start_dir
+        except zipfile.BadZipFile as exception:
+            return [ "Invalid central directory: %s" % exception ]
+
+        all_errors: List[str] = []
+        if manifest is not None:
+            all_errors += self._compare_manifest(all_entries, manifest)
+
+        all_batches = zip_helpers.split_entries(all_entries, self.max_workers * self.batches_per_worker)
+        hash_algorithm = manifest.hash_algorithm if manifest is not None else None
+
+        if len(all_batches) <= 1 or self.max_workers <= 1:
+            for batch in all_batches:
+                all_errors += self._verify_batch(archive_path, batch, central_directory_offset, manifest, hash_algorithm, structural_only)
+            return all_errors
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers = min(self.max_workers, len(all_batches))) as executor:
+            all_futures = [ executor.submit(self._verify_batch, archive_path, batch, central_directory_offset, manifest, hash_algorithm, structural_only)
+                for batch in all_batches ]
+            for future in all_futures:
+                all_errors += future.result()
+
+        return all_errors
+
+
+    def _compare_manifest(self, all_entries: List[zipfile.ZipInfo], manifest: ArtifactManifest) -> List[str]:
+        all_errors: List[str] = []
+        all_names = set()
+
+        for zip_info in all_entries:
+            all_names.add(zip_info.filename)
+            manifest_entry = manifest.get(zip_info.filename)
+            if manifest_entry is None:
+                all_errors.append("'%s': Missing from the manifest" % zip_info.filename)
+            elif manifest_entry.size != zip_info.file_size:
+                all_errors.append("'%s': Size does not match the manifest" % zip_info.filename)
+
+        for manifest_entry in manifest:
+            if manifest_entry.path not in all_names:
+                all_errors.append("'%s': Missing from the archive" % manifest_entry.path)
+
+        return all_errors
+
+
+    def _verify_batch(self, # pylint: disable = too-many-arguments
+            archive_path: str, all_entries: List[zipfile.ZipInfo], central_directory_offset: int,
+            manifest: Optional[ArtifactManifest], hash_algorithm: Optional[str], structural_only: bool) -> List[str]:
+
+        all_errors: List[str] = []
+
+        with open(archive_path, mode = "rb") as archive_file:
+            for zip_info in all_entries:
+                error = self._verify_local_header(archive_file, zip_info, central_directory_offset)
+                if error is None and not structural_only:
+                    manifest_entry = manifest.get(zip_info.filename) if manifest is not None else None
+                    error = self._verify_data(archive_file, zip_info, hash_algorithm, manifest_entry.hash if manifest_entry is not None else None)
+                if error is not None:
+                    all_errors.append("'%s': %s" % (zip_info.filename, error))
+
+        return all_errors
+
+
+    def _verify_local_header(self, archive_file, zip_info: zipfile.ZipInfo, central_directory_offset: int) -> Optional[str]:
+        """ Check the local header matches the central directory, leaving the file position at the start of the entry data """
+
+        archive_file.seek(zip_info.header_offset)
+        header_data = archive_file.read(zipfile.sizeFileHeader)
+        if len(header_data) != zipfile.sizeFileHeader:
+            return "Truncated local header"
+
+        file_header = struct.unpack(zipfile.structFileHeader, header_data)
+        if file_header[zip_helpers.file_header_signature_index] != zipfile.stringFileHeader:
+            return "Invalid local header signature"
+
+        file_name = archive_file.read(file_header[zip_helpers.file_header_file_name_length_index])
+        file_name_encoding = "utf-8" if zip_info.flag_bits & zip_helpers.flag_utf8 else "cp437"
+        if file_name.decode(file_name_encoding, errors = "replace") != zip_info.orig_filename:
+            return "Local header name does not match the central directory"
+
+        data_offset = archive_file.tell() + file_header[zip_helpers.file_header_extra_field_length_index]
+        if data_offset + zip_info.compress_size > central_directory_offset:
+            return "Entry data overlaps the central directory"
+
+        archive_file.seek(data_offset)
+        return None
+
+
+    def _verify_data(self, archive_file, zip_info: zipfile.ZipInfo, hash_algorithm: Optional[str], expected_hash: Optional[str]) -> Optional[str]:
+        if not zip_helpers.can_copy_raw_entry(zip_info):
+            return "Encrypted entries cannot be verified"
+
+        hash_function = hashlib.new(hash_algorithm) if hash_algorithm is not None and expected_hash is not None else None
+
+        try:
+            file_size, crc = self._read_data(archive_file, zip_info, hash_function)
+        except (NotImplementedError, zipfile.BadZipFile, zlib.error, lzma.LZMAError, EOFError, OSError) as exception:
+            return "Invalid entry data: %s" % exception
+
+        if file_size != zip_info.file_size:
+            return "Size does not match the central directory"
+        if crc != zip_info.CRC:
+            return "CRC does not match the central directory"
+        if hash_function is not None and hash_function.hexdigest() != expected_hash:
+            return "Hash does not match the manifest"
+
+        return None
+
+
+    def _read_data(self, archive_file, zip_info: zipfile.ZipInfo, hash_function) -> Tuple[int,int]:
+        """ Decompress the entry data, from the current file position, and return its size and CRC """
+
+        decompressor = zip_helpers.create_decompressor(zip_info.compress_type)
+        remaining_size = zip_info.compress_size
+        file_size = 0
+        crc = 0
+
+        while True:
+            compressed_data = archive_file.read(min(remaining_size, 1024 * 1024))
+            remaining_size -= len(compressed_data)
+            if len(compressed_data) == 0 and remaining_size > 0:
+                raise zipfile.BadZipFile("Truncated entry data")
+
+            data = decompressor.decompress(compressed_data) if decompressor is not None else compressed_data
+            if remaining_size == 0 and hasattr(decompressor, "flush"):
+                data += decompressor.flush()
+
+            file_size += len(data)
+            crc = zlib.crc32(data, crc)
+            if hash_function is not None:
+                hash_function.update(data)
+
+            if remaining_size == 0:
+                return (file_size, crc)
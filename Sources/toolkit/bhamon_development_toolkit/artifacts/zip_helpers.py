@@ -0,0 +1,118 @@
+import struct
+import zipfile
+from typing import List, Optional
+
+
+# Indexes in the local file header fields, as unpacked with zipfile.structFileHeader
+file_header_signature_index = 0
+file_header_file_name_length_index = 10
+file_header_extra_field_length_index = 11
+
+flag_encrypted = 0x01
+flag_compress_option_1 = 0x02
+flag_data_descriptor = 0x08
+flag_utf8 = 0x800
+
+
+def can_copy_raw_entry(zip_info: zipfile.ZipInfo) -> bool:
+    return not zip_info.flag_bits & flag_encrypted
+
+
+def copy_raw_entry(source_file, source_info: zipfile.ZipInfo, destination_archive: zipfile.ZipFile, destination_info: zipfile.ZipInfo) -> None:
+    """ Copy the compressed data for an entry from another archive without decompressing it, writing it like ZipFile.open does for a new entry """
+
+    if not can_copy_raw_entry(source_info):
+        raise ValueError("Cannot copy encrypted entry '%s'" % source_info.filename)
+
+    source_file.seek(source_info.header_offset)
+    file_header = struct.unpack(zipfile.structFileHeader, source_file.read(zipfile.sizeFileHeader))
+    if file_header[file_header_signature_index] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile("Bad magic number for file header of '%s'" % source_info.filename)
+    source_file.seek(file_header[file_header_file_name_length_index] + file_header[file_header_extra_field_length_index], 1)
+
+    # The sizes and CRC are known, so the local header has them and the data descriptor is not needed
+    destination_info.compress_type = source_info.compress_type
+    destination_info.flag_bits = source_info.flag_bits & ~flag_data_descriptor
+    destination_info.CRC = source_info.CRC
+    destination_info.compress_size = source_info.compress_size
+    destination_info.file_size = source_info.file_size
+
+    write_raw_entry(destination_archive, destination_info, source_file)
+
+
+def create_compressor(compress_type: int, compress_level: Optional[int] = None):
+    """ Create the compressor ZipFile uses for a compression method, producing a raw deflate stream for ZIP_DEFLATED and None for ZIP_STORED """
+    return zipfile._get_compressor(compress_type, compress_level) # pylint: disable = protected-access
+
+
+def create_decompressor(compress_type: int):
+    """ Create the decompressor ZipFile uses for a compression method, None for ZIP_STORED, raising NotImplementedError for unsupported methods """
+    return zipfile._get_decompressor(compress_type) # pylint: disable = protected-access
+
+
+def set_compress_level(zip_info: zipfile.ZipInfo, compress_level: Optional[int]) -> None:
+    """ Set the compression level for an entry written with ZipFile.open, which has no public attribute for it before Python 3.13 """
+    zip_info._compresslevel = compress_level # pylint: disable = protected-access
+
+
+def write_raw_entry(destination_archive: zipfile.ZipFile, destination_info: zipfile.ZipInfo, data_file) -> None:
+    """ Write an entry with data already compressed, reading compress_size bytes from data_file, the entry CRC and sizes must be set """
+
+    zip64 = destination_info.file_size > zipfile.ZIP64_LIMIT or destination_info.compress_size > zipfile.ZIP64_LIMIT
+
+    # ZipFile marks LZMA entries as having an end of stream marker
+    if destination_info.compress_type == zipfile.ZIP_LZMA:
+        destination_info.flag_bits |= flag_compress_option_1
+
+    # There is no public API to add raw entries, so this follows what ZipFile._open_to_write and _ZipWriteFile.close do
+    with destination_archive._lock: # pylint: disable = protected-access
+        if destination_archive._writing: # pylint: disable = protected-access
+            raise ValueError("Cannot write to the archive while another entry is open for writing")
+
+        destination_archive.fp.seek(destination_archive.start_dir)
+        destination_info.header_offset = destination_archive.fp.tell()
+        destination_archive._writecheck(destination_info) # pylint: disable = protected-access
+        destination_archive._didModify = True # pylint: disable = protected-access
+
+        destination_archive.fp.write(destination_info.FileHeader(zip64))
+        _copy_bytes(data_file, destination_archive.fp, destination_info.compress_size)
+
+        destination_archive.filelist.append(destination_info)
+        destination_archive.NameToInfo[destination_info.filename] = destination_info
+        destination_archive.start_dir = destination_archive.fp.tell()
+
+
+def split_entries(all_entries: List[zipfile.ZipInfo], batch_count: int) -> List[List[zipfile.ZipInfo]]:
+    """ Split entries in batches of consecutive entries in the archive with about the same compressed size, for workers to read sequentially """
+
+    all_entries = sorted(all_entries, key = lambda zip_info: zip_info.header_offset)
+    total_size = sum(zip_info.compress_size for zip_info in all_entries)
+    batch_size = max(1, total_size // max(1, batch_count))
+
+    all_batches: List[List[zipfile.ZipInfo]] = []
+    current_batch: List[zipfile.ZipInfo] = []
+    current_size = 0
+
+    for zip_info in all_entries:
+        current_batch.append(zip_info)
+        current_size += zip_info.compress_size
+        if current_size >= batch_size:
+            all_batches.append(current_batch)
+            current_batch = []
+            current_size = 0
+
+    if len(current_batch) > 0:
+        all_batches.append(current_batch)
+
+    return all_batches
+
+
+def _copy_bytes(source_file, destination_file, size: int) -> None:
+    remaining_size = size
+
+    while remaining_size > 0:
+        data = source_file.read(min(remaining_size, 1024 * 1024))
+        if not data:
+            raise zipfile.BadZipFile("Unexpected end of archive")
+        destination_file.write(data)
+        remaining_size -= len(data)
@@ -0,0 +1,147 @@
+import asyncio
+import datetime
+import logging
+from typing import Any, AsyncGenerator, AsyncIterable, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from bhamon_development_toolkit.asyncio_extensions.async_worker_result import AsyncWorkerResult
+
+
+logger = logging.getLogger("Asyncio")
+
+
+class AsyncWorkerPool:
+    """ Run a function concurrently over items with a fixed number of workers and bounded queues """
+
+
+    def __init__(self,
+            worker_count: int,
+            queue_size: Optional[int] = None,
+            item_timeout: Optional[datetime.timedelta] = None,
+            fail_fast: bool = True) -> None:
+
+        if worker_count < 1:
+            raise ValueError("worker_count must be at least 1")
+        if queue_size is not None and queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+
+        self.worker_count = worker_count
+        self.queue_size = queue_size if queue_size is not None else worker_count * 2
+        self.item_timeout = item_timeout
+        self.fail_fast = fail_fast
+
+
+    async def run(self,
+            function: Callable[[Any], Awaitable[Any]],
+            all_items: Union[Iterable[Any],AsyncIterable[Any]],
+            ordered: bool = True) -> List[AsyncWorkerResult]:
+
+        """ Run the function for all items and return all the results, in the same order as the items by default """
+
+        return [ result async for result in self.iterate(function, all_items, ordered = ordered) ]
+
+
+    async def iterate(self,
+            function: Callable[[Any], Awaitable[Any]],
+            all_items: Union[Iterable[Any],AsyncIterable[Any]],
+            ordered: bool = False) -> AsyncGenerator[AsyncWorkerResult,None]:
+
+        """ Run the function for all items and yield the results as they complete, or in the same order as the items if ordered is set """
+
+        # Items hold a slot from when they are produced until their result is yielded, so that results waiting for an earlier item
+        # in ordered mode count against the limit, which makes the output queue bounded without setting a size for it
+        item_slots = asyncio.Semaphore(self.queue_size + self.worker_count)
+        input_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        output_queue: asyncio.Queue = asyncio.Queue()
+
+        producer_task = asyncio.ensure_future(self._produce(all_items, input_queue, item_slots))
+        all_worker_tasks = [ asyncio.ensure_future(self._work(function, input_queue, output_queue)) for _ in range(self.worker_count) ]
+        completion_task = asyncio.ensure_future(self._complete(producer_task, all_worker_tasks, output_queue))
+
+        pending_results: Dict[int,AsyncWorkerResult] = {}
+        next_index = 0
+
+        try:
+            while True:
+                result: Optional[AsyncWorkerResult] = await output_queue.get()
+                if result is None:
+                    break
+
+                if self.fail_fast and not result.is_success and result.exception is not None:
+                    raise result.exception
+
+                if not ordered:
+                    item_slots.release()
+                    yield result
+                    continue
+
+                pending_results[result.index] = result
+                while next_index in pending_results:
+                    item_slots.release()
+                    yield pending_results.pop(next_index)
+                    next_index += 1
+
+            await completion_task
+
+        finally:
+            await self._cancel_tasks([ producer_task, completion_task ] + all_worker_tasks)
+
+
+    async def _produce(self, all_items: Union[Iterable[Any],AsyncIterable[Any]], input_queue: asyncio.Queue, item_slots: asyncio.Semaphore) -> None:
+        index = 0
+
+        if hasattr(all_items, "__aiter__"):
+            async for item in all_items: # type: ignore
+                await item_slots.acquire()
+                await input_queue.put((index, item))
+                index += 1
+        else:
+            for item in all_items: # type: ignore
+                await item_slots.acquire()
+                await input_queue.put((index, item))
+                index += 1
+
+        for _ in range(self.worker_count):
+            await input_queue.put(None)
+
+
+    async def _work(self, function: Callable[[Any], Awaitable[Any]], input_queue: asyncio.Queue, output_queue: asyncio.Queue) -> None:
+        while True:
+            entry: Optional[Tuple[int,Any]] = await input_queue.get()
+            if entry is None:
+                return
+
+            result = await self._run_item(function, *entry)
+            await output_queue.put(result)
+
+
+    async def _run_item(self, function: Callable[[Any], Awaitable[Any]], index: int, item: Any) -> AsyncWorkerResult:
+        try:
+            if self.item_timeout is not None:
+                value = await asyncio.wait_for(function(item), timeout = self.item_timeout.total_seconds())
+            else:
+                value = await function(item)
+
+        except asyncio.TimeoutError as exception:
+            logger.debug("Item %s timed out", index)
+            return AsyncWorkerResult(index = index, item = item, status = "timeout", exception = exception)
+
+        except Exception as exception: # pylint: disable = broad-except
+            logger.debug("Item %s failed: %s", index, exception)
+            return AsyncWorkerResult(index = index, item = item, status = "failed", exception = exception)
+
+        return AsyncWorkerResult(index = index, item = item, status = "succeeded", result = value)
+
+
+    async def _complete(self, producer_task: asyncio.Future, all_worker_tasks: List[asyncio.Future], output_queue: asyncio.Queue) -> None:
+        # Signal the end of the results to the consumer, which then awaits this task to get any exception, including a cancelled worker
+        try:
+            await asyncio.gather(producer_task, *all_worker_tasks)
+        finally:
+            output_queue.put_nowait(None)
+
+
+    async def _cancel_tasks(self, all_tasks: List[asyncio.Future]) -> None:
+        for task in all_tasks:
+            task.cancel()
+
+        await asyncio.gather(*all_tasks, return_exceptions = True)
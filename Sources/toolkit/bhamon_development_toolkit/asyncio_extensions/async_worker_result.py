@@ -0,0 +1,16 @@
+import dataclasses
+from typing import Any, Optional
+
+
+@dataclasses.dataclass(frozen = True)
+class AsyncWorkerResult:
+    index: int
+    item: Any
+    status: str
+    result: Any = None
+    exception: Optional[BaseException] = None
+
+
+    @property
+    def is_success(self) -> bool:
+        return self.status == "succeeded"
@@ -1,70 +1,189 @@
 import asyncio
+import logging
 import platform
 import signal
-from typing import Any, List, Tuple
+import threading
+from typing import Any, List, Optional, Tuple
+
+from bhamon_development_toolkit.asyncio_extensions import asyncio_helpers
+from bhamon_development_toolkit.asyncio_extensions import event_loop_factories
+from bhamon_development_toolkit.asyncio_extensions.blocking_executor import BlockingExecutor
+from bhamon_development_toolkit.asyncio_extensions.event_loop_monitor import EventLoopMonitor
+from bhamon_development_toolkit.asyncio_extensions.event_loop_options import EventLoopOptions
+
+
+logger = logging.getLogger("Asyncio")
 
 
 class AsyncioContext:
-    """ Wrapper around asyncio.run to offer graceful termination """
+    """ Wrapper around asyncio.run to offer graceful termination and event loop tuning """
 
 
-    def __init__(self) -> None:
+    def __init__(self, options: Optional[EventLoopOptions] = None, monitor: Optional[EventLoopMonitor] = None) -> None:
+        self.options = options if options is not None else EventLoopOptions()
+        self.monitor = monitor
+        self.blocking_executor: Optional[BlockingExecutor] = None
+
         self.should_shutdown = False
         self.shutdown_request_counter = 0
         self.shutdown_request_counter_limit = 3
         self.shutdown_timeout_seconds = 30
 
+        self._shutdown_event: Optional[asyncio.Event] = None
+        self._force_shutdown_event: Optional[asyncio.Event] = None
+
 
     def run(self, coroutine: Any) -> None:
-        system = platform.system()
+        loop = self.create_event_loop()
 
-        if system == "Windows":
-            asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy()) # pylint: disable = no-member
+        try:
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.run_async(coroutine))
 
-        old_signal_handlers: List[Tuple[signal.Signals,signal._HANDLER]] = [] # pylint: disable = no-member
+        finally:
+            try:
+                self._cancel_all_tasks(loop)
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.run_until_complete(loop.shutdown_default_executor())
+            finally:
+                asyncio.set_event_loop(None)
+                loop.close()
 
-        if system == "Windows":
-            old_sigbreak_handler = signal.signal(signal.SIGBREAK, lambda signal_number, frame: self.shutdown()) # pylint: disable = no-member
-            old_signal_handlers.append((signal.SIGBREAK, old_sigbreak_handler))
+                if self.monitor is not None:
+                    self.monitor.log_summary()
 
-        old_sigint_handler = signal.signal(signal.SIGINT, lambda signal_number, frame: self.shutdown())
-        old_signal_handlers.append((signal.SIGINT, old_sigint_handler))
-        old_sigterm_handler = signal.signal(signal.SIGTERM, lambda signal_number, frame: self.shutdown())
-        old_signal_handlers.append((signal.SIGTERM, old_sigterm_handler))
 
-        try:
-            asyncio.run(self.run_async(coroutine))
-        finally:
-            for signal_value, signal_handler in old_signal_handlers:
-                signal.signal(signal_value, signal_handler)
+    def create_event_loop(self) -> asyncio.AbstractEventLoop:
+        """ Create and configure an event loop according to the context options """
+
+        loop_factory = self.options.loop_factory if self.options.loop_factory is not None else event_loop_factories.create_default_event_loop
+        loop = loop_factory()
+
+        if self.options.debug is not None:
+            loop.set_debug(self.options.debug)
+        if self.options.slow_callback_duration is not None:
+            loop.slow_callback_duration = self.options.slow_callback_duration.total_seconds()
+
+        self.blocking_executor = BlockingExecutor(
+            max_workers = self.options.executor_max_workers,
+            max_disk_operations = self.options.max_disk_operations,
+            max_cpu_operations = self.options.max_cpu_operations)
+        loop.set_default_executor(self.blocking_executor.thread_pool)
+
+        if self.options.use_eager_task_factory:
+            if hasattr(asyncio, "eager_task_factory"):
+                loop.set_task_factory(asyncio.eager_task_factory) # pylint: disable = no-member
+            else:
+                logger.warning("Eager task factory is not supported by this Python version")
+
+        return loop
 
 
     async def run_async(self, coroutine: Any) -> None:
+        loop = asyncio.get_running_loop()
+
+        self._shutdown_event = asyncio.Event()
+        self._force_shutdown_event = asyncio.Event()
+        if self.should_shutdown:
+            self._shutdown_event.set()
+
+        if self.monitor is not None:
+            self.monitor.start()
+
+        # Set the executor before creating the future so that the coroutine context inherits it
+        blocking_executor_token = asyncio_helpers.current_blocking_executor.set(self.blocking_executor)
         future = asyncio.ensure_future(coroutine)
+        shutdown_task = asyncio.ensure_future(self._shutdown_event.wait())
+        old_signal_handlers = self._install_signal_handlers(loop)
 
         try:
-            while not self.should_shutdown and not future.done():
-                await asyncio.sleep(1)
+            await asyncio.wait([ future, shutdown_task ], return_when = asyncio.FIRST_COMPLETED)
 
             if self.should_shutdown:
                 raise RuntimeError("Async operation was interrupted")
 
         finally:
+            shutdown_task.cancel()
+
             if not future.done():
                 future.cancel()
 
-            try:
-                await asyncio.wait_for(future, timeout = self.shutdown_timeout_seconds)
-            except asyncio.CancelledError:
-                pass
+            force_shutdown_task = asyncio.ensure_future(self._force_shutdown_event.wait())
+            await asyncio.wait([ future, force_shutdown_task ], timeout = self.shutdown_timeout_seconds, return_when = asyncio.FIRST_COMPLETED)
+            force_shutdown_task.cancel()
+
+            self._restore_signal_handlers(loop, old_signal_handlers)
+            asyncio_helpers.current_blocking_executor.reset(blocking_executor_token)
 
+            if self.monitor is not None:
+                await self.monitor.stop()
+
+            if self._force_shutdown_event.is_set():
+                raise RuntimeError("Forcing shutdown (many requests)")
             if not future.done():
                 raise RuntimeError("Future did not complete")
+            if not future.cancelled():
+                future.result()
 
 
     def shutdown(self) -> None:
+        """ Request the running coroutine to be cancelled, this must be called from the event loop thread """
+
         self.should_shutdown = True
+        if self._shutdown_event is not None:
+            self._shutdown_event.set()
 
         self.shutdown_request_counter += 1
         if self.shutdown_request_counter > self.shutdown_request_counter_limit:
+            if self._force_shutdown_event is not None:
+                self._force_shutdown_event.set()
             raise RuntimeError("Forcing shutdown (many requests)")
+
+
+    def _cancel_all_tasks(self, loop: asyncio.AbstractEventLoop) -> None:
+        all_tasks = asyncio.all_tasks(loop)
+        if len(all_tasks) == 0:
+            return
+
+        for task in all_tasks:
+            task.cancel()
+
+        loop.run_until_complete(asyncio.gather(*all_tasks, return_exceptions = True))
+
+
+    def _handle_signal(self) -> None:
+        try:
+            self.shutdown()
+        except RuntimeError:
+            pass # The forced shutdown is handled by run_async
+
+
+    def _install_signal_handlers(self, loop: asyncio.AbstractEventLoop) -> List[Tuple[signal.Signals,Any]]:
+        if threading.current_thread() is not threading.main_thread():
+            return []
+
+        all_signals = [ signal.SIGINT, signal.SIGTERM ]
+        if platform.system() == "Windows":
+            all_signals.append(signal.SIGBREAK) # pylint: disable = no-member
+
+        old_signal_handlers: List[Tuple[signal.Signals,Any]] = []
+
+        for signal_value in all_signals:
+            old_signal_handlers.append((signal_value, signal.getsignal(signal_value)))
+
+            try:
+                loop.add_signal_handler(signal_value, self._handle_signal)
+            except NotImplementedError: # Not supported by the Windows event loops
+                signal.signal(signal_value, lambda signal_number, frame: loop.call_soon_threadsafe(self._handle_signal))
+
+        return old_signal_handlers
+
+
+    def _restore_signal_handlers(self, loop: asyncio.AbstractEventLoop, old_signal_handlers: List[Tuple[signal.Signals,Any]]) -> None:
+        for signal_value, signal_handler in old_signal_handlers:
+            try:
+                loop.remove_signal_handler(signal_value)
+            except NotImplementedError:
+                pass
+
+            signal.signal(signal_value, signal_handler)
@@ -1,8 +1,27 @@
 import asyncio
-from typing import Any
+import contextvars
+import functools
+from typing import Any, Callable, Optional
+
+from bhamon_development_toolkit.asyncio_extensions.blocking_executor import BlockingExecutor
+
+
+current_blocking_executor: contextvars.ContextVar[Optional[BlockingExecutor]] = contextvars.ContextVar("current_blocking_executor", default = None)
 
 
 def from_result(value: Any) -> asyncio.Future:
     future = asyncio.Future()
     future.set_result(value)
     return future
+
+
+async def run_blocking(function: Callable[..., Any], *args, operation_type: Optional[str] = None, **kwargs) -> Any:
+    """ Run a blocking function with the blocking executor from the current AsyncioContext, or with the event loop default executor """
+
+    blocking_executor = current_blocking_executor.get()
+    if blocking_executor is not None:
+        return await blocking_executor.run(function, *args, operation_type = operation_type, **kwargs)
+
+    context = contextvars.copy_context()
+    function_call = functools.partial(context.run, function, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(None, function_call)
@@ -0,0 +1,65 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import os
+from typing import Any, Callable, Dict, Optional
+
+
+class BlockingExecutor:
+    """ Thread pool to run blocking operations from coroutines, with separate limits for disk heavy and CPU heavy operations """
+
+
+    def __init__(self, max_workers: Optional[int] = None, max_disk_operations: Optional[int] = None, max_cpu_operations: Optional[int] = None) -> None:
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if max_disk_operations is not None and max_disk_operations < 1:
+            raise ValueError("max_disk_operations must be at least 1")
+        if max_cpu_operations is not None and max_cpu_operations < 1:
+            raise ValueError("max_cpu_operations must be at least 1")
+
+        self.max_workers = max_workers if max_workers is not None else min(32, (os.cpu_count() or 1) + 4)
+        self.max_disk_operations = max_disk_operations
+        self.max_cpu_operations = max_cpu_operations if max_cpu_operations is not None else (os.cpu_count() or 1)
+
+        self.thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers = self.max_workers, thread_name_prefix = "BlockingExecutor")
+        self._semaphores: Dict[str,asyncio.Semaphore] = {}
+
+
+    async def run(self, function: Callable[..., Any], *args, operation_type: Optional[str] = None, **kwargs) -> Any:
+        """ Run a blocking function in the thread pool, operation_type can be 'disk' or 'cpu' to apply the corresponding limit """
+
+        semaphore = self._get_semaphore(operation_type)
+        context = contextvars.copy_context()
+        function_call = functools.partial(context.run, function, *args, **kwargs)
+        loop = asyncio.get_running_loop()
+
+        if semaphore is None:
+            return await loop.run_in_executor(self.thread_pool, function_call)
+
+        async with semaphore:
+            return await loop.run_in_executor(self.thread_pool, function_call)
+
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.thread_pool.shutdown(wait = wait)
+
+
+    def _get_semaphore(self, operation_type: Optional[str]) -> Optional[asyncio.Semaphore]:
+        if operation_type is None:
+            return None
+
+        if operation_type == "disk":
+            limit = self.max_disk_operations
+        elif operation_type == "cpu":
+            limit = self.max_cpu_operations
+        else:
+            raise ValueError("Unsupported operation type: '%s'" % operation_type)
+
+        if limit is None:
+            return None
+
+        # Semaphores are created on first use so that they are bound to the running event loop
+        if operation_type not in self._semaphores:
+            self._semaphores[operation_type] = asyncio.Semaphore(limit)
+        return self._semaphores[operation_type]
@@ -0,0 +1,38 @@
+import asyncio
+import platform
+from typing import Callable
+
+
+def create_default_event_loop() -> asyncio.AbstractEventLoop:
+    if platform.system() == "Windows":
+        return asyncio.ProactorEventLoop() # pylint: disable = no-member
+    return asyncio.SelectorEventLoop()
+
+
+def create_uvloop_event_loop() -> asyncio.AbstractEventLoop:
+    import uvloop # pylint: disable = import-error, import-outside-toplevel
+    return uvloop.new_event_loop()
+
+
+def is_uvloop_available() -> bool:
+    try:
+        import uvloop # pylint: disable = import-error, import-outside-toplevel, unused-import
+    except ImportError:
+        return False
+    return True
+
+
+def get_event_loop_factory(engine: str) -> Callable[[], asyncio.AbstractEventLoop]:
+    """ Get an event loop factory by name, 'auto' selects uvloop if it is installed and supported, and the default loop otherwise """
+
+    if engine == "auto":
+        engine = "uvloop" if platform.system() != "Windows" and is_uvloop_available() else "asyncio"
+
+    if engine == "asyncio":
+        return create_default_event_loop
+    if engine == "uvloop":
+        if not is_uvloop_available():
+            raise ValueError("Event loop engine 'uvloop' is not installed")
+        return create_uvloop_event_loop
+
+    raise ValueError("Unsupported event loop engine: '%s'" % engine)
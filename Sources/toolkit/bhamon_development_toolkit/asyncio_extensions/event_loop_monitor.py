@@ -0,0 +1,192 @@
+import asyncio
+import collections
+import datetime
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Deque, Dict, List, Optional, Tuple
+
+from bhamon_development_toolkit.asyncio_extensions.event_loop_stall import EventLoopStall
+
+
+logger = logging.getLogger("Asyncio")
+
+
+class EventLoopMonitor: # pylint: disable = too-many-instance-attributes
+    """ Measure the event loop scheduling lag and capture the stack of the code blocking the loop """
+
+
+    def __init__(self,
+            probe_interval: datetime.timedelta = datetime.timedelta(seconds = 0.1),
+            lag_threshold: datetime.timedelta = datetime.timedelta(seconds = 0.1),
+            stall_history_size: int = 100,
+            lag_history_size: int = 10000) -> None:
+
+        self.probe_interval = probe_interval
+        self.lag_threshold = lag_threshold
+        self.stall_history_size = stall_history_size
+        self.lag_history_size = lag_history_size
+
+        # Only the recent lags and stalls are kept, with running statistics for the whole monitoring, so that memory does not grow with the loop lifetime
+        self._lock = threading.Lock()
+        self._all_lags: Deque[float] = collections.deque(maxlen = lag_history_size)
+        self._all_stalls: Deque[EventLoopStall] = collections.deque(maxlen = stall_history_size)
+        self._stall_count = 0
+        self._lag_count = 0
+        self._total_lag = 0.0
+        self._max_lag = 0.0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_identifier: Optional[int] = None
+        self._last_heartbeat: float = 0
+        self._captured_heartbeat: Optional[float] = None
+        self._captured_stack: Optional[Tuple[Optional[str],traceback.StackSummary]] = None
+
+        self._probe_task: Optional[asyncio.Task] = None
+        self._watchdog_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+
+    @property
+    def stall_count(self) -> int:
+        return self._stall_count
+
+
+    @property
+    def lag_count(self) -> int:
+        return self._lag_count
+
+
+    def get_lags(self) -> List[float]:
+        """ Return the recent lags, up to lag_history_size """
+
+        with self._lock:
+            return list(self._all_lags)
+
+
+    def get_stalls(self) -> List[EventLoopStall]:
+        with self._lock:
+            return list(self._all_stalls)
+
+
+    def start(self) -> None:
+        """ Start monitoring the running event loop, this must be called from the event loop thread """
+
+        if self._probe_task is not None:
+            raise RuntimeError("Event loop monitor is already started")
+
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_identifier = threading.get_ident()
+        self._last_heartbeat = time.monotonic()
+        self._stop_event.clear()
+
+        self._probe_task = asyncio.ensure_future(self._probe())
+        self._watchdog_thread = threading.Thread(target = self._watch, name = "EventLoopMonitor", daemon = True)
+        self._watchdog_thread.start()
+
+
+    async def stop(self) -> None:
+        if self._probe_task is None:
+            return
+
+        self._stop_event.set()
+        self._probe_task.cancel()
+
+        try:
+            await self._probe_task
+        except asyncio.CancelledError:
+            pass
+
+        if self._watchdog_thread is not None:
+            self._watchdog_thread.join()
+
+        self._probe_task = None
+        self._watchdog_thread = None
+
+
+    def log_summary(self) -> None:
+        """ Log the lag statistics, with the percentile for the recent lags only, and the locations of the recent stalls """
+
+        all_lags = sorted(self.get_lags())
+        if len(all_lags) == 0:
+            return
+
+        with self._lock:
+            lag_count, total_lag, max_lag = self._lag_count, self._total_lag, self._max_lag
+
+        logger.info("Event loop lag (Samples: %s, Mean: %.3fs, P99: %.3fs, Max: %.3fs, Stalls: %s)",
+            lag_count, total_lag / lag_count, all_lags[int((len(all_lags) - 1) * 0.99)], max_lag, self.stall_count)
+
+        stalls_by_location: Dict[str,List[EventLoopStall]] = {}
+        for stall in self.get_stalls():
+            stalls_by_location.setdefault(stall.location or "Unknown location", []).append(stall)
+
+        sorted_locations = sorted(stalls_by_location.items(), key = lambda item: sum(stall.duration for stall in item[1]), reverse = True)
+        for location, all_stalls_at_location in sorted_locations:
+            longest_stall = max(all_stalls_at_location, key = lambda stall: stall.duration)
+            logger.warning("Event loop was blocked at %s (Count: %s, Total: %.3fs, Max: %.3fs)",
+                location, len(all_stalls_at_location), sum(stall.duration for stall in all_stalls_at_location), longest_stall.duration)
+
+            if longest_stall.stack is not None:
+                logger.debug("Stack for task '%s':\n%s", longest_stall.task_name, "".join(longest_stall.stack.format()).rstrip())
+
+
+    async def _probe(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval = self.probe_interval.total_seconds()
+
+        while True:
+            expected_time = loop.time() + interval
+            await asyncio.sleep(interval)
+            lag = max(0.0, loop.time() - expected_time)
+            self._record_lag(lag)
+
+
+    def _record_lag(self, lag: float) -> None:
+        with self._lock:
+            self._last_heartbeat = time.monotonic()
+            self._all_lags.append(lag)
+            self._lag_count += 1
+            self._total_lag += lag
+            self._max_lag = max(self._max_lag, lag)
+
+            captured_stack = self._captured_stack
+            self._captured_heartbeat = None
+            self._captured_stack = None
+
+            if lag < self.lag_threshold.total_seconds():
+                return
+
+            task_name, stack = captured_stack if captured_stack is not None else (None, None)
+            stall = EventLoopStall(time = time.time() - lag, duration = lag, task_name = task_name, stack = stack)
+
+            self._stall_count += 1
+            self._all_stalls.append(stall)
+
+        logger.debug("Event loop was blocked for %.3fs (Task: %s, Location: %s)", stall.duration, stall.task_name, stall.location)
+
+
+    def _watch(self) -> None:
+        stall_threshold = self.probe_interval.total_seconds() + self.lag_threshold.total_seconds()
+        watch_interval = min(self.probe_interval.total_seconds(), self.lag_threshold.total_seconds()) / 2
+
+        while not self._stop_event.wait(watch_interval):
+            with self._lock:
+                last_heartbeat = self._last_heartbeat
+                if self._captured_heartbeat == last_heartbeat or time.monotonic() - last_heartbeat < stall_threshold:
+                    continue
+
+                self._captured_heartbeat = last_heartbeat
+                self._captured_stack = self._capture_loop_stack()
+
+
+    def _capture_loop_stack(self) -> Optional[Tuple[Optional[str],traceback.StackSummary]]:
+        frame = sys._current_frames().get(self._loop_thread_identifier) # pylint: disable = protected-access
+        if frame is None:
+            return None
+
+        task = asyncio.current_task(self._loop) if self._loop is not None else None
+        task_name = task.get_name() if task is not None else None
+        return (task_name, traceback.extract_stack(frame))
@@ -0,0 +1,16 @@
+import asyncio
+import dataclasses
+import datetime
+from typing import Callable, Optional
+
+
+@dataclasses.dataclass(frozen = True)
+class EventLoopOptions:
+    loop_factory: Optional[Callable[[], asyncio.AbstractEventLoop]] = None
+    executor_max_workers: Optional[int] = None
+    max_disk_operations: Optional[int] = None
+    max_cpu_operations: Optional[int] = None
+
+    debug: Optional[bool] = None
+    slow_callback_duration: Optional[datetime.timedelta] = None
+    use_eager_task_factory: bool = False
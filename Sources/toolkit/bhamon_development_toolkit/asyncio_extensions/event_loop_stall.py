@@ -0,0 +1,22 @@
+import dataclasses
+import traceback
+from typing import Optional
+
+
+@dataclasses.dataclass(frozen = True)
+class EventLoopStall:
+    time: float
+    duration: float
+    task_name: Optional[str] = None
+    stack: Optional[traceback.StackSummary] = None
+
+
+    @property
+    def location(self) -> Optional[str]:
+        """ Return the innermost frame of the captured stack, formatted as 'path:line (function)' """
+
+        if self.stack is None or len(self.stack) == 0:
+            return None
+
+        frame = self.stack[-1]
+        return "%s:%s (%s)" % (frame.filename, frame.lineno, frame.name)
@@ -0,0 +1,86 @@
+import asyncio
+import selectors
+from typing import Any, Coroutine, List, Mapping, Optional, Tuple
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop): # pylint: disable = abstract-method
+    """ Event loop with a virtual clock, advancing instantly to the next scheduled callback when no I/O is ready, meant for tests with fake processes """
+
+
+    def __init__(self, start_time: float = 0) -> None:
+        self._virtual_time = start_time
+        super().__init__(_VirtualTimeSelector(self))
+
+
+    def time(self) -> float:
+        return self._virtual_time
+
+
+    def advance_time(self, duration: float) -> None:
+        """ Move the virtual clock forward, callbacks scheduled before the new time run on the next loop iteration """
+
+        if duration < 0:
+            raise ValueError("duration must not be negative")
+
+        self._virtual_time += duration
+
+
+class VirtualTimeEventLoopPolicy(asyncio.DefaultEventLoopPolicy): # pylint: disable = no-member
+
+
+    def new_event_loop(self) -> asyncio.AbstractEventLoop:
+        return VirtualTimeEventLoop()
+
+
+class _VirtualTimeSelector(selectors.BaseSelector):
+    """ Selector which never blocks while callbacks are scheduled, advancing the loop virtual time instead """
+
+
+    def __init__(self, loop: VirtualTimeEventLoop) -> None:
+        self._loop = loop
+        self._selector = selectors.DefaultSelector()
+
+
+    def register(self, fileobj: Any, events: int, data: Any = None) -> selectors.SelectorKey:
+        return self._selector.register(fileobj, events, data)
+
+
+    def unregister(self, fileobj: Any) -> selectors.SelectorKey:
+        return self._selector.unregister(fileobj)
+
+
+    def modify(self, fileobj: Any, events: int, data: Any = None) -> selectors.SelectorKey:
+        return self._selector.modify(fileobj, events, data)
+
+
+    def select(self, timeout: Optional[float] = None) -> List[Tuple[selectors.SelectorKey,int]]:
+        all_events = self._selector.select(0)
+        if len(all_events) > 0 or timeout == 0:
+            return all_events
+
+        # Without any scheduled callback, wait for events from other threads
+        if timeout is None:
+            return self._selector.select(None)
+
+        self._loop.advance_time(timeout)
+        return []
+
+
+    def close(self) -> None:
+        self._selector.close()
+
+
+    def get_map(self) -> Mapping[Any,selectors.SelectorKey]:
+        return self._selector.get_map()
+
+
+def run_with_virtual_time(coroutine: Coroutine, start_time: float = 0) -> Any:
+    """ Run a coroutine to completion in a new VirtualTimeEventLoop and return its result """
+
+    loop = VirtualTimeEventLoop(start_time)
+
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
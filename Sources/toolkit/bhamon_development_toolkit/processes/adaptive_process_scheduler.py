@@ -0,0 +1,209 @@
+import asyncio
+import collections
+import contextlib
+import logging
+import time
+from typing import AsyncGenerator, Deque, List, Optional
+
+from bhamon_development_toolkit.processes.adaptive_scheduler_decision import AdaptiveSchedulerDecision
+from bhamon_development_toolkit.processes.adaptive_scheduler_options import AdaptiveSchedulerOptions
+from bhamon_development_toolkit.processes.executable_command import ExecutableCommand
+from bhamon_development_toolkit.processes.process_options import ProcessOptions
+from bhamon_development_toolkit.processes.process_output_handler import ProcessOutputHandler
+from bhamon_development_toolkit.processes.process_request import ProcessRequest
+from bhamon_development_toolkit.processes.process_runner import ProcessRunner
+from bhamon_development_toolkit.processes.process_status import ProcessStatus
+from bhamon_development_toolkit.processes.system_pressure import SystemPressure
+from bhamon_development_toolkit.processes.system_pressure_probe import SystemPressureProbe
+
+
+logger = logging.getLogger("ProcessScheduler")
+
+
+class AdaptiveProcessScheduler:
+    """ Run processes concurrently, admitting new ones depending on the system load and backing off when the pressure rises """
+
+
+    def __init__(self,
+            process_runner: ProcessRunner,
+            options: Optional[AdaptiveSchedulerOptions] = None,
+            pressure_probe: Optional[SystemPressureProbe] = None,
+            decision_history_size: int = 1000) -> None:
+
+        self._process_runner = process_runner
+        self._options = options if options is not None else AdaptiveSchedulerOptions()
+        self._pressure_probe = pressure_probe if pressure_probe is not None else SystemPressureProbe()
+
+        self._running_count: int = 0
+        self._concurrency_limit: Optional[int] = None
+        self._last_adjustment_time: Optional[float] = None
+        self._release_event: Optional[asyncio.Event] = None
+        self._decisions: Deque[AdaptiveSchedulerDecision] = collections.deque(maxlen = decision_history_size)
+
+        if self._options.min_concurrency < 1:
+            raise ValueError("min_concurrency must be at least 1")
+        if self._options.max_concurrency is not None and self._options.max_concurrency < self._options.min_concurrency:
+            raise ValueError("max_concurrency must not be lower than min_concurrency")
+
+
+    @property
+    def running_count(self) -> int:
+        return self._running_count
+
+
+    @property
+    def concurrency_limit(self) -> Optional[int]:
+        return self._concurrency_limit
+
+
+    def get_decisions(self) -> List[AdaptiveSchedulerDecision]:
+        return list(self._decisions)
+
+
+    async def run(self,
+            command: ExecutableCommand,
+            options: ProcessOptions,
+            output_handlers: Optional[List[ProcessOutputHandler]] = None,
+            check_exit_code: bool = True
+            ) -> ProcessStatus:
+
+        async with self.slot():
+            return await self._process_runner.run(command, options, output_handlers, check_exit_code = check_exit_code)
+
+
+    async def run_batch(self, requests: List[ProcessRequest]) -> List[ProcessStatus]:
+        all_tasks = [ asyncio.ensure_future(self.run(x.command, x.options, x.output_handlers, x.check_exit_code)) for x in requests ]
+
+        try:
+            return list(await asyncio.gather(*all_tasks))
+
+        except BaseException:
+            for task in all_tasks:
+                task.cancel()
+            await asyncio.gather(*all_tasks, return_exceptions = True)
+            raise
+
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncGenerator[None,None]:
+        await self.acquire()
+
+        try:
+            yield
+        finally:
+            self.release()
+
+
+    async def acquire(self) -> None:
+        is_deferred = False
+
+        while True:
+            pressure = self._pressure_probe.read()
+            reasons = self._check_pressure(pressure)
+            concurrency_limit = self._update_concurrency_limit(pressure, reasons)
+
+            if self._running_count < concurrency_limit:
+                self._running_count += 1
+                self._record_decision("admit", pressure, reasons)
+                return
+
+            if not is_deferred:
+                is_deferred = True
+                self._record_decision("defer", pressure, reasons)
+
+            await self._wait_for_update()
+
+
+    def release(self) -> None:
+        if self._running_count <= 0:
+            raise RuntimeError("Released more slots than were acquired")
+
+        self._running_count -= 1
+
+        if self._release_event is not None:
+            self._release_event.set()
+            self._release_event.clear()
+
+
+    async def _wait_for_update(self) -> None:
+        if self._release_event is None:
+            self._release_event = asyncio.Event()
+
+        try:
+            await asyncio.wait_for(self._release_event.wait(), self._options.update_interval.total_seconds())
+        except asyncio.TimeoutError:
+            pass
+
+
+    def _check_pressure(self, pressure: SystemPressure) -> List[str]:
+        reasons: List[str] = []
+
+        load_per_cpu = pressure.load_per_cpu
+        if self._options.max_load_per_cpu is not None and load_per_cpu is not None:
+            if load_per_cpu > self._options.max_load_per_cpu:
+                reasons.append("LoadPerCpu: %.2f > %.2f" % (load_per_cpu, self._options.max_load_per_cpu))
+        if self._options.max_cpu_pressure is not None and pressure.cpu_pressure is not None:
+            if pressure.cpu_pressure > self._options.max_cpu_pressure:
+                reasons.append("CpuPressure: %.2f > %.2f" % (pressure.cpu_pressure, self._options.max_cpu_pressure))
+        if self._options.max_memory_pressure is not None and pressure.memory_pressure is not None:
+            if pressure.memory_pressure > self._options.max_memory_pressure:
+                reasons.append("MemoryPressure: %.2f > %.2f" % (pressure.memory_pressure, self._options.max_memory_pressure))
+        if self._options.min_available_memory is not None and pressure.available_memory is not None:
+            if pressure.available_memory < self._options.min_available_memory:
+                reasons.append("AvailableMemory: %s < %s" % (pressure.available_memory, self._options.min_available_memory))
+
+        return reasons
+
+
+    def _update_concurrency_limit(self, pressure: SystemPressure, reasons: List[str]) -> int:
+        min_concurrency = self._options.min_concurrency
+        max_concurrency = self._options.max_concurrency if self._options.max_concurrency is not None else pressure.cpu_count
+        max_concurrency = max(min_concurrency, max_concurrency)
+
+        now = time.monotonic()
+
+        if self._concurrency_limit is None:
+            self._concurrency_limit = min_concurrency if len(reasons) > 0 else max_concurrency
+            self._last_adjustment_time = now
+            self._record_decision("initialize", pressure, reasons)
+            return self._concurrency_limit
+
+        if self._last_adjustment_time is not None and now - self._last_adjustment_time < self._options.update_interval.total_seconds():
+            return self._concurrency_limit
+
+        old_limit = self._concurrency_limit
+        new_limit = old_limit
+
+        # Additive increase while the system is healthy, and back off below the current usage when it is under pressure
+        if len(reasons) > 0:
+            new_limit = max(min_concurrency, min(old_limit, self._running_count) - 1)
+        elif old_limit < max_concurrency:
+            new_limit = old_limit + 1
+        elif old_limit > max_concurrency:
+            new_limit = max_concurrency
+
+        if new_limit != old_limit:
+            self._concurrency_limit = new_limit
+            self._last_adjustment_time = now
+            self._record_decision("increase" if new_limit > old_limit else "decrease", pressure, reasons)
+
+        return self._concurrency_limit
+
+
+    def _record_decision(self, action: str, pressure: SystemPressure, reasons: List[str]) -> None:
+        if self._concurrency_limit is None:
+            raise RuntimeError("Concurrency limit should not be none")
+
+        decision = AdaptiveSchedulerDecision(
+            time = time.time(),
+            action = action,
+            running_count = self._running_count,
+            concurrency_limit = self._concurrency_limit,
+            pressure = pressure,
+            reasons = reasons,
+        )
+
+        self._decisions.append(decision)
+
+        logger.debug("Scheduler decision (Action: '%s', Running: %s, Limit: %s, Reasons: %s)",
+            decision.action, decision.running_count, decision.concurrency_limit, ", ".join(decision.reasons) if decision.reasons else "none")
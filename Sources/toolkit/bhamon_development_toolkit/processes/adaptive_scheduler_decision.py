@@ -0,0 +1,14 @@
+import dataclasses
+from typing import List
+
+from bhamon_development_toolkit.processes.system_pressure import SystemPressure
+
+
+@dataclasses.dataclass(frozen = True)
+class AdaptiveSchedulerDecision:
+    time: float
+    action: str
+    running_count: int
+    concurrency_limit: int
+    pressure: SystemPressure
+    reasons: List[str]
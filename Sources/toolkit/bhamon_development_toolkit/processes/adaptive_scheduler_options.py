@@ -0,0 +1,16 @@
+import dataclasses
+import datetime
+from typing import Optional
+
+
+@dataclasses.dataclass(frozen = True)
+class AdaptiveSchedulerOptions:
+    min_concurrency: int = 1
+    max_concurrency: Optional[int] = None # Defaults to the cpu count
+
+    max_load_per_cpu: Optional[float] = 1.5
+    max_cpu_pressure: Optional[float] = 40.0
+    max_memory_pressure: Optional[float] = 10.0
+    min_available_memory: Optional[int] = 512 * 1024 * 1024
+
+    update_interval: datetime.timedelta = datetime.timedelta(seconds = 1)
@@ -0,0 +1,240 @@
+import asyncio
+import heapq
+import logging
+import time
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+
+from bhamon_development_toolkit.processes.adaptive_process_scheduler import AdaptiveProcessScheduler
+from bhamon_development_toolkit.processes.process_graph_node import ProcessGraphNode
+from bhamon_development_toolkit.processes.process_graph_node_result import ProcessGraphNodeResult
+from bhamon_development_toolkit.processes.process_runner import ProcessRunner
+from bhamon_development_toolkit.processes.process_status import ProcessStatus
+
+
+logger = logging.getLogger("ProcessGraph")
+
+
+class ProcessGraphExecutor:
+    """ Run a dependency graph of processes and coroutines, with bounded parallelism and critical path first scheduling """
+
+
+    def __init__(self, # pylint: disable = too-many-arguments
+            process_runner: ProcessRunner,
+            max_concurrency: int = 1,
+            fail_fast: bool = True,
+            duration_estimates: Optional[Mapping[str,float]] = None,
+            default_duration_estimate: float = 1.0,
+            scheduler: Optional[AdaptiveProcessScheduler] = None) -> None:
+
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self._process_runner = process_runner
+        self._max_concurrency = max_concurrency
+        self._fail_fast = fail_fast
+        self._duration_estimates = duration_estimates if duration_estimates is not None else {}
+        self._default_duration_estimate = default_duration_estimate
+        self._scheduler = scheduler
+
+
+    async def run(self, all_nodes: List[ProcessGraphNode], check_success: bool = True) -> List[ProcessGraphNodeResult]: # pylint: disable = too-many-branches, too-many-locals
+        """ Run all nodes and return their results, in the same order as the nodes """
+
+        node_dictionary = { node.identifier: node for node in all_nodes }
+        node_indexes = { node.identifier: index for index, node in enumerate(all_nodes) }
+        dependents = self._list_dependents(all_nodes)
+        priorities = self.compute_priorities(all_nodes)
+
+        logger.info("Running process graph (Nodes: %s, MaxConcurrency: %s, FailFast: %s)", len(all_nodes), self._max_concurrency, self._fail_fast)
+
+        run_start_time = time.time()
+        remaining_dependencies: Dict[str,Set[str]] = { node.identifier: set(node.dependencies) for node in all_nodes }
+        ready_queue: List[Tuple[float,int,str]] = []
+        running_tasks: Dict[asyncio.Task,str] = {}
+        start_times: Dict[str,float] = {}
+        results: Dict[str,ProcessGraphNodeResult] = {}
+        is_aborting = False
+
+        for node in all_nodes:
+            if len(node.dependencies) == 0:
+                heapq.heappush(ready_queue, (- priorities[node.identifier], node_indexes[node.identifier], node.identifier))
+
+        try:
+            while len(ready_queue) > 0 or len(running_tasks) > 0:
+                while len(ready_queue) > 0 and len(running_tasks) < self._max_concurrency and not is_aborting:
+                    identifier = heapq.heappop(ready_queue)[2]
+                    task = asyncio.ensure_future(self._run_node(node_dictionary[identifier], start_times))
+                    running_tasks[task] = identifier
+
+                if len(running_tasks) == 0:
+                    break
+
+                completed_tasks, _ = await asyncio.wait(running_tasks.keys(), return_when = asyncio.FIRST_COMPLETED)
+
+                for task in completed_tasks:
+                    result: ProcessGraphNodeResult = task.result()
+                    results[running_tasks.pop(task)] = result
+
+                    if result.status != "succeeded" and self._fail_fast:
+                        is_aborting = True
+                    elif result.status != "succeeded":
+                        for dependent in self._list_transitive_dependents(result.identifier, dependents):
+                            results.setdefault(dependent, ProcessGraphNodeResult(identifier = dependent, status = "skipped"))
+                    else:
+                        for dependent in self._release_dependents(result.identifier, dependents, remaining_dependencies, results):
+                            heapq.heappush(ready_queue, (- priorities[dependent], node_indexes[dependent], dependent))
+
+                if is_aborting and len(running_tasks) > 0:
+                    await self._cancel_tasks(running_tasks, start_times, results)
+
+        except BaseException:
+            await self._cancel_tasks(running_tasks, start_times, results)
+            raise
+
+        for node in all_nodes:
+            results.setdefault(node.identifier, ProcessGraphNodeResult(identifier = node.identifier, status = "skipped"))
+
+        all_results = [ results[node.identifier] for node in all_nodes ]
+        self._log_report(all_results, time.time() - run_start_time)
+
+        if check_success and any(result.status != "succeeded" for result in all_results):
+            raise RuntimeError("Process graph completed with failures")
+
+        return all_results
+
+
+    def compute_priorities(self, all_nodes: List[ProcessGraphNode]) -> Dict[str,float]:
+        """ Compute the estimated duration of the longest path starting from each node """
+
+        dependents = self._list_dependents(all_nodes)
+        priorities: Dict[str,float] = {}
+
+        for identifier in reversed(self._sort_topologically(all_nodes)):
+            longest_remaining_path = max((priorities[dependent] for dependent in dependents[identifier]), default = 0.0)
+            priorities[identifier] = self._duration_estimates.get(identifier, self._default_duration_estimate) + longest_remaining_path
+
+        return priorities
+
+
+    async def _run_node(self, node: ProcessGraphNode, start_times: Dict[str,float]) -> ProcessGraphNodeResult:
+        if self._scheduler is not None:
+            async with self._scheduler.slot():
+                return await self._run_node_unsafe(node, start_times)
+        return await self._run_node_unsafe(node, start_times)
+
+
+    async def _run_node_unsafe(self, node: ProcessGraphNode, start_times: Dict[str,float]) -> ProcessGraphNodeResult:
+        logger.debug("Starting node '%s'", node.identifier)
+
+        start_times[node.identifier] = time.time()
+        process_status: Optional[ProcessStatus] = None
+
+        try:
+            if node.request is not None:
+                process_status = await self._process_runner.run(
+                    node.request.command, node.request.options, node.request.output_handlers, check_exit_code = node.request.check_exit_code)
+            elif node.coroutine_factory is not None:
+                await node.coroutine_factory()
+
+        except Exception as exception: # pylint: disable = broad-except
+            logger.error("Node '%s' failed: %s", node.identifier, exception)
+            return ProcessGraphNodeResult(
+                identifier = node.identifier, status = "failed", start_time = start_times[node.identifier], completion_time = time.time(),
+                process_status = process_status, exception = exception)
+
+        return ProcessGraphNodeResult(
+            identifier = node.identifier, status = "succeeded", start_time = start_times[node.identifier], completion_time = time.time(),
+            process_status = process_status)
+
+
+    async def _cancel_tasks(self,
+            running_tasks: Dict[asyncio.Task,str], start_times: Dict[str,float], results: Dict[str,ProcessGraphNodeResult]) -> None:
+
+        for task in running_tasks:
+            task.cancel()
+
+        await asyncio.gather(*running_tasks.keys(), return_exceptions = True)
+
+        for task, identifier in running_tasks.items():
+            if task.cancelled() or task.exception() is not None:
+                results[identifier] = ProcessGraphNodeResult(
+                    identifier = identifier, status = "cancelled", start_time = start_times.get(identifier), completion_time = time.time())
+            else:
+                results[identifier] = task.result()
+
+        running_tasks.clear()
+
+
+    def _release_dependents(self, identifier: str,
+            dependents: Dict[str,List[str]], remaining_dependencies: Dict[str,Set[str]], results: Dict[str,ProcessGraphNodeResult]) -> List[str]:
+
+        ready_dependents: List[str] = []
+
+        for dependent in dependents[identifier]:
+            remaining_dependencies[dependent].discard(identifier)
+            if len(remaining_dependencies[dependent]) == 0 and dependent not in results and dependent not in ready_dependents:
+                ready_dependents.append(dependent)
+
+        return ready_dependents
+
+
+    def _list_dependents(self, all_nodes: List[ProcessGraphNode]) -> Dict[str,List[str]]:
+        dependents: Dict[str,List[str]] = {}
+
+        for node in all_nodes:
+            if node.identifier in dependents:
+                raise ValueError("Duplicate node identifier: '%s'" % node.identifier)
+            dependents[node.identifier] = []
+
+        for node in all_nodes:
+            for dependency in node.dependencies:
+                if dependency not in dependents:
+                    raise ValueError("Node '%s' depends on unknown node '%s'" % (node.identifier, dependency))
+                dependents[dependency].append(node.identifier)
+
+        return dependents
+
+
+    def _list_transitive_dependents(self, identifier: str, dependents: Dict[str,List[str]]) -> List[str]:
+        all_transitive_dependents: List[str] = []
+        nodes_to_visit = list(dependents[identifier])
+
+        while len(nodes_to_visit) > 0:
+            current = nodes_to_visit.pop()
+            if current not in all_transitive_dependents:
+                all_transitive_dependents.append(current)
+                nodes_to_visit += dependents[current]
+
+        return all_transitive_dependents
+
+
+    def _sort_topologically(self, all_nodes: List[ProcessGraphNode]) -> List[str]:
+        dependents = self._list_dependents(all_nodes)
+        dependency_counts = { node.identifier: len(node.dependencies) for node in all_nodes }
+
+        sorted_nodes: List[str] = []
+        nodes_to_visit = [ node.identifier for node in all_nodes if dependency_counts[node.identifier] == 0 ]
+
+        while len(nodes_to_visit) > 0:
+            current = nodes_to_visit.pop()
+            sorted_nodes.append(current)
+
+            for dependent in dependents[current]:
+                dependency_counts[dependent] -= 1
+                if dependency_counts[dependent] == 0:
+                    nodes_to_visit.append(dependent)
+
+        if len(sorted_nodes) != len(all_nodes):
+            cycle_nodes = [ node.identifier for node in all_nodes if node.identifier not in sorted_nodes ]
+            raise ValueError("Process graph has a dependency cycle (Nodes: %s)" % ", ".join(cycle_nodes))
+
+        return sorted_nodes
+
+
+    def _log_report(self, all_results: List[ProcessGraphNodeResult], total_duration: float) -> None:
+        for result in all_results:
+            log_level = logging.INFO if result.status == "succeeded" else logging.ERROR
+            duration = "%.3fs" % result.duration.total_seconds() if result.duration is not None else "n/a"
+            logger.log(log_level, "Node '%s' %s (Duration: %s)", result.identifier, result.status, duration)
+
+        logger.info("Process graph completed (Duration: %.3fs)", total_duration)
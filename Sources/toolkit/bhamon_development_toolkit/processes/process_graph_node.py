@@ -0,0 +1,17 @@
+import dataclasses
+from typing import Any, Awaitable, Callable, List, Optional
+
+from bhamon_development_toolkit.processes.process_request import ProcessRequest
+
+
+@dataclasses.dataclass(frozen = True)
+class ProcessGraphNode:
+    identifier: str
+    dependencies: List[str] = dataclasses.field(default_factory = list)
+    request: Optional[ProcessRequest] = None
+    coroutine_factory: Optional[Callable[[], Awaitable[Any]]] = None
+
+
+    def __post_init__(self) -> None:
+        if (self.request is None) == (self.coroutine_factory is None):
+            raise ValueError("Node '%s' must have either a request or a coroutine factory" % self.identifier)
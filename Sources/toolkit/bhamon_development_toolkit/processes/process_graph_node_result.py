@@ -0,0 +1,22 @@
+import dataclasses
+import datetime
+from typing import Optional
+
+from bhamon_development_toolkit.processes.process_status import ProcessStatus
+
+
+@dataclasses.dataclass(frozen = True)
+class ProcessGraphNodeResult:
+    identifier: str
+    status: str
+    start_time: Optional[float] = None
+    completion_time: Optional[float] = None
+    process_status: Optional[ProcessStatus] = None
+    exception: Optional[BaseException] = None
+
+
+    @property
+    def duration(self) -> Optional[datetime.timedelta]:
+        if self.start_time is None or self.completion_time is None:
+            return None
+        return datetime.timedelta(seconds = self.completion_time - self.start_time)
@@ -0,0 +1,189 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Mapping, Optional
+
+from bhamon_development_toolkit.processes.process_ledger_entry import ProcessLedgerEntry
+
+
+logger = logging.getLogger("ProcessLedger")
+
+
+class ProcessLedger:
+    """ Persist process runs to a local SQLite database, writing them in batches """
+
+
+    def __init__(self, database_path: str, batch_size: int = 100) -> None:
+        self.database_path = database_path
+        self.batch_size = batch_size
+
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pending_entries: List[ProcessLedgerEntry] = []
+
+        # Batches can be written from a worker thread, so the connection is shared between threads and guarded by a lock
+        self._connection_lock = threading.Lock()
+
+
+    def __enter__(self) -> "ProcessLedger":
+        return self
+
+
+    def __exit__(self, exception_type, exception_value, traceback) -> None:
+        self.close()
+
+
+    def record(self, entry: ProcessLedgerEntry) -> None:
+        self._pending_entries.append(entry)
+
+        if len(self._pending_entries) >= self.batch_size:
+            self.flush()
+
+
+    async def record_async(self, entry: ProcessLedgerEntry) -> None:
+        """ Record an entry from a coroutine, writing full batches from a worker thread so that the database does not block the event loop """
+
+        self._pending_entries.append(entry)
+
+        if len(self._pending_entries) >= self.batch_size:
+            await asyncio.get_running_loop().run_in_executor(None, self.flush)
+
+
+    def flush(self) -> None:
+        # Take the pending entries first, so that entries recorded while writing are kept for the next batch
+        all_entries, self._pending_entries = self._pending_entries, []
+        if len(all_entries) == 0:
+            return
+
+        logger.debug("Writing %s entries to '%s'", len(all_entries), self.database_path)
+
+        entries_as_rows = [
+            (
+                entry.run_identifier, entry.executable, entry.command, entry.working_directory,
+                entry.start_time, entry.end_time, entry.duration, entry.exit_code, entry.user_time, entry.system_time,
+            )
+            for entry in all_entries
+        ]
+
+        with self._connection_lock:
+            connection = self._get_connection()
+            with connection:
+                connection.executemany(
+                    "INSERT INTO process_run (run_identifier, executable, command, working_directory,"
+                    + " start_time, end_time, duration, exit_code, user_time, system_time)"
+                    + " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", entries_as_rows)
+
+
+    def close(self) -> None:
+        self.flush()
+
+        with self._connection_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+    def list_entries(self, command: Optional[str] = None, run_identifier: Optional[str] = None) -> List[ProcessLedgerEntry]:
+        self.flush()
+
+        query = "SELECT run_identifier, executable, command, working_directory, start_time, end_time, exit_code, user_time, system_time FROM process_run"
+        conditions: List[str] = []
+        parameters: List[str] = []
+
+        if command is not None:
+            conditions.append("command = ?")
+            parameters.append(command)
+        if run_identifier is not None:
+            conditions.append("run_identifier = ?")
+            parameters.append(run_identifier)
+
+        if len(conditions) > 0:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY start_time"
+
+        with self._connection_lock:
+            return [ ProcessLedgerEntry(*row) for row in self._get_connection().execute(query, parameters) ]
+
+
+    def get_duration_percentiles(self,
+            command: str, percentiles: Optional[List[float]] = None, history_size: Optional[int] = None) -> Optional[Dict[float,float]]:
+
+        """ Compute duration percentiles for a command, over its most recent successful runs """
+
+        if percentiles is None:
+            percentiles = [ 50, 90, 99 ]
+
+        self.flush()
+
+        query = "SELECT duration FROM process_run WHERE command = ? AND exit_code = 0 ORDER BY start_time DESC"
+        if history_size is not None:
+            query += " LIMIT %d" % history_size
+
+        with self._connection_lock:
+            all_durations = sorted(row[0] for row in self._get_connection().execute(query, (command,)))
+        if len(all_durations) == 0:
+            return None
+
+        return { percentile: compute_percentile(all_durations, percentile) for percentile in percentiles }
+
+
+    def get_duration_estimates(self,
+            command_by_identifier: Mapping[str,str], percentile: float = 50, history_size: Optional[int] = None) -> Dict[str,float]:
+
+        """ Estimate durations for commands with a history, for instance to prioritize nodes in a ProcessGraphExecutor """
+
+        duration_estimates: Dict[str,float] = {}
+
+        for identifier, command in command_by_identifier.items():
+            duration_percentiles = self.get_duration_percentiles(command, [ percentile ], history_size = history_size)
+            if duration_percentiles is not None:
+                duration_estimates[identifier] = duration_percentiles[percentile]
+
+        return duration_estimates
+
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            if os.path.dirname(self.database_path):
+                os.makedirs(os.path.dirname(self.database_path), exist_ok = True)
+
+            self._connection = sqlite3.connect(self.database_path, timeout = 30, check_same_thread = False)
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._initialize_schema(self._connection)
+
+        return self._connection
+
+
+    def _initialize_schema(self, connection: sqlite3.Connection) -> None:
+        with connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS process_run ("
+                + " identifier INTEGER PRIMARY KEY AUTOINCREMENT,"
+                + " run_identifier TEXT,"
+                + " executable TEXT NOT NULL,"
+                + " command TEXT NOT NULL,"
+                + " working_directory TEXT,"
+                + " start_time REAL NOT NULL,"
+                + " end_time REAL NOT NULL,"
+                + " duration REAL NOT NULL,"
+                + " exit_code INTEGER,"
+                + " user_time REAL,"
+                + " system_time REAL)")
+
+            connection.execute("CREATE INDEX IF NOT EXISTS process_run_command_index ON process_run (command, start_time)")
+            connection.execute("CREATE INDEX IF NOT EXISTS process_run_run_identifier_index ON process_run (run_identifier)")
+
+
+def compute_percentile(sorted_values: List[float], percentile: float) -> float:
+    """ Compute a percentile with linear interpolation between the closest ranks """
+
+    if len(sorted_values) == 0:
+        raise ValueError("sorted_values must not be empty")
+    if not 0 <= percentile <= 100:
+        raise ValueError("percentile must be between 0 and 100")
+
+    rank = (len(sorted_values) - 1) * percentile / 100
+    lower_index = int(rank)
+    upper_index = min(lower_index + 1, len(sorted_values) - 1)
+
+    return sorted_values[lower_index] + (sorted_values[upper_index] - sorted_values[lower_index]) * (rank - lower_index)
@@ -0,0 +1,22 @@
+import dataclasses
+from typing import Optional
+
+
+@dataclasses.dataclass(frozen = True)
+class ProcessLedgerEntry: # pylint: disable = too-many-instance-attributes
+    """ Record of a completed process, with times in seconds since the epoch and resource usage in seconds """
+
+    run_identifier: Optional[str]
+    executable: str
+    command: str
+    working_directory: Optional[str]
+    start_time: float
+    end_time: float
+    exit_code: Optional[int]
+    user_time: Optional[float] = None
+    system_time: Optional[float] = None
+
+
+    @property
+    def duration(self) -> float:
+        return self.end_time - self.start_time
@@ -14,3 +14,5 @@ class ProcessOptions:
     output_timeout: Optional[datetime.timedelta] = None
     termination_timeout: datetime.timedelta = datetime.timedelta(seconds = 10)
     wait_update_interval: datetime.timedelta = datetime.timedelta(seconds = 1)
+
+    collect_output_statistics: bool = False
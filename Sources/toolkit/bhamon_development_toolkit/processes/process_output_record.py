@@ -0,0 +1,7 @@
+import dataclasses
+
+
+@dataclasses.dataclass(frozen = True)
+class ProcessOutputRecord:
+    stream: str
+    line: str
@@ -0,0 +1,18 @@
+import dataclasses
+
+
+@dataclasses.dataclass
+class ProcessOutputStatistics:
+    """ Time spent by an output handler processing a stream, with durations in seconds """
+
+    handler: str
+    stream: str
+    call_count: int = 0
+    cumulative_seconds: float = 0
+    max_seconds: float = 0
+
+
+    def record(self, duration: float) -> None:
+        self.call_count += 1
+        self.cumulative_seconds += duration
+        self.max_seconds = max(self.max_seconds, duration)
@@ -0,0 +1,90 @@
+import asyncio
+import collections
+from typing import Deque
+
+from bhamon_development_toolkit.processes.process_output_handler import ProcessOutputHandler
+from bhamon_development_toolkit.processes.process_output_record import ProcessOutputRecord
+from bhamon_development_toolkit.processes.process_watcher import ProcessWatcher
+
+
+class ProcessOutputStream(ProcessOutputHandler):
+    """ Output handler exposing the process output as an async iterator, pausing the watcher when the buffer is full """
+
+
+    def __init__(self, watcher: ProcessWatcher, buffer_size: int = 1000) -> None:
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be at least 1")
+
+        self._watcher = watcher
+        self._buffer_size = buffer_size
+        self._buffer: Deque[ProcessOutputRecord] = collections.deque()
+        self._update_event = asyncio.Event()
+        self._is_complete = False
+        self._is_closed = False
+
+
+    @property
+    def is_complete(self) -> bool:
+        """ Return True if the process output was fully read, otherwise False. """
+        return self._is_complete
+
+
+    def process_stdout_line(self, line: str) -> None:
+        self._push(ProcessOutputRecord(stream = "stdout", line = line))
+
+
+    def process_stderr_line(self, line: str) -> None:
+        self._push(ProcessOutputRecord(stream = "stderr", line = line))
+
+
+    def process_stdout_end(self) -> None:
+        pass
+
+
+    def process_stderr_end(self) -> None:
+        pass
+
+
+    def complete(self) -> None:
+        """ Signal that no more output will be produced, consumers will stop after reading the remaining records. """
+        self._is_complete = True
+        self._update_event.set()
+
+
+    def close(self) -> None:
+        """ Discard the remaining records and ignore any further output. """
+        self._is_closed = True
+        self._buffer.clear()
+        self._update_event.set()
+        self._watcher.resume_output()
+
+
+    def __aiter__(self) -> "ProcessOutputStream":
+        return self
+
+
+    async def __anext__(self) -> ProcessOutputRecord:
+        while len(self._buffer) == 0:
+            if self._is_complete or self._is_closed:
+                raise StopAsyncIteration
+
+            self._update_event.clear()
+            await self._update_event.wait()
+
+        record = self._buffer.popleft()
+
+        if len(self._buffer) < self._buffer_size:
+            self._watcher.resume_output()
+
+        return record
+
+
+    def _push(self, record: ProcessOutputRecord) -> None:
+        if self._is_closed:
+            return
+
+        self._buffer.append(record)
+        self._update_event.set()
+
+        if len(self._buffer) >= self._buffer_size:
+            self._watcher.pause_output()
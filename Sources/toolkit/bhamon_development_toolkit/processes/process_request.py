@@ -0,0 +1,14 @@
+import dataclasses
+from typing import List, Optional
+
+from bhamon_development_toolkit.processes.executable_command import ExecutableCommand
+from bhamon_development_toolkit.processes.process_options import ProcessOptions
+from bhamon_development_toolkit.processes.process_output_handler import ProcessOutputHandler
+
+
+@dataclasses.dataclass(frozen = True)
+class ProcessRequest:
+    command: ExecutableCommand
+    options: ProcessOptions
+    output_handlers: Optional[List[ProcessOutputHandler]] = None
+    check_exit_code: bool = True
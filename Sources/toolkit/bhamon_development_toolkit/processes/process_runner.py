@@ -1,17 +1,45 @@
-from typing import List, Optional
+import asyncio
+import contextlib
+import dataclasses
+import time
+from typing import AsyncGenerator, List, Optional, Tuple
 
+from bhamon_development_toolkit.processes import process_helpers
 from bhamon_development_toolkit.processes.executable_command import ExecutableCommand
+from bhamon_development_toolkit.processes.process_ledger import ProcessLedger
+from bhamon_development_toolkit.processes.process_ledger_entry import ProcessLedgerEntry
 from bhamon_development_toolkit.processes.process_options import ProcessOptions
 from bhamon_development_toolkit.processes.process_output_handler import ProcessOutputHandler
+from bhamon_development_toolkit.processes.process_output_stream import ProcessOutputStream
 from bhamon_development_toolkit.processes.process_spawner import ProcessSpawner
 from bhamon_development_toolkit.processes.process_status import ProcessStatus
+from bhamon_development_toolkit.processes.process_watcher import ProcessWatcher
+
+try:
+    import resource
+except ImportError: # The resource module is not available on Windows
+    resource = None # type: ignore
+
+
+@dataclasses.dataclass(eq = False)
+class _ResourceUsageMeasure:
+    user_time: float
+    system_time: float
+    is_overlapping: bool = False
+
+
+# Usage can only be measured for all child processes together, so measures for processes running at the same time are discarded
+_all_active_measures: List[_ResourceUsageMeasure] = []
 
 
 class ProcessRunner:
 
 
-    def __init__(self, spawner: ProcessSpawner) -> None:
+    def __init__(self, spawner: ProcessSpawner, ledger: Optional[ProcessLedger] = None, run_identifier: Optional[str] = None) -> None:
         self._spawner = spawner
+        self._ledger = ledger
+
+        self.run_identifier = run_identifier
 
 
     async def run(self,
@@ -21,7 +49,9 @@ class ProcessRunner:
             check_exit_code: bool = True
             ) -> ProcessStatus:
 
+        start_time = time.time()
         watcher = await self._spawner.spawn_process(command = command, options = options)
+        resource_usage_measure = self._start_resource_usage_measure()
 
         if output_handlers is not None:
             for handler in output_handlers:
@@ -38,4 +68,117 @@ class ProcessRunner:
 
             raise
 
+        finally:
+            await self._record_to_ledger(command, options, watcher, start_time, resource_usage_measure)
+
         return watcher.get_status()
+
+
+    @contextlib.asynccontextmanager
+    async def stream(self, # pylint: disable = too-many-arguments
+            command: ExecutableCommand,
+            options: ProcessOptions,
+            output_handlers: Optional[List[ProcessOutputHandler]] = None,
+            check_exit_code: bool = True,
+            buffer_size: int = 1000
+            ) -> AsyncGenerator[ProcessOutputStream,None]:
+
+        """ Run a process and yield its output as an async iterator, the process is terminated if the consumer stops early """
+
+        start_time = time.time()
+        watcher = await self._spawner.spawn_process(command = command, options = options)
+        resource_usage_measure = self._start_resource_usage_measure()
+        output_stream = ProcessOutputStream(watcher, buffer_size)
+
+        if output_handlers is not None:
+            for handler in output_handlers:
+                watcher.add_output_handler(handler)
+        watcher.add_output_handler(output_stream)
+
+        async def wait_for_output() -> None:
+            await watcher.wait(drain_output = True)
+            output_stream.complete()
+
+        wait_task: Optional[asyncio.Task] = None
+
+        try:
+            await watcher.start()
+            wait_task = asyncio.ensure_future(wait_for_output())
+
+            yield output_stream
+
+            is_output_complete = output_stream.is_complete
+            if not is_output_complete:
+                output_stream.close()
+                await watcher.terminate("StreamClosed")
+
+            await wait_task
+            await watcher.complete(check_exit_code and is_output_complete)
+
+        except BaseException as exception:
+            output_stream.close()
+
+            if watcher.get_status().is_running:
+                await watcher.terminate(type(exception).__name__)
+            if wait_task is not None and not wait_task.done():
+                wait_task.cancel()
+
+            raise
+
+        finally:
+            await self._record_to_ledger(command, options, watcher, start_time, resource_usage_measure)
+
+
+    async def _record_to_ledger(self, # pylint: disable = too-many-arguments
+            command: ExecutableCommand, options: ProcessOptions, watcher: ProcessWatcher,
+            start_time: float, resource_usage_measure: Optional[_ResourceUsageMeasure]) -> None:
+
+        if self._ledger is None:
+            return
+
+        status = watcher.get_status()
+        resource_usage = self._complete_resource_usage_measure(resource_usage_measure)
+
+        entry = ProcessLedgerEntry(
+            run_identifier = self.run_identifier,
+            executable = command.executable_name,
+            command = process_helpers.format_executable_command(command.get_command_for_logging()),
+            working_directory = options.working_directory,
+            start_time = start_time,
+            end_time = time.time(),
+            exit_code = status.exit_code,
+            user_time = resource_usage[0] if resource_usage is not None else None,
+            system_time = resource_usage[1] if resource_usage is not None else None,
+        )
+
+        await self._ledger.record_async(entry)
+
+
+    def _start_resource_usage_measure(self) -> Optional[_ResourceUsageMeasure]:
+        """ Start measuring after spawning the process, which is fine since the usage for a child process is only counted once it exits """
+
+        if self._ledger is None or resource is None:
+            return None
+
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        measure = _ResourceUsageMeasure(usage.ru_utime, usage.ru_stime, is_overlapping = len(_all_active_measures) > 0)
+
+        for other_measure in _all_active_measures:
+            other_measure.is_overlapping = True
+        _all_active_measures.append(measure)
+
+        return measure
+
+
+    def _complete_resource_usage_measure(self, measure: Optional[_ResourceUsageMeasure]) -> Optional[Tuple[float,float]]:
+        """ Return the user and system time used by the process, or None if another process ran meanwhile, since its usage would be included """
+
+        if measure is None or resource is None:
+            return None
+
+        _all_active_measures.remove(measure)
+        if measure.is_overlapping:
+            return None
+
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return (usage.ru_utime - measure.user_time, usage.ru_stime - measure.system_time)
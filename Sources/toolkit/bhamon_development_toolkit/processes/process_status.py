@@ -1,6 +1,8 @@
 import dataclasses
 import os
-from typing import Optional
+from typing import List, Optional
+
+from bhamon_development_toolkit.processes.process_output_statistics import ProcessOutputStatistics
 
 
 @dataclasses.dataclass(frozen = True)
@@ -9,6 +11,7 @@ class ProcessStatus:
     pid: int
     is_running: bool
     exit_code: Optional[int]
+    output_statistics: Optional[List[ProcessOutputStatistics]] = None
 
 
     @property
@@ -1,8 +1,9 @@
 import asyncio
+import dataclasses
 import datetime
 import logging
 import time
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 from bhamon_development_toolkit.processes.exceptions.process_failure_exception import ProcessFailureException
 from bhamon_development_toolkit.processes.exceptions.process_timeout_exception import ProcessTimeoutException
@@ -10,6 +11,7 @@ from bhamon_development_toolkit.processes.executable_command import ExecutableCo
 from bhamon_development_toolkit.processes.process import Process
 from bhamon_development_toolkit.processes.process_options import ProcessOptions
 from bhamon_development_toolkit.processes.process_output_handler import ProcessOutputHandler
+from bhamon_development_toolkit.processes.process_output_statistics import ProcessOutputStatistics
 from bhamon_development_toolkit.processes.process_status import ProcessStatus
 
 
@@ -19,22 +21,30 @@ logger = logging.getLogger("ProcessWatcher")
 class ProcessWatcher: # pylint: disable = too-many-instance-attributes
 
 
-    def __init__(self, process: Process, command: ExecutableCommand, options: ProcessOptions) -> None:
+    def __init__(self, process: Process, command: ExecutableCommand, options: ProcessOptions, clock: Optional[Callable[[], float]] = None) -> None:
         self._process = process
         self._command = command
         self._options = options
+        self._clock = clock
 
         self._timeout_task: Optional[asyncio.Task] = None
         self._start_time: Optional[float] = None
         self._completion_time: Optional[float] = None
         self._last_output_time: Optional[float] = None
+        self._output_pause_time: Optional[float] = None
         self._custom_exit_code: Optional[int] = None
 
         self._stdout_task: Optional[asyncio.Task] = None
         self._stderr_task: Optional[asyncio.Task] = None
         self._output_handlers: List[ProcessOutputHandler] = []
+        self._output_statistics: Optional[Dict[Tuple[int,str],ProcessOutputStatistics]] = None
+
+        if options.collect_output_statistics:
+            self._output_statistics = {}
 
         self._termination_lock = asyncio.Lock()
+        self._output_resumed_event = asyncio.Event()
+        self._output_resumed_event.set()
 
 
     @property
@@ -58,9 +68,26 @@ class ProcessWatcher: # pylint: disable = too-many-instance-attributes
             pid = self._process.pid,
             is_running = self._process.is_running,
             exit_code = self._resolve_exit_code(),
+            output_statistics = self.get_output_statistics(),
         )
 
 
+    def get_output_statistics(self) -> Optional[List[ProcessOutputStatistics]]:
+        """ Return the time spent in each output handler, if collecting statistics is enabled in the options. """
+
+        if self._output_statistics is None:
+            return None
+        return [ dataclasses.replace(statistics) for statistics in self._output_statistics.values() ]
+
+
+    def _get_time(self) -> float:
+        """ Get the current time from the clock, defaulting to the event loop monotonic time """
+
+        if self._clock is not None:
+            return self._clock()
+        return asyncio.get_running_loop().time()
+
+
     def _resolve_exit_code(self) -> Optional[int]:
         if self._custom_exit_code is not None:
             return self._custom_exit_code
@@ -72,8 +99,8 @@ class ProcessWatcher: # pylint: disable = too-many-instance-attributes
     async def start(self) -> None:
         logger.debug("Subprocess started (Executable: '%s', PID: %s)", self.executable, self.pid)
 
-        self._start_time = time.time()
-        self._last_output_time = time.time()
+        self._start_time = self._get_time()
+        self._last_output_time = self._get_time()
 
         self._timeout_task = asyncio.create_task(self._watch_timeout())
         if self._process.stdout is not None:
@@ -82,13 +109,15 @@ class ProcessWatcher: # pylint: disable = too-many-instance-attributes
             self._stderr_task = asyncio.create_task(self._watch_stderr(self._process.stderr))
 
 
-    async def wait(self) -> None:
+    async def wait(self, drain_output: bool = False) -> None:
+        """ Wait for the process to exit and for its output to be read, with no timeout on reading the output if drain_output is set """
+
         await self._process.wait()
 
         if self._timeout_task is not None:
             self._timeout_task.cancel()
 
-        await self._wait_tasks()
+        await self._wait_tasks(drain_output)
 
 
     async def complete(self, check_exit_code: bool = True) -> None:
@@ -98,7 +127,10 @@ class ProcessWatcher: # pylint: disable = too-many-instance-attributes
         exit_code = self._resolve_exit_code()
         logger.debug("Subprocess exited (Executable: '%s', PID: %s, ExitCode: %s)", self.executable, self.pid, exit_code)
 
-        self._completion_time = time.time()
+        self._completion_time = self._get_time()
+
+        if self._output_statistics is not None:
+            self._log_output_statistics()
 
         if exit_code != 0:
             try:
@@ -147,6 +179,7 @@ class ProcessWatcher: # pylint: disable = too-many-instance-attributes
         if self._timeout_task is not None:
             self._timeout_task.cancel()
 
+        self.resume_output()
         await self._wait_tasks()
 
         if self._process.is_running:
@@ -164,34 +197,89 @@ class ProcessWatcher: # pylint: disable = too-many-instance-attributes
         self._output_handlers.remove(handler)
 
 
+    def pause_output(self) -> None:
+        """ Stop reading the process output, so that the process blocks on writing once the pipe buffer is full """
+
+        if self._output_resumed_event.is_set():
+            self._output_pause_time = self._get_time()
+            self._output_resumed_event.clear()
+
+
+    def resume_output(self) -> None:
+        # The output timeout does not count the time spent paused, since the process cannot write while the output is not read
+        if self._output_pause_time is not None:
+            if self._last_output_time is not None:
+                self._last_output_time += self._get_time() - self._output_pause_time
+            self._output_pause_time = None
+
+        self._output_resumed_event.set()
+
+
     async def _watch_stdout(self, stream: asyncio.StreamReader) -> None:
         while True:
+            if not self._output_resumed_event.is_set():
+                await self._output_resumed_event.wait()
+
             line_as_bytes = await stream.readline()
             if not line_as_bytes:
                 for handler in self._output_handlers:
                     handler.process_stdout_end()
                 break
 
-            self._last_output_time = time.time()
+            self._last_output_time = self._get_time()
             line = line_as_bytes.decode(self._options.encoding)
 
-            for handler in self._output_handlers:
-                handler.process_stdout_line(line)
+            if self._output_statistics is None:
+                for handler in self._output_handlers:
+                    handler.process_stdout_line(line)
+            else:
+                for handler in self._output_handlers:
+                    handler_start_time = time.perf_counter()
+                    handler.process_stdout_line(line)
+                    self._record_output_statistics(handler, "stdout", time.perf_counter() - handler_start_time)
 
 
     async def _watch_stderr(self, stream: asyncio.StreamReader) -> None:
         while True:
+            if not self._output_resumed_event.is_set():
+                await self._output_resumed_event.wait()
+
             line_as_bytes = await stream.readline()
             if not line_as_bytes:
                 for handler in self._output_handlers:
                     handler.process_stderr_end()
                 break
 
-            self._last_output_time = time.time()
+            self._last_output_time = self._get_time()
             line = line_as_bytes.decode(self._options.encoding)
 
-            for handler in self._output_handlers:
-                handler.process_stderr_line(line)
+            if self._output_statistics is None:
+                for handler in self._output_handlers:
+                    handler.process_stderr_line(line)
+            else:
+                for handler in self._output_handlers:
+                    handler_start_time = time.perf_counter()
+                    handler.process_stderr_line(line)
+                    self._record_output_statistics(handler, "stderr", time.perf_counter() - handler_start_time)
+
+
+    def _record_output_statistics(self, handler: ProcessOutputHandler, stream: str, duration: float) -> None:
+        if self._output_statistics is None:
+            return
+
+        key = (id(handler), stream)
+        statistics = self._output_statistics.get(key)
+        if statistics is None:
+            statistics = ProcessOutputStatistics(handler = type(handler).__name__, stream = stream)
+            self._output_statistics[key] = statistics
+
+        statistics.record(duration)
+
+
+    def _log_output_statistics(self) -> None:
+        for statistics in self.get_output_statistics() or []:
+            logger.debug("Output handler statistics (Executable: '%s', PID: %s, Handler: '%s', Stream: '%s', Calls: %s, Total: %.6fs, Max: %.6fs)",
+                self.executable, self.pid, statistics.handler, statistics.stream, statistics.call_count, statistics.cumulative_seconds, statistics.max_seconds)
 
 
     async def _watch_timeout(self) -> None:
@@ -208,7 +296,7 @@ class ProcessWatcher: # pylint: disable = too-many-instance-attributes
     def _check_timeouts(self) -> None:
 
         def check(start: float, timeout: datetime.timedelta, reason: str) -> None:
-            elapsed = datetime.timedelta(time.time() - start)
+            elapsed = datetime.timedelta(seconds = self._get_time() - start)
 
             if elapsed > timeout:
                 exception_message = "Subprocess timed out with reason %s" % reason
@@ -217,15 +305,15 @@ class ProcessWatcher: # pylint: disable = too-many-instance-attributes
 
         if self._options.run_timeout is not None and self._start_time is not None:
             check(self._start_time, self._options.run_timeout, "total runtime")
-        if self._options.output_timeout is not None and self._last_output_time is not None:
+        if self._options.output_timeout is not None and self._last_output_time is not None and self._output_pause_time is None:
             check(self._last_output_time, self._options.output_timeout, "no output")
 
 
-    async def _wait_tasks(self) -> None:
+    async def _wait_tasks(self, drain_output: bool = False) -> None:
 
-        async def _check_task(identifier: str, task: asyncio.Task) -> None:
+        async def _check_task(identifier: str, task: asyncio.Task, timeout: Optional[float]) -> None:
             try:
-                await asyncio.wait_for(task, 1)
+                await asyncio.wait_for(task, timeout)
             except asyncio.CancelledError:
                 pass
             except asyncio.TimeoutError:
@@ -244,11 +332,14 @@ class ProcessWatcher: # pylint: disable = too-many-instance-attributes
         if len(tasks_to_wait) == 0:
             return
 
-        await asyncio.wait(tasks_to_wait, timeout = 10, return_when = asyncio.ALL_COMPLETED)
+        # When draining, the output readers may be paused by a slow consumer, so they are waited for with no timeout rather than cancelled
+        output_timeout = None if drain_output else 1
+
+        await asyncio.wait(tasks_to_wait, timeout = None if drain_output else 10, return_when = asyncio.ALL_COMPLETED)
 
         if self._timeout_task is not None:
-            await _check_task("timeout", self._timeout_task)
+            await _check_task("timeout", self._timeout_task, 1)
         if self._stdout_task is not None:
-            await _check_task("stdout", self._stdout_task)
+            await _check_task("stdout", self._stdout_task, output_timeout)
         if self._stderr_task is not None:
-            await _check_task("stderr", self._stderr_task)
+            await _check_task("stderr", self._stderr_task, output_timeout)
@@ -0,0 +1,18 @@
+import dataclasses
+from typing import Optional
+
+
+@dataclasses.dataclass(frozen = True)
+class SystemPressure:
+    cpu_count: int
+    load_average: Optional[float]
+    cpu_pressure: Optional[float]
+    memory_pressure: Optional[float]
+    available_memory: Optional[int]
+
+
+    @property
+    def load_per_cpu(self) -> Optional[float]:
+        if self.load_average is None:
+            return None
+        return self.load_average / self.cpu_count
@@ -0,0 +1,83 @@
+import logging
+import os
+from typing import Optional
+
+from bhamon_development_toolkit.processes.system_pressure import SystemPressure
+
+
+logger = logging.getLogger("SystemPressure")
+
+
+class SystemPressureProbe:
+    """ Read system load signals, from the proc file system when available """
+
+
+    def __init__(self, proc_directory: str = "/proc") -> None:
+        self._proc_directory = proc_directory
+
+
+    def read(self) -> SystemPressure:
+        return SystemPressure(
+            cpu_count = self._read_cpu_count(),
+            load_average = self._read_load_average(),
+            cpu_pressure = self._read_pressure("cpu"),
+            memory_pressure = self._read_pressure("memory"),
+            available_memory = self._read_available_memory(),
+        )
+
+
+    def _read_cpu_count(self) -> int:
+        if hasattr(os, "sched_getaffinity"):
+            return len(os.sched_getaffinity(0)) # pylint: disable = no-member
+        return os.cpu_count() or 1
+
+
+    def _read_load_average(self) -> Optional[float]:
+        content = self._read_file(os.path.join(self._proc_directory, "loadavg"))
+        if content is not None:
+            return float(content.split()[0])
+
+        if hasattr(os, "getloadavg"):
+            return os.getloadavg()[0]
+
+        return None
+
+
+    def _read_pressure(self, resource: str) -> Optional[float]:
+        """ Read the 'some' average over 10 seconds from the pressure stall information, as a percentage """
+
+        content = self._read_file(os.path.join(self._proc_directory, "pressure", resource))
+        if content is None:
+            return None
+
+        for line in content.splitlines():
+            line_elements = line.split()
+            if len(line_elements) > 0 and line_elements[0] == "some":
+                for element in line_elements[1:]:
+                    key, value = element.split("=", 1)
+                    if key == "avg10":
+                        return float(value)
+
+        return None
+
+
+    def _read_available_memory(self) -> Optional[int]:
+        content = self._read_file(os.path.join(self._proc_directory, "meminfo"))
+        if content is None:
+            return None
+
+        for line in content.splitlines():
+            if line.startswith("MemAvailable:"):
+                line_elements = line.split()
+                multiplier = 1024 if len(line_elements) > 2 and line_elements[2] == "kB" else 1
+                return int(line_elements[1]) * multiplier
+
+        return None
+
+
+    def _read_file(self, file_path: str) -> Optional[str]:
+        try:
+            with open(file_path, mode = "r", encoding = "utf-8") as proc_file:
+                return proc_file.read()
+        except OSError:
+            return None
@@ -0,0 +1,33 @@
+import datetime
+from typing import Optional
+
+from bhamon_development_toolkit.asyncio_extensions import asyncio_helpers
+from bhamon_development_toolkit.revision_control.revision_control_client import RevisionControlClient
+
+
+class AsyncRevisionControlClient:
+    """ Async facade for a RevisionControlClient, running its operations with the blocking executor """
+
+
+    def __init__(self, client: RevisionControlClient) -> None:
+        self.client = client
+
+
+    async def get_current_revision(self) -> str:
+        return await asyncio_helpers.run_blocking(self.client.get_current_revision)
+
+
+    async def get_current_branch(self) -> Optional[str]:
+        return await asyncio_helpers.run_blocking(self.client.get_current_branch)
+
+
+    async def try_resolve_revision(self, reference: str) -> Optional[str]:
+        return await asyncio_helpers.run_blocking(self.client.try_resolve_revision, reference)
+
+
+    async def resolve_revision(self, reference: str) -> str:
+        return await asyncio_helpers.run_blocking(self.client.resolve_revision, reference)
+
+
+    async def get_revision_date(self, revision: str) -> datetime.datetime:
+        return await asyncio_helpers.run_blocking(self.client.get_revision_date, revision)
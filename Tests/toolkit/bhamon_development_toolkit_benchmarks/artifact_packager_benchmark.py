@@ -0,0 +1,77 @@
+""" Benchmark for packaging artifacts on a synthetic workspace, comparing worker counts and incremental packaging """
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from typing import List, Tuple
+
+from bhamon_development_toolkit.artifacts.artifact_packager import ArtifactPackager
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--file-count", type = int, default = 1000, help = "set the number of files in the synthetic workspace")
+    argument_parser.add_argument("--file-size", type = int, default = 1024 * 1024, help = "set the size of each file in the synthetic workspace")
+    argument_parser.add_argument("--workers", type = int, nargs = "+", default = [ 1, 2, 4, 8 ], help = "set the worker counts to measure")
+    argument_parser.add_argument("--workspace", help = "set the workspace directory, to reuse a synthetic workspace between runs")
+    arguments = argument_parser.parse_args()
+
+    workspace_directory = arguments.workspace if arguments.workspace is not None else tempfile.mkdtemp(prefix = "packager_benchmark_")
+    output_directory = tempfile.mkdtemp(prefix = "packager_benchmark_output_")
+
+    try:
+        if not os.path.exists(os.path.join(workspace_directory, "Files")):
+            print("Generating workspace with %s files of %s bytes in '%s'" % (arguments.file_count, arguments.file_size, workspace_directory))
+            generate_workspace(workspace_directory, arguments.file_count, arguments.file_size)
+
+        artifact_files = list_artifact_files(workspace_directory)
+        archive_path = os.path.join(output_directory, "artifact.zip")
+
+        for worker_count in arguments.workers:
+            start_time = time.perf_counter()
+            manifest = ArtifactPackager(max_workers = worker_count).package(archive_path, artifact_files)
+            print("Workers (%s): %s files in %.3fs" % (worker_count, len(manifest), time.perf_counter() - start_time))
+
+        modified_file_path = artifact_files[0][0]
+        with open(modified_file_path, mode = "ab") as modified_file:
+            modified_file.write(b"modified")
+
+        start_time = time.perf_counter()
+        packager = ArtifactPackager()
+        packager.package(archive_path + ".tmp", artifact_files, previous_archive_path = archive_path, previous_manifest = manifest)
+        print("Incremental: %s files in %.3fs (Reused: %s, Written: %s)"
+            % (len(artifact_files), time.perf_counter() - start_time, packager.reused_entry_count, packager.written_entry_count))
+
+        with open(modified_file_path, mode = "r+b") as modified_file:
+            modified_file.truncate(arguments.file_size)
+
+    finally:
+        shutil.rmtree(output_directory)
+        if arguments.workspace is None:
+            shutil.rmtree(workspace_directory)
+
+
+def generate_workspace(workspace_directory: str, file_count: int, file_size: int) -> None:
+    """ Generate files with text-like content, which compresses in a similar way as sources and resources """
+
+    all_words = [ b"artifact", b"package", b"fileset", b"workspace", b"0123456789", b"\n", b"    " ]
+    random_generator = random.Random(0)
+
+    os.makedirs(os.path.join(workspace_directory, "Files"))
+
+    for file_index in range(file_count):
+        content = b" ".join(random_generator.choice(all_words) for _ in range(file_size // 6))
+        with open(os.path.join(workspace_directory, "Files", "file_%05d.txt" % file_index), mode = "wb") as generated_file:
+            generated_file.write(content[:file_size])
+
+
+def list_artifact_files(workspace_directory: str) -> List[Tuple[str,str]]:
+    all_file_names = sorted(os.listdir(os.path.join(workspace_directory, "Files")))
+    return [ (os.path.join(workspace_directory, "Files", file_name), "Files/" + file_name) for file_name in all_file_names ]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+""" Benchmark for the startup and shutdown latency of AsyncioContext """
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+from bhamon_development_toolkit.asyncio_extensions import event_loop_factories
+from bhamon_development_toolkit.asyncio_extensions.asyncio_context import AsyncioContext
+from bhamon_development_toolkit.asyncio_extensions.event_loop_options import EventLoopOptions
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--iterations", type = int, default = 100, help = "set the number of runs to measure")
+    argument_parser.add_argument("--engine", choices = [ "auto", "asyncio", "uvloop" ], default = "asyncio", help = "set the event loop implementation")
+    arguments = argument_parser.parse_args()
+
+    options = EventLoopOptions(loop_factory = event_loop_factories.get_event_loop_factory(arguments.engine))
+    all_durations = measure_run_latency(arguments.iterations, options)
+
+    print("Engine: %s" % arguments.engine)
+    print("Iterations: %s" % len(all_durations))
+    print("Median: %.3fms" % (statistics.median(all_durations) * 1000))
+    print("Max: %.3fms" % (max(all_durations) * 1000))
+
+
+def measure_run_latency(iterations: int, options: EventLoopOptions) -> List[float]:
+    """ Measure the time to run a trivial coroutine through AsyncioContext, from startup to shutdown """
+
+    async def run_coroutine() -> None:
+        await asyncio.sleep(0)
+
+    all_durations: List[float] = []
+
+    for _ in range(iterations):
+        start_time = time.perf_counter()
+        AsyncioContext(options).run(run_coroutine())
+        all_durations.append(time.perf_counter() - start_time)
+
+    return all_durations
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+""" Benchmark for resolving filesets on a synthetic workspace, comparing FilesetResolver with a glob call per pattern, and with a FilesetCache """
+
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+import time
+from typing import List
+
+from bhamon_development_toolkit.artifacts import filesets
+from bhamon_development_toolkit.artifacts.fileset_cache import FilesetCache
+
+
+all_file_patterns = [ "Sources/**/*.py", "Sources/**/*.json", "Resources/**/*.png", "Documentation/*.md", "*.txt" ]
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--file-count", type = int, default = 1000 * 1000, help = "set the number of files in the synthetic workspace")
+    argument_parser.add_argument("--files-per-directory", type = int, default = 100, help = "set the number of files in each directory")
+    argument_parser.add_argument("--workspace", help = "set the workspace directory, to reuse a synthetic workspace between runs")
+    arguments = argument_parser.parse_args()
+
+    workspace_directory = arguments.workspace if arguments.workspace is not None else tempfile.mkdtemp(prefix = "fileset_benchmark_")
+
+    try:
+        if not os.path.exists(os.path.join(workspace_directory, "Sources")):
+            print("Generating workspace with %s files in '%s'" % (arguments.file_count, workspace_directory))
+            generate_workspace(workspace_directory, arguments.file_count, arguments.files_per_directory)
+
+        fileset = { "path_in_workspace": workspace_directory, "file_patterns": all_file_patterns }
+
+        start_time = time.perf_counter()
+        files_with_glob = load_fileset_with_glob(fileset)
+        print("Glob: %s files in %.3fs" % (len(files_with_glob), time.perf_counter() - start_time))
+
+        start_time = time.perf_counter()
+        files_with_resolver = filesets.load_fileset(fileset, {})
+        print("FilesetResolver: %s files in %.3fs" % (len(files_with_resolver), time.perf_counter() - start_time))
+
+        if sorted(set(files_with_glob)) != files_with_resolver:
+            raise RuntimeError("Results are different")
+
+        measure_cache(workspace_directory, fileset, files_with_resolver)
+
+    finally:
+        if arguments.workspace is None:
+            shutil.rmtree(workspace_directory)
+
+
+def measure_cache(workspace_directory: str, fileset: dict, expected_files: List[str]) -> None:
+    cache_file_path = os.path.join(tempfile.mkdtemp(prefix = "fileset_benchmark_cache_"), "filesets.json")
+
+    # Directories modified too recently are never cached, so make them old enough for this run
+    old_time = time.time() - 60
+    for directory, _, _ in os.walk(workspace_directory):
+        os.utime(directory, (old_time, old_time))
+
+    try:
+        for step in [ "Cold", "Unchanged", "Modified" ]:
+            if step == "Modified":
+                modified_file_path = os.path.join(workspace_directory, "Sources", "group_000", "directory_00000", "file_modified.py")
+                with open(modified_file_path, mode = "wb"):
+                    pass
+                expected_files = sorted(expected_files + [ modified_file_path.replace("\\", "/") ])
+
+            start_time = time.perf_counter()
+            with FilesetCache(cache_file_path) as fileset_cache:
+                files_with_cache = filesets.load_fileset(fileset, {}, fileset_cache = fileset_cache)
+            print("FilesetCache (%s): %s files in %.3fs (Scanned: %s, Reused: %s)"
+                % (step, len(files_with_cache), time.perf_counter() - start_time, fileset_cache.scanned_directory_count, fileset_cache.reused_directory_count))
+
+            if files_with_cache != expected_files:
+                raise RuntimeError("Results are different")
+
+        os.remove(modified_file_path)
+
+    finally:
+        shutil.rmtree(os.path.dirname(cache_file_path))
+
+
+def generate_workspace(workspace_directory: str, file_count: int, files_per_directory: int) -> None:
+    all_extensions = [ ".py", ".json", ".png", ".md", ".txt", ".obj" ]
+    all_roots = [ "Sources", "Resources", "Build", "Documentation" ]
+
+    for directory_index in range((file_count + files_per_directory - 1) // files_per_directory):
+        root = all_roots[directory_index % len(all_roots)]
+        directory = os.path.join(workspace_directory, root, "group_%03d" % (directory_index // 100), "directory_%05d" % directory_index)
+        os.makedirs(directory)
+
+        for file_index in range(min(files_per_directory, file_count - directory_index * files_per_directory)):
+            with open(os.path.join(directory, "file_%05d%s" % (file_index, all_extensions[file_index % len(all_extensions)])), mode = "wb"):
+                pass
+
+
+def load_fileset_with_glob(fileset: dict) -> List[str]:
+    matched_files: List[str] = []
+    for file_pattern in fileset["file_patterns"]:
+        matched_files += glob.glob(os.path.join(fileset["path_in_workspace"], file_pattern), recursive = True)
+    return sorted(file_path.replace("\\", "/") for file_path in matched_files if os.path.isfile(file_path))
+
+
+if __name__ == "__main__":
+    main()
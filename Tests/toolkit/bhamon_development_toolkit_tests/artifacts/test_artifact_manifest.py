@@ -0,0 +1,40 @@
+""" Unit tests for ArtifactManifest """
+
+import os
+
+from bhamon_development_toolkit.artifacts.artifact_manifest import ArtifactManifest
+from bhamon_development_toolkit.artifacts.artifact_manifest_entry import ArtifactManifestEntry
+
+
+def test_compare():
+    old_manifest = ArtifactManifest(all_entries = [
+        ArtifactManifestEntry("same.txt", 4, 0o100644, "hash_same"),
+        ArtifactManifestEntry("modified.txt", 4, 0o100644, "hash_old"),
+        ArtifactManifestEntry("mode.sh", 4, 0o100644, "hash_mode"),
+        ArtifactManifestEntry("removed.txt", 4, 0o100644, "hash_removed"),
+    ])
+
+    new_manifest = ArtifactManifest(all_entries = [
+        ArtifactManifestEntry("same.txt", 4, 0o100644, "hash_same"),
+        ArtifactManifestEntry("modified.txt", 4, 0o100644, "hash_new"),
+        ArtifactManifestEntry("mode.sh", 4, 0o100755, "hash_mode"),
+        ArtifactManifestEntry("added.txt", 4, 0o100644, "hash_added"),
+    ])
+
+    comparison = old_manifest.compare(new_manifest)
+
+    assert comparison.added_files == [ "added.txt" ]
+    assert comparison.removed_files == [ "removed.txt" ]
+    assert comparison.modified_files == [ "mode.sh", "modified.txt" ]
+    assert not comparison.is_identical
+    assert new_manifest.compare(new_manifest).is_identical
+
+
+def test_save_and_load(tmpdir):
+    manifest = ArtifactManifest(all_entries = [ ArtifactManifestEntry("directory/file.txt", 4, 0o100644, "hash") ])
+    manifest.save(os.path.join(tmpdir, "manifest.json"))
+
+    loaded_manifest = ArtifactManifest.load(os.path.join(tmpdir, "manifest.json"))
+
+    assert loaded_manifest.hash_algorithm == "sha256"
+    assert list(loaded_manifest) == list(manifest)
@@ -0,0 +1,49 @@
+""" Unit tests for ArtifactMapping """
+
+from bhamon_development_toolkit.artifacts.artifact_mapping import ArtifactMapping
+
+
+def test_iterate():
+    all_mappings = [
+        ("workspace/b.txt", "b.txt"),
+        ("workspace/directory/a.txt", "archive/directory/a.txt"),
+        ("workspace/a.txt", "archive/a.txt"),
+        ("/root.txt", "root.txt"),
+    ]
+
+    artifact_mapping = ArtifactMapping(all_mappings)
+
+    assert len(artifact_mapping) == 4
+    assert list(artifact_mapping) == [ all_mappings[2], all_mappings[1], all_mappings[0], all_mappings[3] ]
+    assert artifact_mapping[0] == ("workspace/a.txt", "archive/a.txt")
+    assert list(artifact_mapping.sources()) == [ "workspace/a.txt", "workspace/directory/a.txt", "workspace/b.txt", "/root.txt" ]
+    assert list(artifact_mapping.destinations()) == [ "archive/a.txt", "archive/directory/a.txt", "b.txt", "root.txt" ]
+
+
+def test_sort_by_path():
+    all_mappings = [
+        ("a/c", "a/c"),
+        ("a/b/x", "a/b/x"),
+        ("a/a", "a/a"),
+        ("a.txt", "a.txt"),
+    ]
+
+    artifact_mapping = ArtifactMapping(all_mappings)
+
+    assert list(artifact_mapping.destinations()) == sorted(destination for source, destination in all_mappings)
+    assert list(artifact_mapping.destinations()) == [ "a.txt", "a/a", "a/b/x", "a/c" ]
+
+
+def test_merge():
+    artifact_mapping = ArtifactMapping([
+        ("first/file.txt", "file.txt"),
+        ("second/file.txt", "file.txt"),
+        ("first/file.txt", "file.txt"),
+        ("first/other.txt", "other.txt"),
+        ("first/other.txt", "other.txt"),
+    ])
+
+    all_groups = artifact_mapping.merge()
+
+    assert all_groups == [ ("file.txt", [ "first/file.txt", "second/file.txt" ]) ]
+    assert list(artifact_mapping) == [ ("first/file.txt", "file.txt"), ("first/other.txt", "other.txt") ]
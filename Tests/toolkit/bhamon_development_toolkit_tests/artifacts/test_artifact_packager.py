@@ -0,0 +1,147 @@
+""" Unit tests for ArtifactPackager """
+
+import os
+import zipfile
+
+import pytest
+
+from bhamon_development_toolkit.artifacts.artifact_packager import ArtifactPackager
+from bhamon_development_toolkit.artifacts.compression_policy import CompressionPolicy
+from bhamon_development_toolkit.artifacts.file_hash_cache import FileHashCache
+
+
+def write_file(file_path, content):
+    with open(file_path, mode = "w", encoding = "utf-8") as test_file:
+        test_file.write(content)
+
+
+def test_package_incremental(tmpdir):
+    all_file_paths = [ os.path.join(tmpdir, "first.txt"), os.path.join(tmpdir, "second.txt") ]
+    for file_path in all_file_paths:
+        write_file(file_path, os.path.basename(file_path) * 100)
+
+    artifact_files = [ (file_path, os.path.basename(file_path)) for file_path in all_file_paths ]
+    first_manifest = ArtifactPackager().package(os.path.join(tmpdir, "first.zip"), artifact_files)
+
+    write_file(all_file_paths[1], "modified")
+
+    packager = ArtifactPackager()
+    second_manifest = packager.package(os.path.join(tmpdir, "second.zip"), artifact_files,
+        previous_archive_path = os.path.join(tmpdir, "first.zip"), previous_manifest = first_manifest)
+
+    assert packager.reused_entry_count == 1
+    assert packager.written_entry_count == 1
+    assert second_manifest.get("first.txt") == first_manifest.get("first.txt")
+
+    with zipfile.ZipFile(os.path.join(tmpdir, "second.zip")) as archive_file:
+        assert archive_file.testzip() is None
+        assert archive_file.read("first.txt") == b"first.txt" * 100
+        assert archive_file.read("second.txt") == b"modified"
+
+
+def test_package_incremental_with_hashes(tmpdir):
+    file_path = os.path.join(tmpdir, "file.txt")
+    write_file(file_path, "content")
+
+    artifact_files = [ (file_path, "file.txt") ]
+    manifest = ArtifactPackager().package(os.path.join(tmpdir, "first.zip"), artifact_files)
+
+    # Same size and timestamp, so only the content hash shows the modification
+    file_status = os.stat(file_path)
+    write_file(file_path, "changed")
+    os.utime(file_path, ns = (file_status.st_atime_ns, file_status.st_mtime_ns))
+
+    packager = ArtifactPackager()
+    packager.package(os.path.join(tmpdir, "second.zip"), artifact_files,
+        previous_archive_path = os.path.join(tmpdir, "first.zip"), previous_manifest = manifest, file_hash_cache = FileHashCache())
+
+    assert packager.reused_entry_count == 0
+
+    with zipfile.ZipFile(os.path.join(tmpdir, "second.zip")) as archive_file:
+        assert archive_file.read("file.txt") == b"changed"
+
+
+def test_package_incremental_with_same_timestamp(tmpdir):
+    file_path = os.path.join(tmpdir, "file.txt")
+    write_file(file_path, "version=1\n")
+
+    artifact_files = [ (file_path, "file.txt") ]
+    manifest = ArtifactPackager().package(os.path.join(tmpdir, "first.zip"), artifact_files)
+
+    # Modified with the same size in the same second, and without a file hash cache
+    file_status = os.stat(file_path)
+    write_file(file_path, "version=2\n")
+    os.utime(file_path, ns = (file_status.st_atime_ns, file_status.st_mtime_ns))
+
+    packager = ArtifactPackager()
+    packager.package(os.path.join(tmpdir, "second.zip"), artifact_files,
+        previous_archive_path = os.path.join(tmpdir, "first.zip"), previous_manifest = manifest)
+
+    assert packager.reused_entry_count == 0
+
+    with zipfile.ZipFile(os.path.join(tmpdir, "second.zip")) as archive_file:
+        assert archive_file.read("file.txt") == b"version=2\n"
+
+
+def test_package_incremental_with_other_compression(tmpdir):
+    file_path = os.path.join(tmpdir, "file.txt")
+    write_file(file_path, "content")
+
+    artifact_files = [ (file_path, "file.txt") ]
+    ArtifactPackager(zipfile.ZIP_STORED).package(os.path.join(tmpdir, "first.zip"), artifact_files)
+
+    packager = ArtifactPackager(zipfile.ZIP_DEFLATED)
+    packager.package(os.path.join(tmpdir, "second.zip"), artifact_files, previous_archive_path = os.path.join(tmpdir, "first.zip"))
+
+    assert packager.reused_entry_count == 0
+
+    with zipfile.ZipFile(os.path.join(tmpdir, "second.zip")) as archive_file:
+        assert archive_file.getinfo("file.txt").compress_type == zipfile.ZIP_DEFLATED
+
+
+@pytest.mark.parametrize("compression", [ zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA ])
+def test_package_parallel(tmpdir, compression):
+    all_file_paths = [ os.path.join(tmpdir, "file_%02d.txt" % index) for index in range(20) ]
+    for index, file_path in enumerate(all_file_paths):
+        write_file(file_path, "content %s\n" % index * 1000 * index)
+
+    artifact_files = [ (file_path, os.path.basename(file_path)) for file_path in all_file_paths ]
+    first_manifest = ArtifactPackager(compression).package(os.path.join(tmpdir, "sequential.zip"), artifact_files)
+    second_manifest = ArtifactPackager(compression, max_workers = 4).package(os.path.join(tmpdir, "parallel.zip"), artifact_files)
+
+    assert list(second_manifest) == list(first_manifest)
+
+    with zipfile.ZipFile(os.path.join(tmpdir, "sequential.zip")) as first_archive:
+        with zipfile.ZipFile(os.path.join(tmpdir, "parallel.zip")) as second_archive:
+            assert second_archive.testzip() is None
+            assert second_archive.namelist() == first_archive.namelist()
+
+            for first_info, second_info in zip(first_archive.infolist(), second_archive.infolist()):
+                assert second_info.compress_type == first_info.compress_type
+                assert second_info.CRC == first_info.CRC
+                assert second_info.file_size == first_info.file_size
+                assert second_archive.read(second_info) == first_archive.read(first_info)
+
+
+@pytest.mark.parametrize("max_workers", [ 1, 4 ])
+def test_package_with_compression_policy(tmpdir, max_workers):
+    write_file(os.path.join(tmpdir, "image.png"), "image" * 100)
+    write_file(os.path.join(tmpdir, "small.txt"), "small")
+    write_file(os.path.join(tmpdir, "large.txt"), "large" * 100)
+
+    artifact_files = [ (os.path.join(tmpdir, file_name), file_name) for file_name in [ "image.png", "large.txt", "small.txt" ] ]
+    policy = CompressionPolicy(zipfile.ZIP_DEFLATED, compression_level = 9, rules = [ ("*.png", zipfile.ZIP_STORED) ], minimum_size = 64)
+
+    packager = ArtifactPackager(max_workers = max_workers, compression_policy = policy)
+    packager.package(os.path.join(tmpdir, "artifact.zip"), artifact_files)
+
+    assert packager.compression_decisions == { "rule": 1, "size": 1, "default": 1 }
+    assert packager.total_file_size == 1005
+    assert packager.total_compress_size < packager.total_file_size
+
+    with zipfile.ZipFile(os.path.join(tmpdir, "artifact.zip")) as archive_file:
+        assert archive_file.testzip() is None
+        assert archive_file.getinfo("image.png").compress_type == zipfile.ZIP_STORED
+        assert archive_file.getinfo("small.txt").compress_type == zipfile.ZIP_STORED
+        assert archive_file.getinfo("large.txt").compress_type == zipfile.ZIP_DEFLATED
+        assert archive_file.read("large.txt") == b"large" * 100
@@ -0,0 +1,56 @@
+""" Unit tests for CompressionPolicy """
+
+import os
+import zipfile
+
+from bhamon_development_toolkit.artifacts.compression_policy import CompressionPolicy
+
+
+def write_file(file_path, content):
+    with open(file_path, mode = "wb") as test_file:
+        test_file.write(content)
+
+
+def test_select_with_rules(tmpdir):
+    file_path = os.path.join(tmpdir, "file")
+    write_file(file_path, b"content" * 100)
+
+    policy = CompressionPolicy(zipfile.ZIP_DEFLATED, rules = [ ("*.png", zipfile.ZIP_STORED), ("Data/*", zipfile.ZIP_LZMA) ])
+
+    assert policy.select("Images/image.png", file_path, 700) == (zipfile.ZIP_STORED, "rule")
+    assert policy.select("Images/IMAGE.PNG", file_path, 700) == (zipfile.ZIP_STORED, "rule")
+    assert policy.select("Data/values.bin", file_path, 700) == (zipfile.ZIP_LZMA, "rule")
+    assert policy.select("Sources/main.py", file_path, 700) == (zipfile.ZIP_DEFLATED, "default")
+
+
+def test_select_with_minimum_size(tmpdir):
+    file_path = os.path.join(tmpdir, "file")
+    write_file(file_path, b"content")
+
+    policy = CompressionPolicy(zipfile.ZIP_DEFLATED, minimum_size = 64)
+
+    assert policy.select("file", file_path, 7) == (zipfile.ZIP_STORED, "size")
+    assert policy.select("file", file_path, 64) == (zipfile.ZIP_DEFLATED, "default")
+
+
+def test_select_with_sample(tmpdir):
+    compressible_file_path = os.path.join(tmpdir, "compressible")
+    write_file(compressible_file_path, b"content" * 10000)
+    incompressible_file_path = os.path.join(tmpdir, "incompressible")
+    write_file(incompressible_file_path, os.urandom(70000))
+
+    policy = CompressionPolicy(zipfile.ZIP_DEFLATED, sample_size = 16 * 1024)
+
+    assert policy.select("compressible", compressible_file_path, 70000) == (zipfile.ZIP_DEFLATED, "default")
+    assert policy.select("incompressible", incompressible_file_path, 70000) == (zipfile.ZIP_STORED, "sample")
+
+
+def test_create_default(tmpdir):
+    file_path = os.path.join(tmpdir, "file")
+    write_file(file_path, b"content" * 100)
+
+    policy = CompressionPolicy.create_default()
+
+    assert policy.select("package.whl", file_path, 700) == (zipfile.ZIP_STORED, "rule")
+    assert policy.select("archive.tar.gz", file_path, 700) == (zipfile.ZIP_STORED, "rule")
+    assert policy.select("main.py", file_path, 700) == (zipfile.ZIP_DEFLATED, "default")
@@ -0,0 +1,67 @@
+""" Unit tests for FileHashCache """
+
+import hashlib
+import os
+import time
+
+from bhamon_development_toolkit.artifacts.file_hash_cache import FileHashCache
+
+
+def write_file(file_path, content):
+    with open(file_path, mode = "w", encoding = "utf-8") as test_file:
+        test_file.write(content)
+
+    # Move the modification time to the past, so that the cache does not consider the file as modified too recently
+    old_time = time.time() - 60
+    os.utime(file_path, (old_time, old_time))
+
+
+def test_get_hashes(tmpdir):
+    first_file_path = os.path.join(tmpdir, "first.txt")
+    second_file_path = os.path.join(tmpdir, "second.txt")
+    write_file(first_file_path, "first")
+    write_file(second_file_path, "second")
+
+    file_hash_cache = FileHashCache()
+    all_hashes = file_hash_cache.get_hashes([ first_file_path, second_file_path, first_file_path ])
+
+    assert all_hashes == {
+        first_file_path: hashlib.sha256(b"first").hexdigest(),
+        second_file_path: hashlib.sha256(b"second").hexdigest(),
+    }
+
+    assert file_hash_cache.computed_hash_count == 2
+    assert file_hash_cache.reused_hash_count == 0
+
+
+def test_get_hashes_with_cache(tmpdir):
+    file_path = os.path.join(tmpdir, "file.txt")
+    write_file(file_path, "first")
+
+    file_hash_cache = FileHashCache()
+    file_hash_cache.get_hashes([ file_path ])
+    file_hash_cache.get_hashes([ file_path ])
+
+    assert file_hash_cache.computed_hash_count == 1
+    assert file_hash_cache.reused_hash_count == 1
+
+    write_file(file_path, "modified")
+
+    assert file_hash_cache.get_hashes([ file_path ]) == { file_path: hashlib.sha256(b"modified").hexdigest() }
+    assert file_hash_cache.computed_hash_count == 2
+
+
+def test_save_and_load(tmpdir):
+    file_path = os.path.join(tmpdir, "file.txt")
+    cache_file_path = os.path.join(tmpdir, "cache", "hashes.json")
+    write_file(file_path, "first")
+
+    with FileHashCache(cache_file_path) as file_hash_cache:
+        first_hashes = file_hash_cache.get_hashes([ file_path ])
+
+    with FileHashCache(cache_file_path) as file_hash_cache:
+        second_hashes = file_hash_cache.get_hashes([ file_path ])
+
+        assert second_hashes == first_hashes
+        assert file_hash_cache.computed_hash_count == 0
+        assert file_hash_cache.reused_hash_count == 1
@@ -0,0 +1,29 @@
+""" Unit tests for FileStatusChecker """
+
+import os
+
+from bhamon_development_toolkit.artifacts.file_status_checker import FileStatusChecker
+
+
+def test_check(tmpdir):
+    os.makedirs(os.path.join(tmpdir, "directory"))
+    with open(os.path.join(tmpdir, "directory", "file.txt"), mode = "w", encoding = "utf-8") as test_file:
+        test_file.write("content")
+
+    file_path = os.path.join(tmpdir, "directory", "file.txt")
+    missing_file_path = os.path.join(tmpdir, "directory", "missing.txt")
+    missing_directory_file_path = os.path.join(tmpdir, "missing", "file.txt")
+    directory_path = os.path.join(tmpdir, "directory")
+
+    all_statuses = FileStatusChecker(max_workers = 2).check([ file_path, missing_file_path, missing_directory_file_path, directory_path ])
+
+    assert all_statuses[file_path].exists
+    assert all_statuses[file_path].is_file
+    assert all_statuses[file_path].size == 7
+    assert all_statuses[file_path].modification_time == os.path.getmtime(file_path)
+
+    assert not all_statuses[missing_file_path].exists
+    assert not all_statuses[missing_directory_file_path].exists
+
+    assert all_statuses[directory_path].exists
+    assert not all_statuses[directory_path].is_file
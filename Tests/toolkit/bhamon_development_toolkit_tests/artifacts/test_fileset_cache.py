@@ -0,0 +1,125 @@
+""" Unit tests for FilesetCache """
+
+import os
+import time
+
+import pytest
+
+from bhamon_development_toolkit.artifacts.fileset_cache import FilesetCache
+from bhamon_development_toolkit.artifacts.fileset_resolver import FilesetResolver
+
+
+all_test_files = [
+    "readme.md",
+    "Sources/main.py",
+    "Sources/package/module.py",
+    "Sources/package/nested/deep.py",
+    "Tests/test_main.py",
+]
+
+
+@pytest.fixture(name = "workspace")
+def workspace_fixture(tmpdir):
+    for file_path in all_test_files:
+        os.makedirs(os.path.join(tmpdir, os.path.dirname(file_path)), exist_ok = True)
+        with open(os.path.join(tmpdir, file_path), mode = "w", encoding = "utf-8") as test_file:
+            test_file.write(file_path)
+
+    make_directories_old(str(tmpdir))
+    return str(tmpdir).replace("\\", "/")
+
+
+def make_directories_old(workspace):
+    """ Move directory modification times to the past, so that the cache does not consider them as modified too recently """
+
+    old_time = time.time() - 60
+    for directory, _, _ in os.walk(workspace):
+        os.utime(directory, (old_time, old_time))
+
+
+def resolve(workspace, fileset_cache):
+    resolver = FilesetResolver(fileset_cache)
+    resolver.add_pattern("sources", workspace, "Sources/**/*.py")
+    resolver.add_pattern("root", workspace, "*.md")
+    return resolver.resolve()
+
+
+def test_resolve_unchanged(workspace):
+    fileset_cache = FilesetCache()
+
+    first_results = resolve(workspace, fileset_cache)
+    assert fileset_cache.reused_walk_count == 0
+    assert fileset_cache.scanned_directory_count == 4
+
+    second_results = resolve(workspace, fileset_cache)
+    assert second_results == first_results
+    assert fileset_cache.reused_walk_count == 1
+    assert fileset_cache.scanned_directory_count == 4
+
+
+def test_resolve_modified(workspace):
+    fileset_cache = FilesetCache()
+    resolve(workspace, fileset_cache)
+
+    with open(os.path.join(workspace, "Sources", "package", "added.py"), mode = "w", encoding = "utf-8"):
+        pass
+
+    all_results = resolve(workspace, fileset_cache)
+
+    assert all_results == resolve(workspace, None)
+    assert workspace + "/Sources/package/added.py" in all_results["sources"]
+    assert fileset_cache.reused_walk_count == 0
+    assert fileset_cache.reused_directory_count == 3
+    assert fileset_cache.scanned_directory_count == 5
+
+
+def test_resolve_recently_modified(workspace):
+    fileset_cache = FilesetCache()
+
+    os.utime(os.path.join(workspace, "Sources"))
+
+    resolve(workspace, fileset_cache)
+    resolve(workspace, fileset_cache)
+
+    assert fileset_cache.reused_walk_count == 0
+    assert fileset_cache.reused_directory_count == 3
+    assert fileset_cache.scanned_directory_count == 5
+
+
+def test_resolve_missing_directory(workspace):
+    fileset_cache = FilesetCache()
+
+    resolver = FilesetResolver(fileset_cache)
+    resolver.add_pattern("fileset", workspace + "/Build", "**")
+    assert resolver.resolve() == { "fileset": [] }
+
+    os.makedirs(os.path.join(workspace, "Build"))
+    with open(os.path.join(workspace, "Build", "output.bin"), mode = "w", encoding = "utf-8"):
+        pass
+
+    assert resolver.resolve() == { "fileset": [ workspace + "/Build/output.bin" ] }
+
+
+def test_save_and_load(workspace, tmp_path_factory):
+    cache_file_path = os.path.join(tmp_path_factory.mktemp("cache"), "filesets.json")
+
+    with FilesetCache(cache_file_path) as fileset_cache:
+        first_results = resolve(workspace, fileset_cache)
+
+    with FilesetCache(cache_file_path) as fileset_cache:
+        second_results = resolve(workspace, fileset_cache)
+
+        assert second_results == first_results
+        assert fileset_cache.reused_walk_count == 1
+        assert fileset_cache.scanned_directory_count == 0
+
+
+def test_load_invalid(tmpdir):
+    cache_file_path = os.path.join(tmpdir, "filesets.json")
+    with open(cache_file_path, mode = "w", encoding = "utf-8") as cache_file:
+        cache_file.write("{ invalid")
+
+    fileset_cache = FilesetCache(cache_file_path)
+    fileset_cache.load()
+
+    assert fileset_cache.get_walk_results("walk") is None
@@ -0,0 +1,104 @@
+""" Unit tests for FilesetResolver """
+
+import glob
+import os
+
+import pytest
+
+from bhamon_development_toolkit.artifacts.fileset_resolver import FilesetResolver
+
+
+all_test_files = [
+    "readme.md",
+    "setup.py",
+    "x",
+    ".hidden",
+    "Sources/main.py",
+    "Sources/helpers.py",
+    "Sources/data.json",
+    "Sources/.cache/cached.py",
+    "Sources/package/__init__.py",
+    "Sources/package/module.py",
+    "Sources/package/nested/deep.py",
+    "Tests/test_main.py",
+    "Tests/Data/sample.txt",
+    "Tests/Data/notes.txt/a",
+]
+
+
+@pytest.fixture(name = "workspace")
+def workspace_fixture(tmpdir):
+    for file_path in all_test_files:
+        os.makedirs(os.path.join(tmpdir, os.path.dirname(file_path)), exist_ok = True)
+        with open(os.path.join(tmpdir, file_path), mode = "w", encoding = "utf-8") as test_file:
+            test_file.write(file_path)
+
+    return str(tmpdir).replace("\\", "/")
+
+
+def list_files_with_glob(path_in_workspace, file_pattern):
+    all_files = glob.glob(os.path.join(path_in_workspace, file_pattern), recursive = True)
+    return sorted(file_path.replace("\\", "/") for file_path in all_files if os.path.isfile(file_path))
+
+
+@pytest.mark.parametrize("file_pattern", [
+    "*",
+    "*.md",
+    "**",
+    "**/*.py",
+    "Sources/*.py",
+    "Sources/**/*.py",
+    "Sources/**",
+    "Sources/package/*",
+    "Sources/.cache/*.py",
+    "Sources/.*/*.py",
+    "Sources/?ain.py",
+    "Sources/[dm]*",
+    "Sources/main.py",
+    "Sources/missing.py",
+    "Sources/package/../*.py",
+    "*/Data/*.txt",
+    "*/**",
+    "?/**",
+    "*.py/**",
+    "Sources/*/**",
+    "**/*.txt/[ab]/**",
+])
+def test_resolve_like_glob(workspace, file_pattern):
+    resolver = FilesetResolver()
+    resolver.add_pattern("fileset", workspace, file_pattern)
+
+    assert resolver.resolve().get("fileset", []) == list_files_with_glob(workspace, file_pattern)
+
+
+def test_resolve_several_patterns(workspace):
+    resolver = FilesetResolver()
+    resolver.add_pattern("sources", workspace, "Sources/**/*.py")
+    resolver.add_pattern("sources", workspace, "Sources/package/*.py")
+    resolver.add_pattern("tests", workspace + "/Tests", "**/*")
+    resolver.add_pattern("root", workspace, "*.md")
+
+    all_results = resolver.resolve()
+
+    assert all_results["sources"] == list_files_with_glob(workspace, "Sources/**/*.py")
+    assert all_results["tests"] == list_files_with_glob(workspace + "/Tests", "**/*")
+    assert all_results["root"] == list_files_with_glob(workspace, "*.md")
+
+
+def test_resolve_relative_path(workspace):
+    current_directory = os.getcwd()
+    os.chdir(workspace)
+
+    try:
+        resolver = FilesetResolver()
+        resolver.add_pattern("sources", "Sources", "*.py")
+        resolver.add_pattern("root", "", "*")
+        resolver.add_pattern("dot", ".", "Tests/*.py")
+
+        all_results = resolver.resolve()
+
+        assert all_results["sources"] == [ "Sources/helpers.py", "Sources/main.py" ]
+        assert all_results["root"] == [ "readme.md", "setup.py", "x" ]
+        assert all_results["dot"] == [ "./Tests/test_main.py" ]
+    finally:
+        os.chdir(current_directory)
@@ -0,0 +1,90 @@
+""" Unit tests for filesets """
+
+import json
+import logging
+import os
+
+import pytest
+
+from bhamon_development_toolkit.artifacts import filesets
+from bhamon_development_toolkit.artifacts.artifact_plan import ArtifactPlan
+
+
+def write_file(file_path, content):
+    with open(file_path, mode = "w", encoding = "utf-8") as test_file:
+        test_file.write(content)
+
+
+def test_merge_mappings(tmpdir):
+    first_file_path = os.path.join(tmpdir, "first.txt")
+    second_file_path = os.path.join(tmpdir, "second.txt")
+    write_file(first_file_path, "content")
+    write_file(second_file_path, "content")
+
+    artifact_files = [ (first_file_path, "file.txt"), (second_file_path, "file.txt"), (first_file_path, "other.txt") ]
+
+    assert filesets.merge_mappings(artifact_files) == [ (first_file_path, "file.txt"), (first_file_path, "other.txt") ]
+
+
+def test_merge_mappings_with_conflicts(tmpdir, caplog):
+    all_file_paths = [ os.path.join(tmpdir, "file_%s.txt" % index) for index in range(4) ]
+    write_file(all_file_paths[0], "content")
+    write_file(all_file_paths[1], "content")
+    write_file(all_file_paths[2], "changed")
+    write_file(all_file_paths[3], "longer content")
+
+    artifact_files = [ (file_path, "file.txt") for file_path in all_file_paths ]
+    artifact_files += [ (all_file_paths[0], "same_size.txt"), (all_file_paths[2], "same_size.txt") ]
+
+    with caplog.at_level(logging.ERROR, logger = "Artifact"):
+        with pytest.raises(ValueError):
+            filesets.merge_mappings(artifact_files)
+
+    assert caplog.messages == [
+        "Mapping conflict: %s => file.txt" % ", ".join(all_file_paths),
+        "Mapping conflict: %s, %s => same_size.txt" % (all_file_paths[0], all_file_paths[2]),
+    ]
+
+
+def test_load_fileset_with_duplicates(tmpdir):
+    workspace = str(tmpdir).replace("\\", "/")
+    write_file(os.path.join(workspace, "main.py"), "main")
+    write_file(os.path.join(workspace, "helpers.py"), "helpers")
+
+    fileset = { "path_in_workspace": "{workspace}", "file_paths": [ "main.py" ], "file_patterns": [ "*.py", "main.*" ] }
+
+    assert filesets.load_fileset(fileset, { "workspace": workspace }) == [ workspace + "/helpers.py", workspace + "/main.py" ]
+
+
+def test_resolve_artifact(tmpdir):
+    workspace = str(tmpdir).replace("\\", "/")
+    os.makedirs(os.path.join(workspace, "Sources", "package"))
+    write_file(os.path.join(workspace, "Sources", "main.py"), "main")
+    write_file(os.path.join(workspace, "Sources", "package", "module.py"), "module")
+    write_file(os.path.join(workspace, "readme.md"), "readme")
+
+    all_filesets = {
+        "sources": { "path_in_workspace": "{workspace}/Sources", "file_patterns": [ "**/*.{extension}" ] },
+        "readme": { "path_in_workspace": "{workspace}", "file_paths": [ "readme.md" ] },
+    }
+
+    artifact = {
+        "filesets": [
+            { "identifier": "sources", "path_in_archive": "Program", "parameters": { "extension": "py" } },
+            { "identifier": "readme" },
+        ],
+    }
+
+    artifact_plan = filesets.compile_artifact(artifact, all_filesets.get, { "workspace": workspace })
+    assert not artifact_plan.is_resolved
+    assert artifact_plan.all_filesets[0].file_patterns == ("**/*.py",)
+
+    artifact_plan = ArtifactPlan.from_dict(json.loads(json.dumps(filesets.resolve_artifact(artifact_plan).to_dict())))
+    assert artifact_plan.is_resolved
+
+    assert filesets.list_plan_files(artifact_plan) == filesets.list_files(artifact, all_filesets.get, { "workspace": workspace })
+    assert list(filesets.map_plan_files(artifact_plan)) == [
+        (workspace + "/readme.md", workspace + "/readme.md"),
+        (workspace + "/Sources/main.py", "Program/main.py"),
+        (workspace + "/Sources/package/module.py", "Program/package/module.py"),
+    ]
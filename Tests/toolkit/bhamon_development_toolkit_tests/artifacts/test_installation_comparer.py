@@ -0,0 +1,64 @@
+""" Unit tests for InstallationComparer """
+
+import hashlib
+import os
+import zlib
+
+import pytest
+
+from bhamon_development_toolkit.artifacts.archive_entry import ArchiveEntry
+from bhamon_development_toolkit.artifacts.artifact_manifest import ArtifactManifest
+from bhamon_development_toolkit.artifacts.artifact_manifest_entry import ArtifactManifestEntry
+from bhamon_development_toolkit.artifacts.file_hash_cache import FileHashCache
+from bhamon_development_toolkit.artifacts.installation_comparer import InstallationComparer
+
+
+all_artifact_files = {
+    "unchanged.txt": b"unchanged",
+    "modified.txt": b"modified",
+    "resized.txt": b"resized",
+    "missing.txt": b"missing",
+}
+
+all_installed_files = {
+    "unchanged.txt": b"unchanged",
+    "modified.txt": b"MODIFIED",
+    "resized.txt": b"resized with another size",
+    "extra.txt": b"extra",
+}
+
+
+@pytest.fixture(name = "installation_directory")
+def installation_directory_fixture(tmpdir):
+    for file_path, content in all_installed_files.items():
+        with open(os.path.join(tmpdir, file_path), mode = "wb") as installed_file:
+            installed_file.write(content)
+    return str(tmpdir)
+
+
+def test_find_changed_files_with_crc(installation_directory):
+    all_entries = [ ArchiveEntry(file_path, len(content), zlib.crc32(content)) for file_path, content in all_artifact_files.items() ]
+
+    all_changed_files = InstallationComparer().find_changed_files(installation_directory, all_entries)
+
+    assert sorted(all_changed_files) == [ "missing.txt", "modified.txt", "resized.txt" ]
+
+
+@pytest.mark.parametrize("with_cache", [ False, True ])
+def test_find_changed_files_with_manifest(installation_directory, with_cache):
+    all_entries = [ ArchiveEntry(file_path, len(content), None) for file_path, content in all_artifact_files.items() ]
+    manifest = ArtifactManifest("sha256",
+        [ ArtifactManifestEntry(file_path, len(content), 0o644, hashlib.sha256(content).hexdigest()) for file_path, content in all_artifact_files.items() ])
+
+    comparer = InstallationComparer(file_hash_cache = FileHashCache() if with_cache else None)
+    all_changed_files = comparer.find_changed_files(installation_directory, all_entries, manifest)
+
+    assert sorted(all_changed_files) == [ "missing.txt", "modified.txt", "resized.txt" ]
+
+
+def test_find_changed_files_without_crc(installation_directory):
+    all_entries = [ ArchiveEntry(file_path, len(content), None) for file_path, content in all_artifact_files.items() ]
+
+    all_changed_files = InstallationComparer().find_changed_files(installation_directory, all_entries)
+
+    assert sorted(all_changed_files) == sorted(all_artifact_files)
@@ -0,0 +1,336 @@
+""" Unit tests for ArtifactRepository """
+
+import errno
+import hashlib
+import os
+import shutil
+import zipfile
+
+import pytest
+
+from bhamon_development_toolkit.artifacts import archive_formats
+from bhamon_development_toolkit.artifacts import filesets
+from bhamon_development_toolkit.artifacts.repository import ArtifactRepository
+
+
+def test_package_with_file_statuses(tmpdir):
+    workspace = os.path.join(tmpdir, "workspace")
+    os.makedirs(os.path.join(workspace, "directory"))
+
+    all_file_paths = [ os.path.join(workspace, "first.txt"), os.path.join(workspace, "directory", "second.txt") ]
+    for file_path in all_file_paths:
+        with open(file_path, mode = "w", encoding = "utf-8") as test_file:
+            test_file.write(os.path.basename(file_path))
+
+    artifact_files = [ (file_path, os.path.relpath(file_path, workspace).replace("\\", "/")) for file_path in all_file_paths ]
+    file_statuses = filesets.check_files(all_file_paths)
+
+    repository = ArtifactRepository(os.path.join(tmpdir, "repository"), "project")
+    repository.package("", "with_statuses", artifact_files, file_statuses = file_statuses)
+    repository.package("", "without_statuses", artifact_files)
+
+    with zipfile.ZipFile(os.path.join(tmpdir, "repository", "with_statuses.zip")) as first_archive:
+        with zipfile.ZipFile(os.path.join(tmpdir, "repository", "without_statuses.zip")) as second_archive:
+            assert first_archive.testzip() is None
+            assert len(first_archive.infolist()) == len(second_archive.infolist())
+
+            for first_info, second_info in zip(first_archive.infolist(), second_archive.infolist()):
+                assert first_info.filename == second_info.filename
+                assert first_info.date_time == second_info.date_time
+                assert first_info.external_attr == second_info.external_attr
+                assert first_info.compress_type == second_info.compress_type
+                assert first_info.CRC == second_info.CRC
+
+
+def test_package_with_manifest(tmpdir):
+    workspace = os.path.join(tmpdir, "workspace")
+    os.makedirs(workspace)
+
+    with open(os.path.join(workspace, "file.txt"), mode = "w", encoding = "utf-8") as test_file:
+        test_file.write("content")
+
+    repository = ArtifactRepository(os.path.join(tmpdir, "repository"), "project")
+    repository.package("", "artifact", [ (os.path.join(workspace, "file.txt"), "directory/file.txt") ])
+
+    manifest = repository.load_manifest("", "artifact")
+    entry = manifest.get("directory/file.txt")
+
+    assert len(manifest) == 1
+    assert entry.size == 7
+    assert entry.mode == os.stat(os.path.join(workspace, "file.txt")).st_mode
+    assert entry.hash == hashlib.sha256(b"content").hexdigest()
+
+
+def test_package_incremental(tmpdir):
+    workspace = os.path.join(tmpdir, "workspace")
+    os.makedirs(workspace)
+
+    for file_name in [ "unchanged.txt", "modified.txt" ]:
+        with open(os.path.join(workspace, file_name), mode = "w", encoding = "utf-8") as test_file:
+            test_file.write(file_name * 100)
+
+    artifact_files = [ (os.path.join(workspace, file_name), file_name) for file_name in [ "modified.txt", "unchanged.txt" ] ]
+
+    repository = ArtifactRepository(os.path.join(tmpdir, "repository"), "project")
+    repository.package("", "artifact", artifact_files)
+
+    with zipfile.ZipFile(os.path.join(tmpdir, "repository", "artifact.zip")) as archive_file:
+        previous_info = archive_file.getinfo("unchanged.txt")
+
+    with open(os.path.join(workspace, "modified.txt"), mode = "w", encoding = "utf-8") as test_file:
+        test_file.write("modified")
+    with open(os.path.join(workspace, "added.txt"), mode = "w", encoding = "utf-8") as test_file:
+        test_file.write("added")
+
+    artifact_files.insert(0, (os.path.join(workspace, "added.txt"), "added.txt"))
+    repository.package("", "artifact", artifact_files, incremental = True)
+
+    with zipfile.ZipFile(os.path.join(tmpdir, "repository", "artifact.zip")) as archive_file:
+        assert archive_file.testzip() is None
+        assert archive_file.namelist() == [ "added.txt", "modified.txt", "unchanged.txt" ]
+        assert archive_file.read("added.txt") == b"added"
+        assert archive_file.read("modified.txt") == b"modified"
+        assert archive_file.read("unchanged.txt") == b"unchanged.txt" * 100
+        assert archive_file.getinfo("unchanged.txt").CRC == previous_info.CRC
+        assert archive_file.getinfo("unchanged.txt").compress_size == previous_info.compress_size
+
+    manifest = repository.load_manifest("", "artifact")
+    assert manifest.get("unchanged.txt").hash == hashlib.sha256(b"unchanged.txt" * 100).hexdigest()
+    assert manifest.get("modified.txt").hash == hashlib.sha256(b"modified").hexdigest()
+
+
+def test_package_incremental_with_same_timestamp(tmpdir):
+    file_path = os.path.join(tmpdir, "file.txt")
+    with open(file_path, mode = "w", encoding = "utf-8") as test_file:
+        test_file.write("version=1\n")
+
+    repository = ArtifactRepository(os.path.join(tmpdir, "repository"), "project")
+    repository.package("", "artifact", [ (file_path, "file.txt") ])
+
+    file_status = os.stat(file_path)
+    with open(file_path, mode = "w", encoding = "utf-8") as test_file:
+        test_file.write("version=2\n")
+    os.utime(file_path, ns = (file_status.st_atime_ns, file_status.st_mtime_ns))
+
+    repository.package("", "artifact", [ (file_path, "file.txt") ], incremental = True)
+
+    with zipfile.ZipFile(os.path.join(tmpdir, "repository", "artifact.zip")) as archive_file:
+        assert archive_file.read("file.txt") == b"version=2\n"
+
+
+def test_package_interrupted(tmpdir, monkeypatch):
+    file_path = os.path.join(tmpdir, "file.txt")
+    archive_path = os.path.join(tmpdir, "repository", "artifact.zip")
+
+    with open(file_path, mode = "w", encoding = "utf-8") as test_file:
+        test_file.write("first")
+
+    repository = ArtifactRepository(os.path.join(tmpdir, "repository"), "project")
+    repository.package("", "artifact", [ (file_path, "file.txt") ])
+
+    with open(file_path, mode = "w", encoding = "utf-8") as test_file:
+        test_file.write("second")
+
+    # Simulate the process stopping before the new archive replaces the previous one
+    def replace(source, destination, replace_function = os.replace):
+        if destination == archive_path:
+            raise KeyboardInterrupt()
+        replace_function(source, destination)
+
+    monkeypatch.setattr(os, "replace", replace)
+
+    with pytest.raises(KeyboardInterrupt):
+        repository.package("", "artifact", [ (file_path, "file.txt") ], incremental = True)
+
+    assert not os.path.exists(os.path.join(tmpdir, "repository", "artifact.manifest.json"))
+
+    with zipfile.ZipFile(archive_path) as archive_file:
+        assert archive_file.read("file.txt") == b"first"
+
+
+def test_install_with_archive_format(tmpdir):
+    workspace = os.path.join(tmpdir, "workspace")
+    os.makedirs(workspace)
+
+    with open(os.path.join(workspace, "file.txt"), mode = "w", encoding = "utf-8") as test_file:
+        test_file.write("content")
+
+    repository = ArtifactRepository(os.path.join(tmpdir, "repository"), "project", archive_formats.get_archive_format("tar.xz"))
+    repository.package("", "artifact", [ (os.path.join(workspace, "file.txt"), "directory/file.txt") ])
+
+    assert os.path.isfile(os.path.join(tmpdir, "repository", "artifact.tar.xz"))
+
+    # The archive format is detected from the local archive, whatever the repository format
+    repository = ArtifactRepository(os.path.join(tmpdir, "repository"), "project")
+    repository.verify("", "artifact")
+    repository.install("", "artifact", os.path.join(tmpdir, "installation"))
+
+    with open(os.path.join(tmpdir, "installation", "directory", "file.txt"), mode = "r", encoding = "utf-8") as installed_file:
+        assert installed_file.read() == "content"
+
+
+def test_verify_with_manifest(tmpdir):
+    workspace = os.path.join(tmpdir, "workspace")
+    os.makedirs(workspace)
+
+    with open(os.path.join(workspace, "file.txt"), mode = "w", encoding = "utf-8") as test_file:
+        test_file.write("content")
+
+    repository = ArtifactRepository(os.path.join(tmpdir, "repository"), "project")
+    repository.package("", "artifact", [ (os.path.join(workspace, "file.txt"), "file.txt") ])
+    repository.verify("", "artifact")
+
+    with open(os.path.join(workspace, "file.txt"), mode = "w", encoding = "utf-8") as test_file:
+        test_file.write("CONTENT")
+
+    # Replace the archive while keeping the previous manifest, as if the archive had been modified
+    archive_format = archive_formats.get_archive_format("zip")
+    archive_format.package(os.path.join(tmpdir, "repository", "artifact.zip"), [ (os.path.join(workspace, "file.txt"), "file.txt") ])
+
+    repository.verify("", "artifact", use_manifest = False)
+    with pytest.raises(RuntimeError):
+        repository.verify("", "artifact")
+
+
+@pytest.mark.parametrize("replace", [ False, True ])
+def test_install_to_existing_directory(tmpdir, replace):
+    workspace = os.path.join(tmpdir, "workspace")
+    installation_directory = os.path.join(tmpdir, "installation")
+
+    all_artifact_files = [ "first.txt", "directory/second.txt", "directory/nested/third.txt", "other/fourth.txt" ]
+    for file_path in all_artifact_files + [ "directory/existing.txt" ]:
+        for root_directory in [ workspace, installation_directory ]:
+            os.makedirs(os.path.join(root_directory, os.path.dirname(file_path)), exist_ok = True)
+            with open(os.path.join(root_directory, file_path), mode = "w", encoding = "utf-8") as test_file:
+                test_file.write(root_directory + "/" + file_path)
+
+    shutil.rmtree(os.path.join(installation_directory, "other"))
+
+    repository = ArtifactRepository(os.path.join(tmpdir, "repository"), "project")
+    repository.package("", "artifact", [ (os.path.join(workspace, file_path), file_path) for file_path in all_artifact_files ])
+    repository.install("", "artifact", installation_directory, replace = replace, max_workers = 4)
+
+    for file_path in all_artifact_files:
+        with open(os.path.join(installation_directory, file_path), mode = "r", encoding = "utf-8") as installed_file:
+            assert installed_file.read() == workspace + "/" + file_path
+
+    assert os.path.exists(os.path.join(installation_directory, "directory", "existing.txt")) != replace
+    assert sorted(os.listdir(tmpdir)) == [ "installation", "repository", "workspace" ]
+
+
+def test_install_to_current_directory(tmpdir, monkeypatch):
+    workspace = os.path.join(tmpdir, "workspace")
+    installation_directory = os.path.join(tmpdir, "installation")
+    os.makedirs(workspace)
+    os.makedirs(installation_directory)
+
+    with open(os.path.join(workspace, "file.txt"), mode = "w", encoding = "utf-8") as test_file:
+        test_file.write("content")
+
+    repository = ArtifactRepository(os.path.join(tmpdir, "repository"), "project")
+    repository.package("", "artifact", [ (os.path.join(workspace, "file.txt"), "file.txt") ])
+
+    monkeypatch.chdir(installation_directory)
+    repository.install("", "artifact", ".")
+
+    with open(os.path.join(installation_directory, "file.txt"), mode = "r", encoding = "utf-8") as installed_file:
+        assert installed_file.read() == "content"
+
+    assert sorted(os.listdir(tmpdir)) == [ "installation", "repository", "workspace" ]
+
+    with pytest.raises(ValueError):
+        repository.install("", "artifact", ".", replace = True)
+    with pytest.raises(ValueError):
+        repository.install("", "artifact", tmpdir, replace = True)
+
+    assert os.listdir(installation_directory) == [ "file.txt" ]
+
+
+def test_install_to_root_directory(tmpdir):
+    workspace = os.path.join(tmpdir, "workspace")
+    os.makedirs(workspace)
+
+    with open(os.path.join(workspace, "file.txt"), mode = "w", encoding = "utf-8") as test_file:
+        test_file.write("content")
+
+    repository = ArtifactRepository(os.path.join(tmpdir, "repository"), "project")
+    repository.package("", "artifact", [ (os.path.join(workspace, "file.txt"), "file.txt") ])
+
+    with pytest.raises(ValueError):
+        repository.install("", "artifact", os.path.abspath(os.sep), simulate = True)
+
+
+@pytest.mark.parametrize("is_move_failing", [ False, True ])
+def test_install_replace_across_file_systems(tmpdir, monkeypatch, is_move_failing):
+    workspace = os.path.join(tmpdir, "workspace")
+    installation_directory = os.path.join(tmpdir, "installation")
+    extraction_directory = os.path.join(tmpdir, "extraction")
+
+    for root_directory in [ workspace, installation_directory ]:
+        os.makedirs(root_directory)
+        with open(os.path.join(root_directory, "file.txt"), mode = "w", encoding = "utf-8") as test_file:
+            test_file.write(root_directory)
+
+    repository = ArtifactRepository(os.path.join(tmpdir, "repository"), "project")
+    repository.package("", "artifact", [ (os.path.join(workspace, "file.txt"), "file.txt") ])
+
+    # Simulate an extraction directory on another file system, where renames fail and moves copy the files
+    def replace(source, destination, replace_function = os.replace):
+        if source == extraction_directory:
+            raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+        replace_function(source, destination)
+
+    def move(source, destination, move_function = shutil.move):
+        if is_move_failing:
+            os.makedirs(destination)
+            raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+        move_function(source, destination)
+
+    monkeypatch.setattr(os, "replace", replace)
+    monkeypatch.setattr(shutil, "move", move)
+
+    if is_move_failing:
+        with pytest.raises(OSError):
+            repository.install("", "artifact", installation_directory, extraction_directory = extraction_directory, replace = True)
+    else:
+        repository.install("", "artifact", installation_directory, extraction_directory = extraction_directory, replace = True)
+
+    with open(os.path.join(installation_directory, "file.txt"), mode = "r", encoding = "utf-8") as installed_file:
+        assert installed_file.read() == (installation_directory if is_move_failing else workspace)
+
+    assert not os.path.exists(installation_directory + ".replacing")
+
+
+@pytest.mark.parametrize("delete_extra_files", [ False, True ])
+def test_install_differential(tmpdir, delete_extra_files):
+    workspace = os.path.join(tmpdir, "workspace")
+    installation_directory = os.path.join(tmpdir, "installation")
+
+    all_files = { "unchanged.txt": "unchanged", "directory/modified.txt": "modified", "directory/added.txt": "added" }
+    for root_directory in [ workspace, installation_directory ]:
+        os.makedirs(os.path.join(root_directory, "directory"))
+    for file_path, content in all_files.items():
+        with open(os.path.join(workspace, file_path), mode = "w", encoding = "utf-8") as test_file:
+            test_file.write(content)
+
+    with open(os.path.join(installation_directory, "unchanged.txt"), mode = "w", encoding = "utf-8") as test_file:
+        test_file.write("unchanged")
+    with open(os.path.join(installation_directory, "directory", "modified.txt"), mode = "w", encoding = "utf-8") as test_file:
+        test_file.write("MODIFIED")
+    with open(os.path.join(installation_directory, "directory", "extra.txt"), mode = "w", encoding = "utf-8") as test_file:
+        test_file.write("extra")
+
+    repository = ArtifactRepository(os.path.join(tmpdir, "repository"), "project")
+    repository.package("", "artifact", [ (os.path.join(workspace, file_path), file_path) for file_path in all_files ])
+    statistics = repository.install("", "artifact", installation_directory, differential = True, delete_extra_files = delete_extra_files)
+
+    assert statistics.written_file_count == 2
+    assert statistics.written_size == len("modified") + len("added")
+    assert statistics.skipped_file_count == 1
+    assert statistics.skipped_size == len("unchanged")
+    assert statistics.deleted_file_count == (1 if delete_extra_files else 0)
+    assert os.path.exists(os.path.join(installation_directory, "directory", "extra.txt")) != delete_extra_files
+
+    for file_path, content in all_files.items():
+        with open(os.path.join(installation_directory, file_path), mode = "r", encoding = "utf-8") as installed_file:
+            assert installed_file.read() == content
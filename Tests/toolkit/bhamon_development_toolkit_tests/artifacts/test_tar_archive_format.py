@@ -0,0 +1,95 @@
+""" Unit tests for TarArchiveFormat """
+
+import hashlib
+import os
+import random
+
+import pytest
+
+from bhamon_development_toolkit.artifacts import archive_formats
+
+
+all_test_files = {
+    "first.txt": b"first" * 100,
+    "directory/second.txt": b"second",
+}
+
+
+@pytest.fixture(name = "artifact_files")
+def artifact_files_fixture(tmpdir):
+    artifact_files = []
+
+    for file_path, content in all_test_files.items():
+        os.makedirs(os.path.join(tmpdir, "workspace", os.path.dirname(file_path)), exist_ok = True)
+        with open(os.path.join(tmpdir, "workspace", file_path), mode = "wb") as test_file:
+            test_file.write(content)
+        artifact_files.append((os.path.join(tmpdir, "workspace", file_path), file_path))
+
+    return artifact_files
+
+
+@pytest.mark.parametrize("identifier", [ "tar", "tar.gz", "tar.xz", "tar.bz2" ])
+def test_package_and_extract(tmpdir, artifact_files, identifier):
+    archive_format = archive_formats.get_archive_format(identifier)
+    archive_path = os.path.join(tmpdir, "artifact." + identifier)
+
+    manifest = archive_format.package(archive_path, artifact_files)
+
+    assert archive_format.verify(archive_path, manifest) == []
+
+    assert len(manifest) == len(all_test_files)
+    assert manifest.get("first.txt").hash == hashlib.sha256(all_test_files["first.txt"]).hexdigest()
+    assert manifest.get("first.txt").mode == os.stat(artifact_files[0][0]).st_mode
+    assert archive_format.list_files(archive_path) == list(all_test_files)
+    assert [ entry.path for entry in archive_format.extract(archive_path, os.path.join(tmpdir, "output")) ] == list(all_test_files)
+
+    for file_path, content in all_test_files.items():
+        with open(os.path.join(tmpdir, "output", file_path), mode = "rb") as extracted_file:
+            assert extracted_file.read() == content
+
+
+def test_verify_corrupted(tmpdir, artifact_files):
+    archive_format = archive_formats.get_archive_format("tar.gz")
+    archive_path = os.path.join(tmpdir, "artifact.tar.gz")
+    archive_format.package(archive_path, artifact_files)
+
+    with open(archive_path, mode = "r+b") as archive_file:
+        archive_file.truncate(os.path.getsize(archive_path) - 10)
+
+    assert len(archive_format.verify(archive_path)) == 1
+
+
+def test_verify_and_extract_with_corrupted_data(tmpdir):
+    archive_format = archive_formats.get_archive_format("tar.gz")
+    archive_path = os.path.join(tmpdir, "artifact.tar.gz")
+
+    # Random data is stored rather than deflated, and the archive content is fixed,
+    # so that changing a byte corrupts the data without breaking the compressed stream
+    os.makedirs(os.path.join(tmpdir, "workspace"))
+    with open(os.path.join(tmpdir, "workspace", "a.bin"), mode = "wb") as test_file:
+        test_file.write(random.Random(0).randbytes(64 * 1024))
+    os.utime(os.path.join(tmpdir, "workspace", "a.bin"), (1000000000, 1000000000))
+    archive_format.package(archive_path, [ (os.path.join(tmpdir, "workspace", "a.bin"), "a.bin") ])
+
+    with open(archive_path, mode = "r+b") as archive_file:
+        archive_file.seek(os.path.getsize(archive_path) // 2)
+        data = archive_file.read(1)
+        archive_file.seek(-1, os.SEEK_CUR)
+        archive_file.write(bytes([ data[0] ^ 0xFF ]))
+
+    assert len(archive_format.verify(archive_path)) == 1
+
+    with pytest.raises(OSError):
+        archive_format.extract(archive_path, os.path.join(tmpdir, "output"))
+
+
+def test_verify_with_manifest(tmpdir, artifact_files):
+    archive_format = archive_formats.get_archive_format("tar.gz")
+    manifest = archive_format.package(os.path.join(tmpdir, "first.tar.gz"), artifact_files)
+
+    with open(artifact_files[1][0], mode = "wb") as test_file:
+        test_file.write(b"SECOND")
+    archive_format.package(os.path.join(tmpdir, "second.tar.gz"), artifact_files)
+
+    assert archive_format.verify(os.path.join(tmpdir, "second.tar.gz"), manifest, structural_only = True) == []
+    assert archive_format.verify(os.path.join(tmpdir, "second.tar.gz"), manifest) == [ "'directory/second.txt': Hash does not match the manifest" ]
@@ -0,0 +1,92 @@
+""" Unit tests for ZipArchiveVerifier """
+
+import os
+import zipfile
+
+import pytest
+
+from bhamon_development_toolkit.artifacts.artifact_manifest import ArtifactManifest
+from bhamon_development_toolkit.artifacts.artifact_manifest_entry import ArtifactManifestEntry
+from bhamon_development_toolkit.artifacts.artifact_packager import ArtifactPackager
+from bhamon_development_toolkit.artifacts.zip_archive_verifier import ZipArchiveVerifier
+
+
+@pytest.fixture(name = "archive")
+def archive_fixture(tmpdir):
+    artifact_files = []
+    for index in range(20):
+        file_path = os.path.join(tmpdir, "file_%02d.txt" % index)
+        with open(file_path, mode = "w", encoding = "utf-8") as test_file:
+            test_file.write("content %s\n" % index * 100)
+        artifact_files.append((file_path, os.path.basename(file_path)))
+
+    archive_path = os.path.join(tmpdir, "artifact.zip")
+    manifest = ArtifactPackager().package(archive_path, artifact_files)
+    return (archive_path, manifest)
+
+
+def corrupt_entry_data(archive_path, file_name):
+    with zipfile.ZipFile(archive_path) as archive_file:
+        zip_info = archive_file.getinfo(file_name)
+    data_offset = zip_info.header_offset + zipfile.sizeFileHeader + len(zip_info.filename.encode("utf-8")) + len(zip_info.extra)
+
+    with open(archive_path, mode = "r+b") as archive_file:
+        archive_file.seek(data_offset + zip_info.compress_size // 2)
+        data = archive_file.read(1)
+        archive_file.seek(-1, os.SEEK_CUR)
+        archive_file.write(bytes([ data[0] ^ 0xFF ]))
+
+
+@pytest.mark.parametrize("max_workers", [ 1, 4 ])
+def test_verify_valid(archive, max_workers):
+    archive_path, manifest = archive
+    verifier = ZipArchiveVerifier(max_workers)
+
+    assert verifier.verify(archive_path) == []
+    assert verifier.verify(archive_path, manifest) == []
+    assert verifier.verify(archive_path, manifest, structural_only = True) == []
+
+
+@pytest.mark.parametrize("max_workers", [ 1, 4 ])
+def test_verify_corrupted_data(archive, max_workers):
+    archive_path, _ = archive
+    corrupt_entry_data(archive_path, "file_10.txt")
+    verifier = ZipArchiveVerifier(max_workers)
+
+    all_errors = verifier.verify(archive_path)
+
+    assert len(all_errors) == 1
+    assert all_errors[0].startswith("'file_10.txt': ")
+    assert verifier.verify(archive_path, structural_only = True) == []
+
+
+def test_verify_corrupted_header(archive):
+    archive_path, _ = archive
+
+    with zipfile.ZipFile(archive_path) as archive_file:
+        header_offset = archive_file.getinfo("file_05.txt").header_offset
+    with open(archive_path, mode = "r+b") as archive_file:
+        archive_file.seek(header_offset)
+        archive_file.write(b"XXXX")
+
+    assert ZipArchiveVerifier().verify(archive_path, structural_only = True) == [ "'file_05.txt': Invalid local header signature" ]
+
+
+def test_verify_with_manifest(archive):
+    archive_path, manifest = archive
+
+    all_entries = [ entry if entry.path != "file_03.txt" else ArtifactManifestEntry(entry.path, entry.size, entry.mode, "0" * 64) for entry in manifest ]
+    manifest = ArtifactManifest(manifest.hash_algorithm, all_entries + [ ArtifactManifestEntry("missing.txt", 1, 0, "0" * 64) ])
+
+    assert ZipArchiveVerifier().verify(archive_path, manifest) == [
+        "'missing.txt': Missing from the archive",
+        "'file_03.txt': Hash does not match the manifest",
+    ]
+
+
+def test_verify_invalid_archive(tmpdir):
+    archive_path = os.path.join(tmpdir, "artifact.zip")
+    with open(archive_path, mode = "wb") as archive_file:
+        archive_file.write(b"invalid")
+
+    assert len(ZipArchiveVerifier().verify(archive_path)) == 1
@@ -0,0 +1,175 @@
+""" Unit tests for AsyncWorkerPool """
+
+import asyncio
+import datetime
+
+import pytest
+
+from bhamon_development_toolkit.asyncio_extensions.async_worker_pool import AsyncWorkerPool
+
+
+@pytest.mark.asyncio
+async def test_run_ordered():
+    worker_pool = AsyncWorkerPool(worker_count = 3)
+
+    async def function(item):
+        await asyncio.sleep(0.01 * (5 - item))
+        return item * 2
+
+    all_results = await worker_pool.run(function, range(5))
+
+    assert [ result.index for result in all_results ] == [ 0, 1, 2, 3, 4 ]
+    assert [ result.result for result in all_results ] == [ 0, 2, 4, 6, 8 ]
+    assert all(result.is_success for result in all_results)
+
+
+@pytest.mark.asyncio
+async def test_run_unordered():
+    worker_pool = AsyncWorkerPool(worker_count = 2)
+
+    async def function(item):
+        await asyncio.sleep(0.05 if item == 0 else 0)
+        return item
+
+    all_results = await worker_pool.run(function, [ 0, 1, 2 ], ordered = False)
+
+    assert [ result.item for result in all_results ] == [ 1, 2, 0 ]
+
+
+@pytest.mark.asyncio
+async def test_run_with_bounded_concurrency():
+    worker_pool = AsyncWorkerPool(worker_count = 2, queue_size = 1)
+    running_count = 0
+    max_running_count = 0
+    produced_count = 0
+
+    def generate_items():
+        nonlocal produced_count
+        for item in range(10):
+            produced_count += 1
+            yield item
+
+    async def function(item):
+        nonlocal running_count, max_running_count
+        running_count += 1
+        max_running_count = max(max_running_count, running_count)
+        assert produced_count <= item + 3 # Current item, one item in the queue and one item waiting for the queue
+        await asyncio.sleep(0.01)
+        running_count -= 1
+        return item
+
+    all_results = await worker_pool.run(function, generate_items())
+
+    assert len(all_results) == 10
+    assert max_running_count == 2
+
+
+@pytest.mark.asyncio
+async def test_run_with_async_items():
+    worker_pool = AsyncWorkerPool(worker_count = 2)
+
+    async def generate_items():
+        for item in range(3):
+            await asyncio.sleep(0)
+            yield item
+
+    async def function(item):
+        return item
+
+    all_results = await worker_pool.run(function, generate_items())
+
+    assert [ result.result for result in all_results ] == [ 0, 1, 2 ]
+
+
+@pytest.mark.asyncio
+async def test_run_with_failure_and_fail_fast():
+    worker_pool = AsyncWorkerPool(worker_count = 2, fail_fast = True)
+    completed_items = []
+
+    async def function(item):
+        if item == 1:
+            raise ValueError("Failure")
+        await asyncio.sleep(0.1)
+        completed_items.append(item)
+
+    with pytest.raises(ValueError):
+        await worker_pool.run(function, range(10))
+
+    assert len(completed_items) < 10
+
+
+@pytest.mark.asyncio
+async def test_run_with_failure_and_collect_all():
+    worker_pool = AsyncWorkerPool(worker_count = 2, item_timeout = datetime.timedelta(seconds = 0.05), fail_fast = False)
+
+    async def function(item):
+        if item == 1:
+            raise ValueError("Failure")
+        if item == 2:
+            await asyncio.sleep(1)
+        return item
+
+    all_results = await worker_pool.run(function, range(4))
+
+    assert [ result.status for result in all_results ] == [ "succeeded", "failed", "timeout", "succeeded" ]
+    assert isinstance(all_results[1].exception, ValueError)
+
+
+@pytest.mark.asyncio
+async def test_run_with_cancellation():
+    worker_pool = AsyncWorkerPool(worker_count = 2)
+    cancelled_items = []
+
+    async def function(item):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled_items.append(item)
+            raise
+
+    run_task = asyncio.ensure_future(worker_pool.run(function, range(10)))
+    await asyncio.sleep(0.05)
+    run_task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await run_task
+
+    assert sorted(cancelled_items) == [ 0, 1 ]
+
+
+@pytest.mark.asyncio
+async def test_run_with_cancelled_item():
+    worker_pool = AsyncWorkerPool(worker_count = 2)
+
+    async def function(item):
+        if item == 1:
+            raise asyncio.CancelledError()
+        return item
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(worker_pool.run(function, range(5)), timeout = 1)
+
+
+@pytest.mark.asyncio
+async def test_run_ordered_with_slow_item():
+    worker_pool = AsyncWorkerPool(worker_count = 2, queue_size = 2)
+    produced_count = 0
+
+    def generate_items():
+        nonlocal produced_count
+        for item in range(100):
+            produced_count += 1
+            yield item
+
+    async def function(item):
+        await asyncio.sleep(0.1 if item == 0 else 0)
+        return item
+
+    all_results = []
+    async for result in worker_pool.iterate(function, generate_items(), ordered = True):
+        # Results waiting for the slow first item hold their slot, so that the production stops until it completes
+        if result.index == 0:
+            assert produced_count <= 5
+        all_results.append(result)
+
+    assert [ result.index for result in all_results ] == list(range(100))
@@ -0,0 +1,111 @@
+""" Unit tests for AsyncioContext """
+
+import asyncio
+import datetime
+import os
+import platform
+import signal
+import threading
+import time
+
+import pytest
+
+from bhamon_development_toolkit.asyncio_extensions import event_loop_factories
+from bhamon_development_toolkit.asyncio_extensions.asyncio_context import AsyncioContext
+from bhamon_development_toolkit.asyncio_extensions.event_loop_options import EventLoopOptions
+
+
+def test_run_success():
+    async def run_coroutine():
+        return None
+
+    start_time = time.perf_counter()
+    AsyncioContext().run(run_coroutine())
+
+    assert time.perf_counter() - start_time < 0.5
+
+
+def test_run_failure():
+    async def run_coroutine():
+        raise ValueError("Failure")
+
+    with pytest.raises(ValueError):
+        AsyncioContext().run(run_coroutine())
+
+
+@pytest.mark.skipif(platform.system() == "Windows", reason = "Sending SIGINT to the current process is not supported on Windows")
+def test_run_interrupted():
+    is_cancelled = False
+
+    async def run_coroutine():
+        nonlocal is_cancelled
+
+        asyncio.get_running_loop().call_later(0.1, os.kill, os.getpid(), signal.SIGINT)
+
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            is_cancelled = True
+            raise
+
+    old_signal_handler = signal.getsignal(signal.SIGINT)
+
+    start_time = time.perf_counter()
+    with pytest.raises(RuntimeError, match = "Async operation was interrupted"):
+        AsyncioContext().run(run_coroutine())
+
+    assert is_cancelled
+    assert time.perf_counter() - start_time < 1
+    assert signal.getsignal(signal.SIGINT) is old_signal_handler
+
+
+def test_run_shutdown_timeout():
+    context = AsyncioContext()
+    context.shutdown_timeout_seconds = 0.1
+
+    async def run_coroutine():
+        asyncio.get_running_loop().call_soon(context.shutdown)
+
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            await asyncio.sleep(1)
+
+    with pytest.raises(RuntimeError, match = "Future did not complete"):
+        context.run(run_coroutine())
+
+
+def test_run_with_options():
+    created_loops = []
+
+    def create_event_loop():
+        loop = event_loop_factories.create_default_event_loop()
+        created_loops.append(loop)
+        return loop
+
+    options = EventLoopOptions(
+        loop_factory = create_event_loop,
+        executor_max_workers = 2,
+        debug = True,
+        slow_callback_duration = datetime.timedelta(seconds = 0.5),
+    )
+
+    async def run_coroutine():
+        loop = asyncio.get_running_loop()
+        assert loop is created_loops[0]
+        assert loop.get_debug()
+        assert loop.slow_callback_duration == 0.5
+        assert await loop.run_in_executor(None, threading.current_thread) is not threading.current_thread()
+
+    AsyncioContext(options).run(run_coroutine())
+
+    assert len(created_loops) == 1
+    assert created_loops[0].is_closed()
+
+
+def test_get_event_loop_factory():
+    assert event_loop_factories.get_event_loop_factory("asyncio") is event_loop_factories.create_default_event_loop
+    assert event_loop_factories.get_event_loop_factory("auto") is not None
+
+    with pytest.raises(ValueError):
+        event_loop_factories.get_event_loop_factory("unknown")
@@ -0,0 +1,73 @@
+""" Unit tests for BlockingExecutor """
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from bhamon_development_toolkit.asyncio_extensions import asyncio_helpers
+from bhamon_development_toolkit.asyncio_extensions.asyncio_context import AsyncioContext
+from bhamon_development_toolkit.asyncio_extensions.blocking_executor import BlockingExecutor
+from bhamon_development_toolkit.asyncio_extensions.event_loop_options import EventLoopOptions
+
+
+@pytest.mark.asyncio
+async def test_run_with_limits():
+    blocking_executor = BlockingExecutor(max_workers = 4, max_disk_operations = 1, max_cpu_operations = 2)
+    lock = threading.Lock()
+    running_counts = { "disk": 0, "cpu": 0 }
+    max_running_counts = { "disk": 0, "cpu": 0 }
+
+    def function(operation_type):
+        with lock:
+            running_counts[operation_type] += 1
+            max_running_counts[operation_type] = max(max_running_counts[operation_type], running_counts[operation_type])
+        time.sleep(0.05)
+        with lock:
+            running_counts[operation_type] -= 1
+        return operation_type
+
+    try:
+        all_operation_types = [ "disk", "cpu" ] * 3
+        all_futures = [ blocking_executor.run(function, operation_type, operation_type = operation_type) for operation_type in all_operation_types ]
+        all_results = await asyncio.gather(*all_futures)
+    finally:
+        blocking_executor.shutdown()
+
+    assert all_results == all_operation_types
+    assert max_running_counts == { "disk": 1, "cpu": 2 }
+
+
+@pytest.mark.asyncio
+async def test_run_with_unsupported_operation_type():
+    blocking_executor = BlockingExecutor()
+
+    try:
+        with pytest.raises(ValueError):
+            await blocking_executor.run(time.sleep, 0, operation_type = "network")
+    finally:
+        blocking_executor.shutdown()
+
+
+def test_run_blocking_with_context():
+    all_thread_names = []
+    is_loop_responsive = False
+
+    def function():
+        time.sleep(0.1)
+        all_thread_names.append(threading.current_thread().name)
+
+    async def check_loop():
+        nonlocal is_loop_responsive
+        await asyncio.sleep(0.01)
+        is_loop_responsive = True
+
+    async def run_coroutine():
+        await asyncio.gather(asyncio_helpers.run_blocking(function, operation_type = "disk"), check_loop())
+
+    AsyncioContext(EventLoopOptions(executor_max_workers = 2, max_disk_operations = 1)).run(run_coroutine())
+
+    assert is_loop_responsive
+    assert all_thread_names[0].startswith("BlockingExecutor")
+    assert asyncio_helpers.current_blocking_executor.get() is None
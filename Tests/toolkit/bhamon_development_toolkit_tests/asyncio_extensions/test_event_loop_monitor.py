@@ -0,0 +1,54 @@
+""" Unit tests for EventLoopMonitor """
+
+import asyncio
+import datetime
+import time
+
+from bhamon_development_toolkit.asyncio_extensions.asyncio_context import AsyncioContext
+from bhamon_development_toolkit.asyncio_extensions.event_loop_monitor import EventLoopMonitor
+
+
+def block_event_loop(duration: float) -> None:
+    time.sleep(duration)
+
+
+def test_monitor_without_stall():
+    monitor = EventLoopMonitor(probe_interval = datetime.timedelta(seconds = 0.01), lag_threshold = datetime.timedelta(seconds = 0.5))
+
+    async def run_coroutine():
+        await asyncio.sleep(0.1)
+
+    AsyncioContext(monitor = monitor).run(run_coroutine())
+
+    assert len(monitor.get_lags()) > 0
+    assert monitor.stall_count == 0
+
+
+def test_monitor_with_stall():
+    monitor = EventLoopMonitor(probe_interval = datetime.timedelta(seconds = 0.01), lag_threshold = datetime.timedelta(seconds = 0.1))
+
+    async def run_coroutine():
+        await asyncio.sleep(0.05)
+        block_event_loop(0.5)
+        await asyncio.sleep(0.05)
+
+    AsyncioContext(monitor = monitor).run(run_coroutine())
+
+    all_stalls = monitor.get_stalls()
+    assert monitor.stall_count == 1
+    assert len(all_stalls) == 1
+    assert all_stalls[0].duration >= 0.4
+    assert all_stalls[0].stack is not None
+    assert any(frame.name == "block_event_loop" for frame in all_stalls[0].stack)
+
+
+def test_monitor_with_history_size():
+    monitor = EventLoopMonitor(probe_interval = datetime.timedelta(seconds = 0.001), lag_threshold = datetime.timedelta(seconds = 0.5), lag_history_size = 5)
+
+    async def run_coroutine():
+        await asyncio.sleep(0.1)
+
+    AsyncioContext(monitor = monitor).run(run_coroutine())
+
+    assert len(monitor.get_lags()) == 5
+    assert monitor.lag_count > 5
@@ -0,0 +1,52 @@
+""" Unit tests for VirtualTimeEventLoop """
+
+import asyncio
+import time
+
+from bhamon_development_toolkit.asyncio_extensions import virtual_time_event_loop
+
+
+def test_sleep():
+    async def run_coroutine():
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(3600)
+        return loop.time()
+
+    start_time = time.perf_counter()
+    assert virtual_time_event_loop.run_with_virtual_time(run_coroutine(), start_time = 100) == 3700
+    assert time.perf_counter() - start_time < 1
+
+
+def test_wait_for_timeout():
+    async def run_coroutine():
+        loop = asyncio.get_running_loop()
+
+        try:
+            await asyncio.wait_for(asyncio.sleep(60), timeout = 10)
+        except asyncio.TimeoutError:
+            return loop.time()
+        return None
+
+    assert virtual_time_event_loop.run_with_virtual_time(run_coroutine()) == 10
+
+
+def test_ordering():
+    all_events = []
+
+    async def record(name, delay):
+        await asyncio.sleep(delay)
+        all_events.append((name, asyncio.get_running_loop().time()))
+
+    async def run_coroutine():
+        await asyncio.gather(record("slow", 5), record("fast", 1), record("medium", 2))
+
+    virtual_time_event_loop.run_with_virtual_time(run_coroutine())
+
+    assert all_events == [ ("fast", 1), ("medium", 2), ("slow", 5) ]
+
+
+def test_run_in_executor():
+    async def run_coroutine():
+        return await asyncio.get_running_loop().run_in_executor(None, sum, [ 1, 2, 3 ])
+
+    assert virtual_time_event_loop.run_with_virtual_time(run_coroutine()) == 6
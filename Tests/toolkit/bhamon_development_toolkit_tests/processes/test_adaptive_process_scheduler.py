@@ -0,0 +1,127 @@
+""" Unit tests for AdaptiveProcessScheduler """
+
+import asyncio
+import datetime
+from typing import List, Optional
+
+import pytest
+
+from bhamon_development_toolkit.processes.adaptive_process_scheduler import AdaptiveProcessScheduler
+from bhamon_development_toolkit.processes.adaptive_scheduler_options import AdaptiveSchedulerOptions
+from bhamon_development_toolkit.processes.executable_command import ExecutableCommand
+from bhamon_development_toolkit.processes.process_options import ProcessOptions
+from bhamon_development_toolkit.processes.process_output_handler import ProcessOutputHandler
+from bhamon_development_toolkit.processes.process_request import ProcessRequest
+from bhamon_development_toolkit.processes.process_runner import ProcessRunner
+from bhamon_development_toolkit.processes.process_spawner import ProcessSpawner
+from bhamon_development_toolkit.processes.process_status import ProcessStatus
+from bhamon_development_toolkit.processes.system_pressure import SystemPressure
+from bhamon_development_toolkit.processes.system_pressure_probe import SystemPressureProbe
+
+
+class FakePressureProbe(SystemPressureProbe):
+
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.pressure = SystemPressure(cpu_count = 4, load_average = 0, cpu_pressure = 0, memory_pressure = 0, available_memory = 1024 ** 3)
+
+
+    def read(self) -> SystemPressure:
+        return self.pressure
+
+
+class FakeProcessRunner(ProcessRunner):
+
+
+    def __init__(self) -> None:
+        super().__init__(ProcessSpawner())
+        self.active_count = 0
+        self.max_active_count = 0
+
+
+    async def run(self,
+            command: ExecutableCommand,
+            options: ProcessOptions,
+            output_handlers: Optional[List[ProcessOutputHandler]] = None,
+            check_exit_code: bool = True
+            ) -> ProcessStatus:
+
+        self.active_count += 1
+        self.max_active_count = max(self.max_active_count, self.active_count)
+
+        try:
+            await asyncio.sleep(0.1)
+        finally:
+            self.active_count -= 1
+
+        return ProcessStatus(executable = command.executable_path, pid = -1, is_running = False, exit_code = 0)
+
+
+def create_requests(count: int) -> List[ProcessRequest]:
+    return [ ProcessRequest(ExecutableCommand("dummy-%s" % index), ProcessOptions()) for index in range(count) ]
+
+
+@pytest.mark.asyncio
+async def test_run_batch():
+    process_runner = FakeProcessRunner()
+    options = AdaptiveSchedulerOptions(max_concurrency = 3, update_interval = datetime.timedelta(seconds = 0.05))
+    scheduler = AdaptiveProcessScheduler(process_runner, options, FakePressureProbe())
+
+    all_status = await scheduler.run_batch(create_requests(10))
+
+    assert [ status.executable for status in all_status ] == [ "dummy-%s" % index for index in range(10) ]
+    assert process_runner.max_active_count == 3
+    assert scheduler.running_count == 0
+
+    all_decisions = scheduler.get_decisions()
+    assert len([ decision for decision in all_decisions if decision.action == "admit" ]) == 10
+    assert len([ decision for decision in all_decisions if decision.action == "defer" ]) > 0
+
+
+@pytest.mark.asyncio
+async def test_run_batch_with_pressure():
+    process_runner = FakeProcessRunner()
+    pressure_probe = FakePressureProbe()
+    pressure_probe.pressure = SystemPressure(cpu_count = 4, load_average = 20, cpu_pressure = 80, memory_pressure = 0, available_memory = 1024 ** 3)
+    options = AdaptiveSchedulerOptions(min_concurrency = 1, max_concurrency = 4, update_interval = datetime.timedelta(seconds = 0.05))
+    scheduler = AdaptiveProcessScheduler(process_runner, options, pressure_probe)
+
+    await scheduler.run_batch(create_requests(4))
+
+    assert process_runner.max_active_count == 1
+    assert scheduler.concurrency_limit == 1
+
+    all_decisions = scheduler.get_decisions()
+    assert all_decisions[0].action == "initialize"
+    assert len(all_decisions[0].reasons) == 2
+
+
+@pytest.mark.asyncio
+async def test_back_off():
+    pressure_probe = FakePressureProbe()
+    options = AdaptiveSchedulerOptions(min_concurrency = 1, max_concurrency = 4, update_interval = datetime.timedelta(seconds = 0))
+    scheduler = AdaptiveProcessScheduler(FakeProcessRunner(), options, pressure_probe)
+
+    for _ in range(4):
+        await scheduler.acquire()
+
+    assert scheduler.concurrency_limit == 4
+
+    pressure_probe.pressure = SystemPressure(cpu_count = 4, load_average = 0, cpu_pressure = 0, memory_pressure = 50, available_memory = 1024 ** 3)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(scheduler.acquire(), 0.1)
+
+    assert scheduler.concurrency_limit == 1
+
+    for _ in range(4):
+        scheduler.release()
+
+    pressure_probe.pressure = SystemPressure(cpu_count = 4, load_average = 0, cpu_pressure = 0, memory_pressure = 0, available_memory = 1024 ** 3)
+
+    await scheduler.acquire()
+
+    assert scheduler.concurrency_limit == 2
+    all_adjustments = [ decision.action for decision in scheduler.get_decisions() if decision.action in [ "increase", "decrease" ] ]
+    assert all_adjustments == [ "decrease", "decrease", "decrease", "increase" ]
@@ -0,0 +1,112 @@
+""" Unit tests for ProcessGraphExecutor """
+
+import asyncio
+from typing import Any, Awaitable, Callable, List
+
+import pytest
+
+from bhamon_development_toolkit.processes.process_graph_executor import ProcessGraphExecutor
+from bhamon_development_toolkit.processes.process_graph_node import ProcessGraphNode
+from bhamon_development_toolkit.processes.process_runner import ProcessRunner
+from bhamon_development_toolkit.processes.process_spawner import ProcessSpawner
+
+
+def create_step(identifier: str, execution_log: List[str], duration: float = 0.01, success: bool = True) -> Callable[[], Awaitable[Any]]:
+
+    async def run_step() -> None:
+        execution_log.append("start:" + identifier)
+        await asyncio.sleep(duration)
+        if not success:
+            raise RuntimeError("Step failed")
+        execution_log.append("end:" + identifier)
+
+    return run_step
+
+
+@pytest.mark.asyncio
+async def test_run_with_dependencies():
+    execution_log: List[str] = []
+    executor = ProcessGraphExecutor(ProcessRunner(ProcessSpawner()), max_concurrency = 2)
+
+    all_nodes = [
+        ProcessGraphNode("build", coroutine_factory = create_step("build", execution_log)),
+        ProcessGraphNode("lint", coroutine_factory = create_step("lint", execution_log)),
+        ProcessGraphNode("test", dependencies = [ "build" ], coroutine_factory = create_step("test", execution_log)),
+        ProcessGraphNode("upload", dependencies = [ "lint", "test" ], coroutine_factory = create_step("upload", execution_log)),
+    ]
+
+    all_results = await executor.run(all_nodes)
+
+    assert [ result.identifier for result in all_results ] == [ "build", "lint", "test", "upload" ]
+    assert all(result.status == "succeeded" for result in all_results)
+    assert all(result.duration is not None for result in all_results)
+    assert execution_log.index("end:build") < execution_log.index("start:test")
+    assert execution_log.index("end:test") < execution_log.index("start:upload")
+    assert execution_log.index("end:lint") < execution_log.index("start:upload")
+
+
+@pytest.mark.asyncio
+async def test_run_with_critical_path_first():
+    execution_log: List[str] = []
+    duration_estimates = { "short": 1, "long": 10, "after_long": 10 }
+    executor = ProcessGraphExecutor(ProcessRunner(ProcessSpawner()), max_concurrency = 1, duration_estimates = duration_estimates)
+
+    all_nodes = [
+        ProcessGraphNode("short", coroutine_factory = create_step("short", execution_log)),
+        ProcessGraphNode("long", coroutine_factory = create_step("long", execution_log)),
+        ProcessGraphNode("after_long", dependencies = [ "long" ], coroutine_factory = create_step("after_long", execution_log)),
+    ]
+
+    assert executor.compute_priorities(all_nodes) == { "short": 1, "long": 20, "after_long": 10 }
+
+    await executor.run(all_nodes)
+
+    assert execution_log == [ "start:long", "end:long", "start:after_long", "end:after_long", "start:short", "end:short" ]
+
+
+@pytest.mark.asyncio
+async def test_run_with_fail_fast():
+    execution_log: List[str] = []
+    executor = ProcessGraphExecutor(ProcessRunner(ProcessSpawner()), max_concurrency = 2, fail_fast = True)
+
+    all_nodes = [
+        ProcessGraphNode("failing", coroutine_factory = create_step("failing", execution_log, success = False)),
+        ProcessGraphNode("slow", coroutine_factory = create_step("slow", execution_log, duration = 10)),
+        ProcessGraphNode("independent", coroutine_factory = create_step("independent", execution_log)),
+    ]
+
+    with pytest.raises(RuntimeError):
+        await executor.run(all_nodes)
+
+    all_results = await executor.run(all_nodes, check_success = False)
+
+    assert [ result.status for result in all_results ] == [ "failed", "cancelled", "skipped" ]
+    assert isinstance(all_results[0].exception, RuntimeError)
+
+
+@pytest.mark.asyncio
+async def test_run_with_keep_going():
+    execution_log: List[str] = []
+    executor = ProcessGraphExecutor(ProcessRunner(ProcessSpawner()), max_concurrency = 2, fail_fast = False)
+
+    all_nodes = [
+        ProcessGraphNode("failing", coroutine_factory = create_step("failing", execution_log, success = False)),
+        ProcessGraphNode("dependent", dependencies = [ "failing" ], coroutine_factory = create_step("dependent", execution_log)),
+        ProcessGraphNode("independent", coroutine_factory = create_step("independent", execution_log, duration = 0.1)),
+    ]
+
+    all_results = await executor.run(all_nodes, check_success = False)
+
+    assert [ result.status for result in all_results ] == [ "failed", "skipped", "succeeded" ]
+
+
+def test_compute_priorities_with_cycle():
+    executor = ProcessGraphExecutor(ProcessRunner(ProcessSpawner()))
+
+    all_nodes = [
+        ProcessGraphNode("first", dependencies = [ "second" ], coroutine_factory = create_step("first", [])),
+        ProcessGraphNode("second", dependencies = [ "first" ], coroutine_factory = create_step("second", [])),
+    ]
+
+    with pytest.raises(ValueError):
+        executor.compute_priorities(all_nodes)
@@ -0,0 +1,74 @@
+""" Unit tests for ProcessLedger """
+
+import os
+
+import pytest
+
+from bhamon_development_toolkit.processes import process_ledger
+from bhamon_development_toolkit.processes.process_ledger import ProcessLedger
+from bhamon_development_toolkit.processes.process_ledger_entry import ProcessLedgerEntry
+
+
+def create_entry(command: str, duration: float, exit_code: int = 0, start_time: float = 1000) -> ProcessLedgerEntry:
+    return ProcessLedgerEntry(
+        run_identifier = "my-run", executable = command.split(" ")[0], command = command, working_directory = None,
+        start_time = start_time, end_time = start_time + duration, exit_code = exit_code)
+
+
+def test_record(tmpdir):
+    database_path = os.path.join(tmpdir, "ledger.sqlite")
+
+    with ProcessLedger(database_path, batch_size = 2) as ledger:
+        ledger.record(create_entry("python -m pytest", 1))
+        assert not os.path.exists(database_path)
+
+        ledger.record(create_entry("python -m pylint", 2))
+        assert os.path.exists(database_path)
+
+        ledger.record(create_entry("python -m pytest", 3))
+
+    with ProcessLedger(database_path) as ledger:
+        all_entries = ledger.list_entries()
+        assert len(all_entries) == 3
+        assert all_entries[0] == create_entry("python -m pytest", 1)
+
+        assert len(ledger.list_entries(command = "python -m pytest")) == 2
+        assert len(ledger.list_entries(run_identifier = "other-run")) == 0
+
+
+@pytest.mark.asyncio
+async def test_record_async(tmpdir):
+    database_path = os.path.join(tmpdir, "ledger.sqlite")
+
+    with ProcessLedger(database_path, batch_size = 2) as ledger:
+        await ledger.record_async(create_entry("python -m pytest", 1))
+        assert not os.path.exists(database_path)
+
+        await ledger.record_async(create_entry("python -m pylint", 2))
+        assert os.path.exists(database_path)
+
+        assert len(ledger.list_entries()) == 2
+
+
+def test_get_duration_percentiles(tmpdir):
+    database_path = os.path.join(tmpdir, "ledger.sqlite")
+
+    with ProcessLedger(database_path) as ledger:
+        for index, duration in enumerate([ 4, 1, 3, 2, 5 ]):
+            ledger.record(create_entry("python -m pytest", duration, start_time = 1000 + index))
+        ledger.record(create_entry("python -m pytest", 100, exit_code = 1))
+
+        assert ledger.get_duration_percentiles("python -m pytest", [ 0, 50, 100 ]) == { 0: 1, 50: 3, 100: 5 }
+        assert ledger.get_duration_percentiles("python -m pytest", [ 50 ], history_size = 2) == { 50: 3.5 }
+        assert ledger.get_duration_percentiles("python -m pylint") is None
+
+        assert ledger.get_duration_estimates({ "test": "python -m pytest", "lint": "python -m pylint" }) == { "test": 3 }
+
+
+def test_compute_percentile():
+    assert process_ledger.compute_percentile([ 10 ], 90) == 10
+    assert process_ledger.compute_percentile([ 1, 2, 3, 4 ], 50) == 2.5
+    assert process_ledger.compute_percentile([ 1, 2, 3, 4 ], 100) == 4
+
+    with pytest.raises(ValueError):
+        process_ledger.compute_percentile([], 50)
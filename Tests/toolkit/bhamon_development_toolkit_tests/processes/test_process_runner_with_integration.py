@@ -0,0 +1,144 @@
+""" Integration tests for ProcessRunner """
+
+import asyncio
+import datetime
+import os
+import platform
+
+import pytest
+
+from bhamon_development_toolkit.processes.exceptions.process_failure_exception import ProcessFailureException
+from bhamon_development_toolkit.processes.executable_command import ExecutableCommand
+from bhamon_development_toolkit.processes.process_ledger import ProcessLedger
+from bhamon_development_toolkit.processes.process_options import ProcessOptions
+from bhamon_development_toolkit.processes.process_runner import ProcessRunner
+from bhamon_development_toolkit.processes.process_spawner import ProcessSpawner
+
+
+@pytest.fixture
+def event_loop():
+    if platform.system() == "Windows":
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy()) # pylint: disable = no-member
+
+    loop = asyncio.get_event_loop_policy().new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_stream():
+    process_runner = ProcessRunner(ProcessSpawner(is_console = True))
+    command = ExecutableCommand("python")
+    command.add_arguments([ "-c", "for index in range(5): print(index)" ])
+
+    options = ProcessOptions(
+        wait_update_interval = datetime.timedelta(seconds = 0.1))
+
+    all_records = []
+    async with process_runner.stream(command, options) as output_stream:
+        async for record in output_stream:
+            all_records.append(record)
+
+    assert [ record.stream for record in all_records ] == [ "stdout" ] * 5
+    assert [ record.line.rstrip() for record in all_records ] == [ str(index) for index in range(5) ]
+
+
+@pytest.mark.asyncio
+async def test_stream_with_backpressure():
+    process_runner = ProcessRunner(ProcessSpawner(is_console = True))
+    command = ExecutableCommand("python")
+    command.add_arguments([ "-c", "for index in range(10000): print(index)" ])
+
+    options = ProcessOptions(
+        wait_update_interval = datetime.timedelta(seconds = 0.1))
+
+    line_count = 0
+    async with process_runner.stream(command, options, buffer_size = 10) as output_stream:
+        async for _ in output_stream:
+            line_count += 1
+
+    assert line_count == 10000
+
+
+@pytest.mark.asyncio
+async def test_stream_with_early_stop():
+    process_runner = ProcessRunner(ProcessSpawner(is_console = True))
+    command = ExecutableCommand("python")
+    command.add_arguments([ "-u", "-c", "import itertools\nfor index in itertools.count(): print(index)" ])
+
+    options = ProcessOptions(
+        termination_timeout = datetime.timedelta(seconds = 5),
+        wait_update_interval = datetime.timedelta(seconds = 0.1))
+
+    all_lines = []
+    async with process_runner.stream(command, options, buffer_size = 10) as output_stream:
+        async for record in output_stream:
+            all_lines.append(record.line.rstrip())
+            if len(all_lines) == 3:
+                break
+
+    assert all_lines == [ "0", "1", "2" ]
+
+
+@pytest.mark.asyncio
+async def test_stream_with_failure():
+    process_runner = ProcessRunner(ProcessSpawner(is_console = True))
+    command = ExecutableCommand("python")
+    command.add_arguments([ "-c", "print('hello'); raise SystemExit(1)" ])
+
+    options = ProcessOptions(
+        wait_update_interval = datetime.timedelta(seconds = 0.1))
+
+    all_lines = []
+    with pytest.raises(ProcessFailureException):
+        async with process_runner.stream(command, options) as output_stream:
+            async for record in output_stream:
+                all_lines.append(record.line.rstrip())
+
+    assert all_lines == [ "hello" ]
+
+
+@pytest.mark.asyncio
+async def test_run_with_ledger(tmpdir):
+    with ProcessLedger(os.path.join(tmpdir, "ledger.sqlite")) as ledger:
+        process_runner = ProcessRunner(ProcessSpawner(is_console = True), ledger = ledger, run_identifier = "my-run")
+        command = ExecutableCommand("python")
+        command.add_arguments([ "-c" ])
+        command.add_internal_arguments([ "pass" ], [ "***" ])
+
+        options = ProcessOptions(
+            working_directory = str(tmpdir),
+            wait_update_interval = datetime.timedelta(seconds = 0.1))
+
+        await process_runner.run(command, options)
+
+        all_entries = ledger.list_entries()
+
+    assert len(all_entries) == 1
+    assert all_entries[0].run_identifier == "my-run"
+    assert all_entries[0].command == "python -c '***'"
+    assert all_entries[0].working_directory == str(tmpdir)
+    assert all_entries[0].exit_code == 0
+    assert all_entries[0].duration > 0
+    if platform.system() != "Windows":
+        assert all_entries[0].user_time is not None
+
+
+@pytest.mark.asyncio
+async def test_run_with_ledger_and_concurrent_processes(tmpdir):
+    with ProcessLedger(os.path.join(tmpdir, "ledger.sqlite"), batch_size = 1) as ledger:
+        process_runner = ProcessRunner(ProcessSpawner(is_console = True), ledger = ledger)
+        command = ExecutableCommand("python")
+        command.add_arguments([ "-c", "import time; time.sleep(0.2)" ])
+
+        options = ProcessOptions(
+            wait_update_interval = datetime.timedelta(seconds = 0.1))
+
+        await asyncio.gather(process_runner.run(command, options), process_runner.run(command, options))
+
+        all_entries = ledger.list_entries()
+
+    # The usage for all child processes includes both processes, so it is not recorded for either
+    assert len(all_entries) == 2
+    assert [ entry.user_time for entry in all_entries ] == [ None, None ]
+    assert [ entry.system_time for entry in all_entries ] == [ None, None ]
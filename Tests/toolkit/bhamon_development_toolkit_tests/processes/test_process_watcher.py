@@ -2,20 +2,33 @@
 
 import asyncio
 import datetime
+import functools
 
 import pytest
 
+from bhamon_development_toolkit.asyncio_extensions.virtual_time_event_loop import run_with_virtual_time
 from bhamon_development_toolkit.processes.exceptions.process_failure_exception import ProcessFailureException
 from bhamon_development_toolkit.processes.exceptions.process_timeout_exception import ProcessTimeoutException
 from bhamon_development_toolkit.processes.executable_command import ExecutableCommand
 from bhamon_development_toolkit.processes.process_options import ProcessOptions
 from bhamon_development_toolkit.processes.process_output_collector import ProcessOutputCollector
+from bhamon_development_toolkit.processes.process_output_stream import ProcessOutputStream
 from bhamon_development_toolkit.processes.process_watcher import ProcessWatcher
 
 from .fake_process import FakeProcess
 
 
-@pytest.mark.asyncio
+def virtual_time(test_function):
+    """ Run an asynchronous test on a virtual time event loop """
+
+    @functools.wraps(test_function)
+    def run_test(*args, **kwargs):
+        return run_with_virtual_time(test_function(*args, **kwargs))
+
+    return run_test
+
+
+@virtual_time
 async def test_run_success():
     command = ExecutableCommand("dummy")
 
@@ -47,7 +60,7 @@ async def test_run_success():
     assert status.exit_code == 0
 
 
-@pytest.mark.asyncio
+@virtual_time
 async def test_run_failure():
     command = ExecutableCommand("dummy")
 
@@ -81,7 +94,7 @@ async def test_run_failure():
     assert status.exit_code == 1
 
 
-@pytest.mark.asyncio
+@virtual_time
 async def test_terminate():
     command = ExecutableCommand("dummy")
 
@@ -107,7 +120,7 @@ async def test_terminate():
     assert status.exit_code == -1
 
 
-@pytest.mark.asyncio
+@virtual_time
 async def test_terminate_with_normal_completion():
     command = ExecutableCommand("dummy")
 
@@ -140,7 +153,7 @@ async def test_terminate_with_normal_completion():
     assert status.exit_code == 0
 
 
-@pytest.mark.asyncio
+@virtual_time
 async def test_terminate_with_custom_exit_code():
     command = ExecutableCommand("dummy")
 
@@ -166,7 +179,7 @@ async def test_terminate_with_custom_exit_code():
     assert status.exit_code == 5
 
 
-@pytest.mark.asyncio
+@virtual_time
 async def test_terminate_force():
     command = ExecutableCommand("dummy")
 
@@ -192,7 +205,7 @@ async def test_terminate_force():
     assert status.exit_code == -2
 
 
-@pytest.mark.asyncio
+@virtual_time
 async def test_run_timeout():
     command = ExecutableCommand("dummy")
 
@@ -227,7 +240,7 @@ async def test_run_timeout():
     assert status.exit_code == -1
 
 
-@pytest.mark.asyncio
+@virtual_time
 async def test_output_timeout():
     command = ExecutableCommand("dummy")
 
@@ -262,7 +275,36 @@ async def test_output_timeout():
     assert status.exit_code == -1
 
 
-@pytest.mark.asyncio
+@virtual_time
+async def test_output_timeout_with_paused_output():
+    command = ExecutableCommand("dummy")
+
+    options = ProcessOptions(
+        output_timeout = datetime.timedelta(seconds = 0.5),
+        termination_timeout = datetime.timedelta(seconds = 0.5),
+        wait_update_interval = datetime.timedelta(seconds = 0.1))
+
+    process = FakeProcess(pid = 1, execution_duration = datetime.timedelta(seconds = 2))
+    watcher = ProcessWatcher(process, command, options)
+
+    await watcher.start()
+
+    watcher.pause_output()
+    await asyncio.sleep(1)
+    assert watcher.get_status().is_running
+
+    watcher.resume_output()
+    await asyncio.sleep(0.2)
+    assert watcher.get_status().is_running
+
+    await asyncio.sleep(0.5)
+
+    status = watcher.get_status()
+    assert not status.is_running
+    assert status.exit_code == -1
+
+
+@virtual_time
 async def test_output():
     command = ExecutableCommand("dummy")
 
@@ -295,7 +337,44 @@ async def test_output():
     assert output_collector.get_stderr() == "hello stderr\nbye stderr\n"
 
 
-@pytest.mark.asyncio
+@virtual_time
+async def test_output_with_slow_consumer():
+    command = ExecutableCommand("dummy")
+
+    options = ProcessOptions(
+        termination_timeout = datetime.timedelta(seconds = 0.5),
+        wait_update_interval = datetime.timedelta(seconds = 0.1))
+
+    stdout = asyncio.StreamReader()
+
+    process = FakeProcess(pid = 1, execution_duration = datetime.timedelta(seconds = 0.5), stdout = stdout)
+    watcher = ProcessWatcher(process, command, options)
+    output_stream = ProcessOutputStream(watcher, buffer_size = 5)
+    watcher.add_output_handler(output_stream)
+
+    for index in range(50):
+        stdout.feed_data(("%s\n" % index).encode(options.encoding))
+    stdout.feed_eof()
+
+    async def wait_for_output() -> None:
+        await watcher.wait(drain_output = True)
+        output_stream.complete()
+
+    await watcher.start()
+    wait_task = asyncio.ensure_future(wait_for_output())
+
+    all_lines = []
+    async for record in output_stream:
+        all_lines.append(record.line.rstrip())
+        await asyncio.sleep(1)
+
+    await wait_task
+    await watcher.complete()
+
+    assert all_lines == [ str(index) for index in range(50) ]
+
+
+@virtual_time
 async def test_output_unicode():
     command = ExecutableCommand("dummy")
 
@@ -323,3 +402,83 @@ async def test_output_unicode():
 
     assert output_collector.get_stdout() == "… é ² √ 👍\n"
     assert output_collector.get_stderr() == "… é ² √ 👍\n"
+
+
+@virtual_time
+async def test_output_statistics():
+    command = ExecutableCommand("dummy")
+
+    options = ProcessOptions(
+        termination_timeout = datetime.timedelta(seconds = 0.5),
+        wait_update_interval = datetime.timedelta(seconds = 0.1),
+        collect_output_statistics = True)
+
+    stdout = asyncio.StreamReader()
+    stderr = asyncio.StreamReader()
+
+    process = FakeProcess(pid = 1, execution_duration = datetime.timedelta(seconds = 0.5), stdout = stdout, stderr = stderr)
+    watcher = ProcessWatcher(process, command, options)
+    output_collector = ProcessOutputCollector()
+    watcher.add_output_handler(output_collector)
+
+    stdout.feed_data("hello stdout\n".encode(options.encoding))
+    stdout.feed_data("bye stdout\n".encode(options.encoding))
+    stderr.feed_data("hello stderr\n".encode(options.encoding))
+
+    stdout.feed_eof()
+    stderr.feed_eof()
+
+    await watcher.start()
+    await watcher.wait()
+    await watcher.complete()
+
+    all_statistics = watcher.get_status().output_statistics
+    assert all_statistics is not None
+
+    statistics_by_stream = { statistics.stream: statistics for statistics in all_statistics }
+    assert statistics_by_stream["stdout"].handler == "ProcessOutputCollector"
+    assert statistics_by_stream["stdout"].call_count == 2
+    assert statistics_by_stream["stderr"].call_count == 1
+    assert statistics_by_stream["stdout"].max_seconds <= statistics_by_stream["stdout"].cumulative_seconds
+
+
+@virtual_time
+async def test_output_statistics_disabled():
+    command = ExecutableCommand("dummy")
+
+    options = ProcessOptions(
+        wait_update_interval = datetime.timedelta(seconds = 0.1))
+
+    process = FakeProcess(pid = 1, execution_duration = datetime.timedelta(seconds = 0.1))
+    watcher = ProcessWatcher(process, command, options)
+
+    await watcher.start()
+    await watcher.wait()
+    await watcher.complete()
+
+    assert watcher.get_status().output_statistics is None
+
+
+@virtual_time
+async def test_run_timeout_with_clock():
+    command = ExecutableCommand("dummy")
+
+    options = ProcessOptions(
+        run_timeout = datetime.timedelta(seconds = 10),
+        termination_timeout = datetime.timedelta(seconds = 0.5),
+        wait_update_interval = datetime.timedelta(seconds = 0.1))
+
+    current_time = 1000.0
+    process = FakeProcess(pid = 1, execution_duration = datetime.timedelta(seconds = 2))
+    watcher = ProcessWatcher(process, command, options, clock = lambda: current_time)
+
+    await watcher.start()
+    await asyncio.sleep(1)
+    assert watcher.get_status().is_running
+
+    current_time += 20
+    await asyncio.sleep(1)
+    assert not watcher.get_status().is_running
+
+    with pytest.raises(ProcessTimeoutException):
+        await watcher.complete()
@@ -0,0 +1,43 @@
+""" Unit tests for SystemPressureProbe """
+
+import os
+
+from bhamon_development_toolkit.processes.system_pressure_probe import SystemPressureProbe
+
+
+def test_read(tmpdir):
+    proc_directory = os.path.join(tmpdir, "proc")
+    os.makedirs(os.path.join(proc_directory, "pressure"))
+
+    with open(os.path.join(proc_directory, "loadavg"), mode = "w", encoding = "utf-8") as proc_file:
+        proc_file.write("3.50 2.00 1.00 2/72 2453\n")
+    with open(os.path.join(proc_directory, "pressure", "cpu"), mode = "w", encoding = "utf-8") as proc_file:
+        proc_file.write("some avg10=12.50 avg60=1.15 avg300=0.81 total=5097542\n")
+        proc_file.write("full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n")
+    with open(os.path.join(proc_directory, "pressure", "memory"), mode = "w", encoding = "utf-8") as proc_file:
+        proc_file.write("some avg10=4.25 avg60=0.00 avg300=0.00 total=0\n")
+        proc_file.write("full avg10=1.00 avg60=0.00 avg300=0.00 total=0\n")
+    with open(os.path.join(proc_directory, "meminfo"), mode = "w", encoding = "utf-8") as proc_file:
+        proc_file.write("MemTotal:        6158152 kB\n")
+        proc_file.write("MemFree:         1000000 kB\n")
+        proc_file.write("MemAvailable:    2048 kB\n")
+
+    pressure = SystemPressureProbe(proc_directory).read()
+
+    assert pressure.cpu_count > 0
+    assert pressure.load_average == 3.5
+    assert pressure.cpu_pressure == 12.5
+    assert pressure.memory_pressure == 4.25
+    assert pressure.available_memory == 2048 * 1024
+
+
+def test_read_without_pressure_information(tmpdir):
+    proc_directory = os.path.join(tmpdir, "proc")
+    os.makedirs(proc_directory)
+
+    pressure = SystemPressureProbe(proc_directory).read()
+
+    assert pressure.cpu_count > 0
+    assert pressure.cpu_pressure is None
+    assert pressure.memory_pressure is None
+    assert pressure.available_memory is None